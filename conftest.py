@@ -0,0 +1,18 @@
+from pytest import mark
+
+
+def pytest_addoption(parser):
+    parser.addoption("--benchmark", action="store_true", help="run the benchmarks of tests/benchmark")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: performance benchmark, which only runs with the --benchmark option")
+
+
+def pytest_collection_modifyitems(config, items):
+    skip = mark.skip(reason="benchmarks only run with the --benchmark option")
+    for item in items:
+        if item.path.parent.name == "benchmark":
+            item.add_marker(mark.benchmark)
+            if not config.getoption("--benchmark"):
+                item.add_marker(skip)
@@ -1,16 +1,96 @@
-"""Init file for module visibility."""
+"""Init file for module visibility.
+
+The public names are imported from their modules on first access, so importing the package, or running the
+command-line interface, only loads the modules which are used. The 'main' function is imported at once, since the
+'main' submodule would hide it once the submodule is imported, but it imports the commands only when it is run.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
 
-from .gherkin import Gherkin
 from .main import main
-from .utils import is_valid, issue, load, process, save, validate
+
+if TYPE_CHECKING:
+    from .aio import AsyncRunner, aload, aprocess, asave, asave_many, avalidate
+    from .batch import BatchResult
+    from .cache import CacheStats, DiskCache, ParseCache
+    from .gherkin import Gherkin
+    from .utils import (is_valid, issue, iter_scenarios, load, load_json,
+                        load_many, process, process_many, save, validate)
+
+MODULES = {
+    "aload": "aio",
+    "aprocess": "aio",
+    "asave": "aio",
+    "asave_many": "aio",
+    "AsyncRunner": "aio",
+    "avalidate": "aio",
+    "BatchResult": "batch",
+    "CacheStats": "cache",
+    "DiskCache": "cache",
+    "Gherkin": "gherkin",
+    "is_valid": "utils",
+    "issue": "utils",
+    "iter_scenarios": "utils",
+    "load": "utils",
+    "load_json": "utils",
+    "load_many": "utils",
+    "ParseCache": "cache",
+    "process": "utils",
+    "process_many": "utils",
+    "save": "utils",
+    "validate": "utils"
+}
 
 __all__ = [
+    "aload",
+    "aprocess",
+    "asave",
+    "asave_many",
+    "AsyncRunner",
+    "avalidate",
+    "BatchResult",
+    "CacheStats",
+    "DiskCache",
     "Gherkin",
     "is_valid",
     "issue",
+    "iter_scenarios",
     "load",
+    "load_json",
+    "load_many",
     "main",
+    "ParseCache",
     "process",
+    "process_many",
     "save",
     "validate"
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import a public name from its module on first access.
+
+    Args:
+        name (str): The name of the attribute.
+
+    Returns:
+        Any: The public object of the name, which is stored in the package for the later accesses.
+
+    Raises:
+        AttributeError: If the name is not public.
+    """
+    if name not in MODULES:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    value = getattr(import_module(f".{MODULES[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    """Return the names of the package, including the public names which are not imported yet.
+
+    Returns:
+        List[str]: The sorted names of the package.
+    """
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,232 @@
+"""Provide asyncio coroutines for processing, loading, validating, and saving Gherkin files.
+
+The coroutines run the file I/O and the parsing of the utilities on the workers of an AsyncRunner, so the event loop
+keeps running while the files are processed. The runner limits the number of calls which run or wait in its executor,
+so thousands of calls can be started at once without reading thousands of files into memory at once.
+"""
+
+from asyncio import (AbstractEventLoop, CancelledError, Semaphore, gather,
+                     get_running_loop, wrap_future)
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from contextlib import suppress
+from functools import partial
+from os import cpu_count
+from threading import Lock
+from typing import Any, Callable, Iterable, List, Optional, Tuple, TypeVar
+from weakref import WeakKeyDictionary
+
+from gherkin_processor.components.diagnostic import Diagnostic
+from gherkin_processor.components.source import SourceData
+from gherkin_processor.gherkin import Gherkin
+from gherkin_processor.utils import load, process, save, validate
+
+DEFAULT_CONCURRENCY = min(32, (cpu_count() or 1) + 4)
+
+Result = TypeVar("Result")
+
+
+class AsyncRunner:
+    """Represent a bounded pool of workers, which run blocking functions for coroutines.
+
+    The functions run on the given executor, or on a thread pool of the runner, which is created on the first call. At
+    most 'concurrency' functions run or wait in the executor at once, and the further calls wait in the event loop. A
+    cancelled call returns at once: a function which has not started is dropped, while a running function is finished
+    in the background, and its result is discarded. Its slot is only released when it finishes, so the limit holds for
+    the cancelled calls as well. The runner can be shared by event loops.
+
+    Attributes:
+        concurrency (int): The maximal number of functions which run or wait in the executor at once.
+        executor (Executor | None): The executor of the functions, or None until the thread pool of the runner is
+            created.
+
+    Methods:
+        __init__(concurrency: int = DEFAULT_CONCURRENCY, executor: Optional[Executor] = None) -> None:
+            Initialize the AsyncRunner object.
+        run(function: Callable[..., Result], *args: Any) -> Result:
+            Run a blocking function on the executor, and return its result.
+        close() -> None:
+            Shut down the thread pool of the runner, if it was created.
+    """
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, executor: Optional[Executor] = None) -> None:
+        """Initialize the AsyncRunner object.
+
+        Args:
+            concurrency (int): The maximal number of functions which run or wait in the executor at once.
+            executor (Optional[Executor]): The executor of the functions, like a ProcessPoolExecutor for parsing on
+                multiple CPUs, or None to create a thread pool of 'concurrency' threads on the first call.
+
+        Raises:
+            ValueError: If the concurrency is not positive.
+        """
+        if concurrency < 1:
+            raise ValueError("Variable 'concurrency' must be positive")
+        self.concurrency = concurrency
+        self.executor = executor
+        self._owns_executor = executor is None
+        self._semaphores: WeakKeyDictionary[AbstractEventLoop, Semaphore] = WeakKeyDictionary()
+        self._lock = Lock()
+
+    async def run(self, function: Callable[..., Result], *args: Any) -> Result:
+        """Run a blocking function on the executor, and return its result.
+
+        Args:
+            function (Callable[..., Result]): The blocking function. It has to be picklable for a process pool.
+            *args (Any): The arguments of the function.
+
+        Returns:
+            Result: The result of the function.
+
+        Raises:
+            CancelledError: If the call is cancelled.
+        """
+        loop = get_running_loop()
+        semaphore = self._semaphore(loop)
+        await semaphore.acquire()
+        try:
+            future = self._executor().submit(function, *args)
+        except BaseException:
+            semaphore.release()
+            raise
+        future.add_done_callback(partial(_release, loop, semaphore))
+        try:
+            return await wrap_future(future)
+        except CancelledError:
+            future.cancel()
+            raise
+
+    def close(self) -> None:
+        """Shut down the thread pool of the runner, if it was created."""
+        with self._lock:
+            if self._owns_executor and self.executor is not None:
+                self.executor.shutdown(wait=False, cancel_futures=True)
+                self.executor = None
+
+    def _semaphore(self, loop: AbstractEventLoop) -> Semaphore:
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._semaphores[loop] = Semaphore(self.concurrency)
+            return semaphore
+
+    def _executor(self) -> Executor:
+        with self._lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(self.concurrency, thread_name_prefix="gherkin-processor")
+            return self.executor
+
+
+DEFAULT_RUNNER = AsyncRunner()
+
+
+def _release(loop: AbstractEventLoop, semaphore: Semaphore, _: "Future[Any]") -> None:
+    with suppress(RuntimeError):
+        loop.call_soon_threadsafe(semaphore.release)
+
+
+async def aprocess(gherkin_text: SourceData, validate_text: bool = False, engine: str = "reference", runner: Optional[AsyncRunner] = None) -> Gherkin:
+    """Process Gherkin text off the event loop, and return a Gherkin object.
+
+    Args:
+        gherkin_text (SourceData): The Gherkin text to process, as a string or as encoded bytes.
+        validate_text (bool): Whether to validate the syntax during processing.
+        engine (str): The parser engine to process the text with ("reference", "fast", or "span").
+        runner (Optional[AsyncRunner]): The runner to process the text on, or None for the default runner.
+
+    Returns:
+        Gherkin: The processed Gherkin object.
+
+    Raises:
+        TypeError: If the 'text' argument is neither a string nor a bytes-like object.
+        ValueError: If validation fails for the step syntax.
+        CancelledError: If the call is cancelled.
+    """
+    return await (runner or DEFAULT_RUNNER).run(process, gherkin_text, validate_text, engine)
+
+
+async def aload(file_path: SourceData, validate_text: bool = False, engine: str = "reference", runner: Optional[AsyncRunner] = None) -> Gherkin | None:
+    """Load a Gherkin file off the event loop, and return a Gherkin object.
+
+    Args:
+        file_path (SourceData): The path to the Gherkin file, or the encoded content of the file.
+        validate_text (bool): Whether to validate the syntax during processing.
+        engine (str): The parser engine to process the file with ("reference", "fast", or "span").
+        runner (Optional[AsyncRunner]): The runner to load the file on, or None for the default runner.
+
+    Returns:
+        Gherkin | None: The loaded Gherkin object, or None if the file does not exist.
+
+    Raises:
+        ValueError: If validation fails for the step syntax.
+        UnicodeDecodeError: If the file cannot be decoded.
+        CancelledError: If the call is cancelled.
+    """
+    return await (runner or DEFAULT_RUNNER).run(load, file_path, validate_text, engine)
+
+
+async def avalidate(gherkin_text: SourceData, collect: bool = False, runner: Optional[AsyncRunner] = None) -> List[Diagnostic] | None:
+    """Validate the syntax of Gherkin text off the event loop.
+
+    Args:
+        gherkin_text (SourceData): The Gherkin text to validate, as a string or as encoded bytes.
+        collect (bool): Whether to continue after the issues, and return all of them instead of raising the first one.
+        runner (Optional[AsyncRunner]): The runner to validate the text on, or None for the default runner.
+
+    Returns:
+        List[Diagnostic] | None: The issues of the text in the order of the lines in the collecting mode, None otherwise.
+
+    Raises:
+        TypeError: If the 'text' argument is neither a string nor a bytes-like object.
+        ValueError: If validation fails for the step syntax, unless the issues are collected.
+        CancelledError: If the call is cancelled.
+    """
+    return await (runner or DEFAULT_RUNNER).run(validate, gherkin_text, collect)
+
+
+async def asave(gherkin: Gherkin, file_path: str, mode: str = "GHERKIN", override_existing_file: bool = False, runner: Optional[AsyncRunner] = None) -> bool:
+    """Save a Gherkin object to a file off the event loop.
+
+    Args:
+        gherkin (Gherkin): The Gherkin object to save.
+        file_path (str): The path to the output file.
+        mode (str): The format to save the file in ("GHERKIN", "JSON", "COMPACT_JSON", or "BINARY").
+        override_existing_file (bool): Whether to override the file if it already exists.
+        runner (Optional[AsyncRunner]): The runner to save the file on, or None for the default runner.
+
+    Returns:
+        bool: True if the file was saved successfully, False otherwise.
+
+    Raises:
+        OSError: If the file cannot be written.
+        CancelledError: If the call is cancelled.
+    """
+    return await (runner or DEFAULT_RUNNER).run(save, gherkin, file_path, mode, override_existing_file)
+
+
+async def asave_many(files: Iterable[Tuple[Gherkin, str]], mode: str = "GHERKIN", override_existing_file: bool = False,
+                     runner: Optional[AsyncRunner] = None) -> List[bool]:
+    """Save many Gherkin objects to files concurrently, off the event loop.
+
+    The files are written by the workers of the runner at once, up to its concurrency limit. If a file cannot be
+    written, or the call is cancelled, the files which are not started yet are not written.
+
+    Args:
+        files (Iterable[Tuple[Gherkin, str]]): The Gherkin objects and the paths to their output files.
+        mode (str): The format to save the files in ("GHERKIN", "JSON", "COMPACT_JSON", or "BINARY").
+        override_existing_file (bool): Whether to override the files which already exist.
+        runner (Optional[AsyncRunner]): The runner to save the files on, or None for the default runner.
+
+    Returns:
+        List[bool]: Whether each file was saved successfully, in the order of the files.
+
+    Raises:
+        OSError: If a file cannot be written.
+        CancelledError: If the call is cancelled.
+    """
+    loop = get_running_loop()
+    tasks = [loop.create_task(asave(gherkin, file_path, mode, override_existing_file, runner)) for gherkin, file_path in files]
+    try:
+        return list(await gather(*tasks))
+    finally:
+        for task in tasks:
+            task.cancel()
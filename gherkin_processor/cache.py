@@ -0,0 +1,345 @@
+"""Define the ParseCache and DiskCache classes, which keep the processed Gherkin objects of repeated texts.
+
+The caches are opt-in: they are passed to the 'process' and 'load' utilities. The ParseCache looks up the content hash
+of the text in memory before processing it, so a repeated text costs a hash and a copy of the cached object instead of
+parsing it again. The DiskCache keeps the processed files in a directory between runs, and looks them up by their path,
+size, and modification time, so an unchanged file is neither read nor parsed again.
+"""
+
+from collections import OrderedDict
+from contextlib import suppress
+from dataclasses import dataclass, replace
+from hashlib import blake2b
+from os import makedirs, remove
+from os import replace as replace_file
+from os import stat
+from os.path import abspath, dirname, exists, join
+from struct import Struct
+from tempfile import mkstemp
+from threading import Lock
+from time import time_ns
+from typing import Optional, Tuple
+
+from gherkin_processor.components.source import SourceData
+from gherkin_processor.gherkin import Gherkin
+from gherkin_processor.private.binary import decode_gherkin, encode_gherkin
+
+CacheKey = Tuple[bytes, bool, str, bool]
+EntryHeader = Tuple[bytes, int, int, bytes]
+
+ENTRY_HEADER = Struct("<4sQq16s")
+ENTRY_MAGIC = b"GPC\x02"
+RACY_INTERVAL = 2_000_000_000
+
+
+@dataclass(slots=True)
+class CacheStats:
+    """Represent the statistics of a parse cache.
+
+    Attributes:
+        hits (int): The number of lookups which found a cached object.
+        misses (int): The number of lookups which processed the text.
+        evictions (int): The number of entries removed to keep the cache within its limits.
+        entries (int): The number of cached objects.
+        size (int): The size of the cached objects in bytes.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    size: int = 0
+
+
+class ParseCache:
+    """Represent an in-process cache of processed Gherkin objects, keyed by the content hash of their text.
+
+    The entries are keyed by the BLAKE2 digest of the text, the validation flag, the parser engine, and whether the text
+    is a string or encoded, since the span engine counts the offsets of strings and encoded texts differently. Every
+    entry is stored in the binary format, with the spans of the source components, so a lookup returns a new copy,
+    which the caller can change without affecting the cache or the other callers. The least recently used entries are
+    evicted when the number of entries or their size exceeds the limits. Texts which fail the validation are not
+    cached. The cache can be shared by threads.
+
+    Attributes:
+        max_entries (int): The maximal number of cached objects.
+        max_bytes (int): The maximal size of the cached objects in bytes.
+
+    Methods:
+        __init__(max_entries: int = 128, max_bytes: int = 64 * 1024 * 1024) -> None:
+            Initialize the ParseCache object without entries.
+        __len__() -> int:
+            Return the number of cached objects.
+        key(text: SourceData, validate: bool, engine: str) -> CacheKey:
+            Return the cache key of a text.
+        get(key: CacheKey) -> Gherkin | None:
+            Return a copy of the cached object of a key.
+        put(key: CacheKey, gherkin: Gherkin) -> None:
+            Store a copy of a Gherkin object.
+        process(text: SourceData, validate: bool, engine: str = "reference") -> Gherkin:
+            Return the processed Gherkin object of a text, from the cache if possible.
+        stats() -> CacheStats:
+            Return the statistics of the cache.
+        clear() -> None:
+            Remove every entry of the cache and reset its statistics.
+    """
+
+    def __init__(self, max_entries: int = 128, max_bytes: int = 64 * 1024 * 1024) -> None:
+        """Initialize the ParseCache object without entries.
+
+        Args:
+            max_entries (int): The maximal number of cached objects.
+            max_bytes (int): The maximal size of the cached objects in bytes, measured in their binary format.
+
+        Raises:
+            ValueError: If a limit is not positive.
+        """
+        if max_entries <= 0 or max_bytes <= 0:
+            raise ValueError("The limits of the cache must be positive")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[CacheKey, bytes] = OrderedDict()
+        self._stats = CacheStats()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        """Return the number of cached objects."""
+        return len(self._entries)
+
+    @staticmethod
+    def key(text: SourceData, validate: bool, engine: str) -> CacheKey:
+        """Return the cache key of a text.
+
+        Args:
+            text (SourceData): The Gherkin text, as a string or as encoded bytes.
+            validate (bool): Whether the syntax is validated during processing.
+            engine (str): The parser engine which processes the text.
+
+        Returns:
+            CacheKey: The content hash of the text, the validation flag, the engine, and whether the text is a string.
+
+        Raises:
+            TypeError: If the 'text' argument is neither a string nor a bytes-like object.
+        """
+        if isinstance(text, str):
+            return blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest(), validate, engine, True
+        try:
+            return blake2b(text, digest_size=16).digest(), validate, engine, False
+        except TypeError as e:
+            raise TypeError("Variable 'text' is not string type") from e
+
+    def get(self, key: CacheKey) -> Gherkin | None:
+        """Return a copy of the cached object of a key, and mark the entry as the most recently used one.
+
+        Args:
+            key (CacheKey): The cache key of the text.
+
+        Returns:
+            Gherkin | None: The copy of the cached object, or None if the key is not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+        return decode_gherkin(entry)
+
+    def put(self, key: CacheKey, gherkin: Gherkin) -> None:
+        """Store a copy of a Gherkin object, and evict the least recently used entries beyond the limits.
+
+        An object which is larger than the size limit on its own is not stored.
+
+        Args:
+            key (CacheKey): The cache key of the text.
+            gherkin (Gherkin): The processed Gherkin object of the text.
+        """
+        entry = encode_gherkin(gherkin, spans=True)
+        if len(entry) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._stats.size -= len(previous)
+            self._entries[key] = entry
+            self._stats.size += len(entry)
+            while len(self._entries) > self.max_entries or self._stats.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._stats.size -= len(evicted)
+                self._stats.evictions += 1
+            self._stats.entries = len(self._entries)
+
+    def process(self, text: SourceData, validate: bool, engine: str = "reference") -> Gherkin:
+        """Return the processed Gherkin object of a text, from the cache if possible.
+
+        Args:
+            text (SourceData): The Gherkin text, as a string or as encoded bytes.
+            validate (bool): Whether to validate the syntax during processing.
+            engine (str): The parser engine to process the text with ("reference", "fast", or "span").
+
+        Returns:
+            Gherkin: The processed Gherkin object, which is not shared with the cache.
+
+        Raises:
+            TypeError: If the 'text' argument is neither a string nor a bytes-like object.
+            ValueError: If the engine is unknown, or validation fails for the step syntax.
+            UnicodeDecodeError: If the encoded text cannot be decoded.
+        """
+        key = self.key(text, validate, engine)
+        cached: Optional[Gherkin] = self.get(key)
+        if cached is not None:
+            return cached
+        gherkin = Gherkin()
+        gherkin.process(text, validate, engine)
+        self.put(key, gherkin)
+        return gherkin
+
+    def stats(self) -> CacheStats:
+        """Return the statistics of the cache.
+
+        Returns:
+            CacheStats: A snapshot of the statistics, which is not updated by the later lookups.
+        """
+        with self._lock:
+            return replace(self._stats)
+
+    def clear(self) -> None:
+        """Remove every entry of the cache and reset its statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._stats = CacheStats()
+
+
+class DiskCache:
+    """Represent a persistent cache of processed Gherkin files in a directory.
+
+    Every entry is a file in the cache directory, named after the hash of the absolute path of the Gherkin file, the
+    validation flag, and the parser engine. It starts with a header of the size, the modification time, and the BLAKE2
+    digest of the Gherkin file, followed by the Gherkin object in the binary format, with the spans and the source text
+    of the source components. An entry is used without reading the Gherkin file if its size and modification time are
+    unchanged, and after comparing the digest of the content otherwise, so a touched but unchanged file is not parsed
+    again, while a changed file is. A file which was modified too recently for its modification time to tell later
+    changes apart is always compared by its digest.
+
+    The entries are written to temporary files and renamed into place, so concurrent processes never read a partially
+    written entry, and an unreadable or corrupt entry is processed again and replaced. The entries are only decoded,
+    never executed, so a cache directory which is writable by others can make a load return a wrong Gherkin object,
+    but cannot run code.
+
+    Attributes:
+        directory (str): The path to the cache directory, which is created when the first entry is written.
+        hits (int): The number of files loaded from the cache.
+        misses (int): The number of files processed.
+
+    Methods:
+        __init__(directory: str) -> None:
+            Initialize the DiskCache object for a cache directory.
+        entry_path(file_path: str, validate: bool, engine: str) -> str:
+            Return the path to the cache entry of a Gherkin file.
+        load(file_path: str, validate: bool, engine: str = "reference", cache: Optional[ParseCache] = None) -> Gherkin:
+            Return the processed Gherkin object of a file, from the cache if possible.
+    """
+
+    def __init__(self, directory: str) -> None:
+        """Initialize the DiskCache object for a cache directory.
+
+        Args:
+            directory (str): The path to the cache directory.
+        """
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    def entry_path(self, file_path: str, validate: bool, engine: str) -> str:
+        """Return the path to the cache entry of a Gherkin file.
+
+        Args:
+            file_path (str): The path to the Gherkin file.
+            validate (bool): Whether the syntax is validated during processing.
+            engine (str): The parser engine which processes the file.
+
+        Returns:
+            str: The path to the entry, in a subdirectory named after the first two characters of its hash.
+        """
+        key = f"{abspath(file_path)}\0{validate}\0{engine}".encode("utf-8", "surrogatepass")
+        name = blake2b(key, digest_size=16).hexdigest()
+        return join(self.directory, name[:2], f"{name}.gpc")
+
+    def load(self, file_path: str, validate: bool, engine: str = "reference", cache: Optional[ParseCache] = None) -> Gherkin:
+        """Return the processed Gherkin object of a file, from the cache if possible.
+
+        Args:
+            file_path (str): The path to the Gherkin file.
+            validate (bool): Whether to validate the syntax during processing.
+            engine (str): The parser engine to process the file with ("reference", "fast", or "span").
+            cache (Optional[ParseCache]): The in-memory cache to process the file with if it is not in the directory.
+
+        Returns:
+            Gherkin: The processed Gherkin object, with the file path.
+
+        Raises:
+            OSError: If the file cannot be read.
+            ValueError: If the engine is unknown, or validation fails for the step syntax.
+            UnicodeDecodeError: If the file cannot be decoded.
+        """
+        entry_path = self.entry_path(file_path, validate, engine)
+        info = stat(file_path)
+        header, payload = self._read_entry(entry_path)
+        gherkin = self._restore(header is not None and header[1:3] == (info.st_size, info.st_mtime_ns), payload)
+        if gherkin is None:
+            with open(file_path, "rb") as file:
+                content = file.read()
+            digest = blake2b(content, digest_size=16).digest()
+            gherkin = self._restore(header is not None and header[3] == digest, payload)
+            if gherkin is None:
+                gherkin, payload = self._process(content, validate, engine, cache)
+            # A file modified in the last moments may change again without changing its modification time.
+            mtime = -1 if time_ns() - info.st_mtime_ns < RACY_INTERVAL else info.st_mtime_ns
+            self._write_entry(entry_path, (ENTRY_MAGIC, info.st_size, mtime, digest), payload)
+        gherkin.file = file_path
+        return gherkin
+
+    def _restore(self, matches: bool, payload: bytes) -> Optional[Gherkin]:
+        if not matches:
+            return None
+        try:
+            gherkin = decode_gherkin(payload)
+        except ValueError:
+            return None
+        self.hits += 1
+        return gherkin
+
+    def _process(self, content: bytes, validate: bool, engine: str, cache: Optional[ParseCache]) -> Tuple[Gherkin, bytes]:
+        self.misses += 1
+        if cache is not None:
+            gherkin = cache.process(content, validate, engine)
+        else:
+            gherkin = Gherkin()
+            gherkin.process(content, validate, engine)
+        return gherkin, encode_gherkin(gherkin, spans=True)
+
+    def _read_entry(self, entry_path: str) -> Tuple[Optional[EntryHeader], bytes]:
+        try:
+            with open(entry_path, "rb") as entry:
+                data = entry.read()
+        except OSError:
+            return None, b""
+        if len(data) < ENTRY_HEADER.size or not data.startswith(ENTRY_MAGIC):
+            return None, b""
+        header: EntryHeader = ENTRY_HEADER.unpack_from(data)
+        return header, data[ENTRY_HEADER.size:]
+
+    def _write_entry(self, entry_path: str, header: EntryHeader, payload: bytes) -> None:
+        # The cache only saves work, so an entry which cannot be written is skipped instead of failing the load.
+        with suppress(OSError):
+            makedirs(dirname(entry_path), exist_ok=True)
+            descriptor, temporary_path = mkstemp(suffix=".tmp", dir=dirname(entry_path))
+            try:
+                with open(descriptor, "wb") as entry:
+                    entry.write(ENTRY_HEADER.pack(*header))
+                    entry.write(payload)
+                replace_file(temporary_path, entry_path)
+            finally:
+                if exists(temporary_path):
+                    remove(temporary_path)
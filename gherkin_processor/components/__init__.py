@@ -1,15 +1,23 @@
 """Init file for module visibility."""
 
 from .background import Background
+from .diagnostic import Diagnostic
 from .feature import Feature
 from .rule import Rule
 from .scenario import Scenario
+from .source import SourceBuffer, Span, span_of
 from .step import Step
+from .table import Table
 
 __all__ = [
     "Background",
+    "Diagnostic",
     "Feature",
     "Rule",
     "Scenario",
-    "Step"
+    "SourceBuffer",
+    "Span",
+    "Step",
+    "Table",
+    "span_of"
 ]
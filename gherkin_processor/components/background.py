@@ -3,14 +3,24 @@
 The Background class provides functionality to process, validate, and convert background components into string or dictionary representations.
 """
 
+from copy import deepcopy
 from dataclasses import dataclass
-from typing import Any, Dict, List, Tuple
+from itertools import count
+from typing import Any, Dict, Iterator, List, Mapping, Sequence, Tuple
 
 from gherkin_processor.components.step import Step
-from gherkin_processor.private.positions import ALLOWED_BACKGROUND_POSITIONS
-
-
-@dataclass
+from gherkin_processor.components.table import table_memo
+from gherkin_processor.private.dictionaries import as_mapping
+from gherkin_processor.private.lines import (AND, BACKGROUND, BACKQUOTE_FENCE,
+                                             BLANK, BUT, GIVEN,
+                                             KEYWORD_STATUSES, QUOTE_FENCE,
+                                             TABLE, WHEN, Source, split_lines)
+from gherkin_processor.private.positions import (
+    ALLOWED_BACKGROUND_TRANSITIONS, BACKGROUND_DESCRIPTION, BEGINNING, NO_STEP,
+    STATUSES, doc_string_status, position_error, table_status)
+
+
+@dataclass(slots=True)
 class Background:
     """Represent a Gherkin background.
 
@@ -25,9 +35,15 @@ class Background:
             Return the string representation of the Background object.
         to_string() -> str:
             Convert the Background object to a string representation.
+        iter_chunks() -> Iterator[str]:
+            Yield the string representation of the Background object in chunks.
         to_dictionary() -> Dict[str, Any]:
             Convert the Background object to a dictionary representation.
-        process(text: str, validate: bool) -> bool:
+        copy() -> Background:
+            Return a deep copy of the Background object, which keeps the step tables as Table objects.
+        from_dictionary(background: Mapping[str, Any]) -> Background:
+            Create a Background object from the dictionary representation.
+        process(text: str, validate: bool, offset: int, kinds: Sequence[int] | None) -> bool:
             Process the background text and validate its syntax.
     """
 
@@ -53,16 +69,21 @@ class Background:
         Returns:
             str: The string representation of the Background object.
         """
-        lines: List[str] = []
-        if self.steps or self.description:
-            lines.append("Background:")
-        if self.description:
-            lines.append(self.description)
-        if self.steps is not None:
-            lines.extend(str(step) for step in self.steps)
-        if self.steps or self.description:
-            lines.append("")
-        return "\n".join(lines)
+        return "".join(self.iter_chunks())
+
+    def iter_chunks(self) -> Iterator[str]:
+        """Yield the string representation of the Background object in chunks, without building the whole string.
+
+        Yields:
+            str: The next chunk of the string representation, or nothing if the background is empty.
+        """
+        if not self.steps and not self.description:
+            return
+        yield "Background:" if not self.description else f"Background:\n{self.description}"
+        for step in self.steps or []:
+            yield "\n"
+            yield from step.iter_chunks()
+        yield "\n"
 
     def to_dictionary(self) -> Dict[str, Any]:
         """Convert the Background object to a dictionary representation.
@@ -75,12 +96,42 @@ class Background:
             "steps": self.steps
         }
 
-    def process(self, text: str, validate: bool) -> bool:
+    def copy(self) -> "Background":
+        """Return a deep copy of the Background object, which keeps the step tables as Table objects.
+
+        Returns:
+            Background: The copy, which shares no mutable value with this background.
+        """
+        return deepcopy(self, table_memo(step.table for step in self.steps or []))
+
+    @classmethod
+    def from_dictionary(cls, background: Mapping[str, Any]) -> "Background":
+        """Create a Background object from the dictionary representation.
+
+        The dictionary representation is the one of the JSON output, of 'dataclasses.asdict', or of 'to_dictionary'.
+
+        Args:
+            background (Mapping[str, Any]): The dictionary representation of the background.
+
+        Returns:
+            Background: The Background object with the same values.
+
+        Raises:
+            KeyError: If a value is missing from the dictionary representation.
+        """
+        result = cls()
+        result.description = background["description"]
+        result.steps = None if background["steps"] is None else [Step.from_dictionary(as_mapping(step)) for step in background["steps"]]
+        return result
+
+    def process(self, text: str, validate: bool, offset: int = 0, kinds: Sequence[int] | None = None) -> bool:
         """Process the background text and validate its syntax.
 
         Args:
             text (str): The background text to be processed.
             validate (bool): Whether to validate the syntax during processing.
+            offset (int): The number of source lines before the text, used for the line numbers of the errors.
+            kinds (Sequence[int] | None): The kind codes of the text lines, classified from the text if not given.
 
         Returns:
             bool: True if the syntax is valid, False otherwise.
@@ -93,132 +144,118 @@ class Background:
             raise TypeError("Variable 'text' is not string type")
 
         valid_syntax: bool = True
-        lines: List[str] = text.splitlines()
-        previous: str = "<BEGINNING>"
-        status: str = "<BEGINNING>"
-        step: str = ""
+        lines, kinds = split_lines(text, kinds)
+        description: List[str] = [] if self.description is None else [self.description]
+        previous: int = BEGINNING
+        status: int = BEGINNING
+        step: int = NO_STEP
         doc_string: str = ""
         start: int = 0
-        num: int = 0
 
-        for num, line in enumerate(lines, 1):
-            status, doc_string, is_valid = self._handle_docstring(status, doc_string, (num, line), validate)
+        for source_line in zip(count(offset + 1), lines, kinds):
+            status, doc_string, is_valid = self._handle_docstring(status, doc_string, source_line, validate)
             valid_syntax &= is_valid
 
-            if doc_string != "" or line.strip().startswith(("```", '"""')):
+            if doc_string != "" or source_line[2] in (BACKQUOTE_FENCE, QUOTE_FENCE):
                 continue
 
-            status, is_valid = self._handle_title(status, (num, line), validate)
+            status, is_valid = self._handle_title(status, source_line, validate)
             valid_syntax &= is_valid
 
-            status, is_valid = self._handle_description(status, (num, line), validate)
+            status, is_valid = self._handle_description(status, description, source_line, validate)
             valid_syntax &= is_valid
 
-            status, step, is_valid = self._handle_step(status, step, (num, line), validate)
+            status, step, is_valid = self._handle_step(status, step, source_line, validate)
             valid_syntax &= is_valid
 
-            status, is_valid = self._handle_table(status, (num, line), validate)
+            status, is_valid = self._handle_table(status, source_line, validate)
             valid_syntax &= is_valid
 
-            previous, step, start, is_valid = self._process_component((status, previous, step), (start, num-1), lines, validate)
+            previous, step, start, is_valid = self._process_component(
+                (status, previous, step), (start, source_line[0] - offset - 1), (lines, kinds, offset), validate)
             valid_syntax &= is_valid
 
-        if start < num:
-            valid_syntax &= self._process_last_component(step, start, lines, validate)
+        if start < len(lines):
+            valid_syntax &= self._process_last_component(step, start, (lines, kinds, offset), validate)
+        self.description = "\n".join(description) if description else None
         return valid_syntax and is_valid
 
-    def _handle_docstring(self, status: str, doc_string: str, line: Tuple[int, str], validate: bool) -> Tuple[str, str, bool]:
-        _, text = line
-        stripped_line = text.strip()
-        if stripped_line.startswith("```") and doc_string == "backquote":
+    def _handle_docstring(self, status: int, doc_string: str, line: Tuple[int, str, int], validate: bool) -> Tuple[int, str, bool]:
+        kind = line[2]
+        if kind == BACKQUOTE_FENCE and doc_string == "backquote":
             return status, "", True
-        if stripped_line.startswith("```") and doc_string == "":
-            return f"{status} DOC-STRING", "backquote", self._validate_position(f"{status} DOC-STRING", status, line, validate)
-        if stripped_line.startswith('"""') and doc_string == "quote":
+        if kind == BACKQUOTE_FENCE and doc_string == "":
+            return doc_string_status(status), "backquote", self._validate_position(doc_string_status(status), status, line, validate)
+        if kind == QUOTE_FENCE and doc_string == "quote":
             return status, "", True
-        if stripped_line.startswith('"""') and doc_string == "":
-            return f"{status} DOC-STRING", "quote", self._validate_position(f"{status} DOC-STRING", status, line, validate)
+        if kind == QUOTE_FENCE and doc_string == "":
+            return doc_string_status(status), "quote", self._validate_position(doc_string_status(status), status, line, validate)
         return status, doc_string, True
 
-    def _handle_title(self, status: str, line: Tuple[int, str], validate: bool) -> Tuple[str, bool]:
-        _, text = line
-        stripped_line = text.strip()
-        if stripped_line.startswith("Background:"):
-            return "BACKGROUND", self._validate_position("BACKGROUND", status, line, validate)
+    def _handle_title(self, status: int, line: Tuple[int, str, int], validate: bool) -> Tuple[int, bool]:
+        kind = line[2]
+        if kind == BACKGROUND:
+            return BACKGROUND, self._validate_position(BACKGROUND, status, line, validate)
         return status, True
 
-    def _handle_description(self, status: str, line: Tuple[int, str], validate: bool) -> Tuple[str, bool]:
-        _, text = line
-        stripped_line = text.strip()
-        if stripped_line and not stripped_line.startswith(("Background:", "Given ", "And ", "* ", "|")):
-            is_valid = self._validate_position("BACKGROUND DESCRIPTION", status, line, validate)
-            self.description = text if self.description is None else self.description + "\n" + text
-            return "BACKGROUND DESCRIPTION", is_valid
+    def _handle_description(self, status: int, description: List[str], line: Tuple[int, str, int], validate: bool) -> Tuple[int, bool]:
+        _, text, kind = line
+        if kind not in (BLANK, BACKGROUND, GIVEN, AND, TABLE):
+            is_valid = self._validate_position(BACKGROUND_DESCRIPTION, status, line, validate)
+            description.append(text)
+            return BACKGROUND_DESCRIPTION, is_valid
         return status, True
 
-    def _handle_step(self, status: str, step: str, line: Tuple[int, str], validate: bool) -> Tuple[str, str, bool]:
-        num, text = line
-        stripped_line = text.strip()
-        if validate and stripped_line.startswith(("When", "Then", "But")):
-            raise ValueError(f"Keyword '{stripped_line.split(' ', maxsplit=1)[0].upper()}' cannot be in Background component at line [{num}]: {text}")
-        if stripped_line.startswith("Given "):
-            keyword = stripped_line.split(" ", maxsplit=1)[0].upper()
-            return keyword, keyword, self._validate_position(keyword, status, line, validate)
-        if stripped_line.startswith(("And ", "* ")):
+    def _handle_step(self, status: int, step: int, line: Tuple[int, str, int], validate: bool) -> Tuple[int, int, bool]:
+        num, text, kind = line
+        if validate and WHEN <= kind <= BUT:
+            raise ValueError(f"Keyword '{KEYWORD_STATUSES[kind]}' cannot be in Background component at line [{num}]: {text}")
+        if kind == GIVEN:
+            return GIVEN, GIVEN, self._validate_position(GIVEN, status, line, validate)
+        if kind == AND:
             return step, step, self._validate_position(step, status, line, validate)
         return status, step, True
 
-    def _handle_table(self, status: str, line: Tuple[int, str], validate: bool) -> Tuple[str, bool]:
-        _, text = line
-        stripped_line = text.strip()
-        if stripped_line.startswith("|"):
-            status = f"{status} TABLE" if not status.endswith("TABLE") else status
+    def _handle_table(self, status: int, line: Tuple[int, str, int], validate: bool) -> Tuple[int, bool]:
+        kind = line[2]
+        if kind == TABLE:
+            status = table_status(status)
             return status, self._validate_position(status, status, line, validate)
         return status, True
 
-    def _validate_position(self, keyword: str, status: str, line: Tuple[int, str], validate: bool) -> bool:
-        num, text = line
-        allowed_positions = ALLOWED_BACKGROUND_POSITIONS.get(keyword)
-        if validate and allowed_positions is None:
-            if keyword.endswith("TABLE"):
-                raise ValueError(f"Table component cannot be after '{keyword.removesuffix(' TABLE')}' at line [{num}]: {text}")
-            if keyword.endswith("DOC-STRING"):
-                raise ValueError(f"Doc-string component cannot be after '{keyword.removesuffix(' DOC-STRING')}' at line [{num}]: {text}")
-            raise ValueError(f"Could not resolve current status '{keyword}' as a valid possibility at line [{num}]: {text}")
-        if validate and allowed_positions is not None and status not in allowed_positions:
-            raise ValueError(f"Keyword '{keyword}' cannot be after '{status}' at line [{num}]: {text}")
-        return allowed_positions is not None and status in allowed_positions
-
-    def _process_component(self, status: Tuple[str, str, str], position: Tuple[int, int], lines: List[str], validate: bool) -> Tuple[str, str, int, bool]:
+    def _validate_position(self, keyword: int, status: int, line: Tuple[int, str, int], validate: bool) -> bool:
+        error = position_error(ALLOWED_BACKGROUND_TRANSITIONS, keyword, status)
+        if validate and error is not None:
+            num, text, _ = line
+            raise ValueError(f"{error} at line [{num}]: {text}")
+        return error is None
+
+    def _process_component(self, status: Tuple[int, int, int], position: Tuple[int, int], source: Source, validate: bool) -> Tuple[int, int, int, bool]:
+        lines, kinds, offset = source
         current, previous, step = status
         start, end = position
         is_valid: bool = True
-        if current == "GIVEN" and previous.startswith("GIVEN"):
+        if current == GIVEN and STATUSES[previous].startswith("GIVEN"):
             if self.steps is None:
                 self.steps = []
             self.steps.append(Step())
-            if lines[start].strip().startswith("And "):
-                fixed_step = lines[start].replace("And", step.capitalize(), 1)
-                is_valid = self.steps[-1].process(("\n" * start) + fixed_step + "\n" + "\n".join(lines[start+1:end]), validate)
-            elif lines[start].strip().startswith("* "):
-                fixed_step = lines[start].replace("*", step.capitalize(), 1)
-                is_valid = self.steps[-1].process(("\n" * start) + fixed_step + "\n" + "\n".join(lines[start+1:end]), validate)
+            if kinds[start] == AND:
+                fixed_step = lines[start].replace(lines[start].split(maxsplit=1)[0], STATUSES[step].capitalize(), 1)
+                is_valid = self.steps[-1].process(fixed_step + "\n" + "\n".join(lines[start+1:end]), validate, offset + start, kinds[start:end])
             else:
-                is_valid = self.steps[-1].process(("\n" * start) + "\n".join(lines[start:end]), validate)
+                is_valid = self.steps[-1].process("\n".join(lines[start:end]), validate, offset + start, kinds[start:end])
             return current, step, end, is_valid
         return current, step, start, is_valid
 
-    def _process_last_component(self, step: str, start: int, lines: List[str], validate: bool) -> bool:
+    def _process_last_component(self, step: int, start: int, source: Source, validate: bool) -> bool:
+        lines, kinds, offset = source
         is_valid: bool = True
         if self.steps is None:
             self.steps = []
         self.steps.append(Step())
-        if lines[start].strip().startswith("And "):
-            fixed_step = lines[start].replace("And", step.capitalize(), 1)
-            is_valid = self.steps[-1].process(("\n" * start) + fixed_step + "\n" + "\n".join(lines[start+1:]), validate)
-        elif lines[start].strip().startswith("* "):
-            fixed_step = lines[start].replace("*", step.capitalize(), 1)
-            is_valid = self.steps[-1].process(("\n" * start) + fixed_step + "\n" + "\n".join(lines[start+1:]), validate)
+        if kinds[start] == AND:
+            fixed_step = lines[start].replace(lines[start].split(maxsplit=1)[0], STATUSES[step].capitalize(), 1)
+            is_valid = self.steps[-1].process(fixed_step + "\n" + "\n".join(lines[start+1:]), validate, offset + start, kinds[start:])
         else:
-            is_valid = self.steps[-1].process(("\n" * start) + "\n".join(lines[start:]), validate)
+            is_valid = self.steps[-1].process("\n".join(lines[start:]), validate, offset + start, kinds[start:])
         return is_valid
@@ -0,0 +1,55 @@
+"""Define the Diagnostic class, which represents a syntax issue of Gherkin text.
+
+The Diagnostic class describes where an issue is, which keyword caused it, and which statuses the keyword is allowed
+after, so all issues of a text can be reported from one pass instead of stopping at the first one.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+
+@dataclass(slots=True)
+class Diagnostic:
+    """Represent a syntax issue of Gherkin text.
+
+    Attributes:
+        line (int): The number of the line, starting from one.
+        column (int): The column of the first non-whitespace character of the line, starting from one.
+        keyword (str): The status of the line, like "SCENARIO" or "GIVEN TABLE", or the keyword the issue is about.
+        expected (List[str]): The statuses the keyword is allowed after, for the position issues, or an empty list.
+        message (str): The message of the issue, the same as the error raised by the validation.
+
+    Methods:
+        __str__() -> str:
+            Return the message of the issue.
+        to_dictionary() -> Dict[str, Any]:
+            Convert the Diagnostic object to a dictionary representation.
+    """
+
+    line: int
+    column: int
+    keyword: str
+    expected: List[str]
+    message: str
+
+    def __str__(self) -> str:
+        """Return the message of the issue.
+
+        Returns:
+            str: The message of the issue.
+        """
+        return self.message
+
+    def to_dictionary(self) -> Dict[str, Any]:
+        """Convert the Diagnostic object to a dictionary representation.
+
+        Returns:
+            Dict[str, Any]: The dictionary representation of the Diagnostic object.
+        """
+        return {
+            "line": self.line,
+            "column": self.column,
+            "keyword": self.keyword,
+            "expected": self.expected,
+            "message": self.message
+        }
@@ -4,10 +4,12 @@ The Feature class provides functionality to process, validate, and convert featu
 """
 
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Mapping, Sequence
 
+from gherkin_processor.private.lines import FEATURE, split_lines
 
-@dataclass
+
+@dataclass(slots=True)
 class Feature:
     """Represent a Gherkin feature.
 
@@ -24,7 +26,9 @@ class Feature:
             Convert the Feature object to a string representation.
         to_dictionary() -> Dict[str, Any]:
             Convert the Feature object to a dictionary representation.
-        process(text: str, validate: bool) -> bool:
+        from_dictionary(feature: Mapping[str, Any]) -> Feature:
+            Create a Feature object from the dictionary representation.
+        process(text: str, validate: bool, offset: int, kinds: Sequence[int] | None) -> bool:
             Process the feature text and validate its syntax.
     """
 
@@ -70,12 +74,34 @@ class Feature:
             "description": self.description
         }
 
-    def process(self, text: str, validate: bool) -> bool:
+    @classmethod
+    def from_dictionary(cls, feature: Mapping[str, Any]) -> "Feature":
+        """Create a Feature object from the dictionary representation.
+
+        The dictionary representation is the one of the JSON output, of 'dataclasses.asdict', or of 'to_dictionary'.
+
+        Args:
+            feature (Mapping[str, Any]): The dictionary representation of the feature.
+
+        Returns:
+            Feature: The Feature object with the same values.
+
+        Raises:
+            KeyError: If a value is missing from the dictionary representation.
+        """
+        result = cls()
+        result.name = feature["name"]
+        result.description = feature["description"]
+        return result
+
+    def process(self, text: str, validate: bool, offset: int = 0, kinds: Sequence[int] | None = None) -> bool:
         """Process the feature text and validate its syntax.
 
         Args:
             text (str): The feature text to be processed.
             validate (bool): Whether to validate the syntax during processing.
+            offset (int): The number of source lines before the text, used for the line numbers of the errors.
+            kinds (Sequence[int] | None): The kind codes of the text lines, classified from the text if not given.
 
         Returns:
             bool: True if the syntax is valid, False otherwise.
@@ -89,14 +115,12 @@ class Feature:
 
         valid_syntax: bool = True
         status = "<BEGINNING>"
-        lines: List[str] = text.splitlines()
+        lines, kinds = split_lines(text, kinds)
         description: List[str] = []
 
-        for num, line in enumerate(lines, 1):
-            stripped_line = line.strip()
-
-            if stripped_line.startswith("Feature:"):
-                self.name = stripped_line.removeprefix("Feature:").lstrip()
+        for num, (line, kind) in enumerate(zip(lines, kinds), offset + 1):
+            if kind == FEATURE:
+                self.name = line.strip().removeprefix("Feature:").lstrip()
                 if validate and not self.name:
                     raise ValueError(f"Keyword 'FEATURE' must be followed with text at line [{num}]: {line}")
                 valid_syntax = bool(self.name)
@@ -4,10 +4,12 @@ The Rule class provides functionality to process, validate, and convert rule com
 """
 
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Mapping, Sequence
 
+from gherkin_processor.private.lines import RULE, split_lines
 
-@dataclass
+
+@dataclass(slots=True)
 class Rule:
     """Represent a Gherkin rule.
 
@@ -24,7 +26,9 @@ class Rule:
             Convert the Rule object to a string representation.
         to_dictionary() -> Dict[str, Any]:
             Convert the Rule object to a dictionary representation.
-        process(text: str, validate: bool) -> bool:
+        from_dictionary(rule: Mapping[str, Any]) -> Rule:
+            Create a Rule object from the dictionary representation.
+        process(text: str, validate: bool, offset: int, kinds: Sequence[int] | None) -> bool:
             Process the rule text and validate its syntax.
     """
 
@@ -70,12 +74,34 @@ class Rule:
             "description": self.description
         }
 
-    def process(self, text: str, validate: bool) -> bool:
+    @classmethod
+    def from_dictionary(cls, rule: Mapping[str, Any]) -> "Rule":
+        """Create a Rule object from the dictionary representation.
+
+        The dictionary representation is the one of the JSON output, of 'dataclasses.asdict', or of 'to_dictionary'.
+
+        Args:
+            rule (Mapping[str, Any]): The dictionary representation of the rule.
+
+        Returns:
+            Rule: The Rule object with the same values.
+
+        Raises:
+            KeyError: If a value is missing from the dictionary representation.
+        """
+        result = cls()
+        result.name = rule["name"]
+        result.description = rule["description"]
+        return result
+
+    def process(self, text: str, validate: bool, offset: int = 0, kinds: Sequence[int] | None = None) -> bool:
         """Process the rule text and validate its syntax.
 
         Args:
             text (str): The rule text to be processed.
             validate (bool): Whether to validate the syntax during processing.
+            offset (int): The number of source lines before the text, used for the line numbers of the errors.
+            kinds (Sequence[int] | None): The kind codes of the text lines, classified from the text if not given.
 
         Returns:
             bool: True if the syntax is valid, False otherwise.
@@ -89,14 +115,12 @@ class Rule:
 
         valid_syntax: bool = True
         status = "<BEGINNING>"
-        lines: List[str] = text.splitlines()
+        lines, kinds = split_lines(text, kinds)
         description: List[str] = []
 
-        for num, line in enumerate(lines, 1):
-            stripped_line = line.strip()
-
-            if stripped_line.startswith("Rule:"):
-                self.name = stripped_line.removeprefix("Rule:").lstrip()
+        for num, (line, kind) in enumerate(zip(lines, kinds), offset + 1):
+            if kind == RULE:
+                self.name = line.strip().removeprefix("Rule:").lstrip()
                 if validate and not self.name:
                     raise ValueError(f"Keyword 'RULE' must be followed with text at line [{num}]: {line}")
                 valid_syntax = bool(self.name)
@@ -3,15 +3,28 @@
 The Scenario class provides functionality to process, validate, and convert scenario components into string or dictionary representations.
 """
 
+from copy import deepcopy
 from dataclasses import dataclass
-from typing import Any, Dict, List, Tuple
+from itertools import count
+from typing import Any, Dict, Iterator, List, Mapping, Sequence, TextIO, Tuple
 
 from gherkin_processor.components.step import Step
-from gherkin_processor.private.formatters import format_table
-from gherkin_processor.private.positions import ALLOWED_SCENARIO_POSITIONS
-
-
-@dataclass
+from gherkin_processor.components.table import Table, table_memo
+from gherkin_processor.private.dictionaries import as_mapping
+from gherkin_processor.private.formatters import iter_table_chunks
+from gherkin_processor.private.lines import (AND, BACKGROUND, BACKQUOTE_FENCE,
+                                             BUT, DESCRIPTION, EXAMPLES,
+                                             FEATURE, GIVEN, QUOTE_FENCE, RULE,
+                                             SCENARIO, TABLE, TAG, THEN, WHEN,
+                                             Source, split_lines)
+from gherkin_processor.private.positions import (ALLOWED_SCENARIO_TRANSITIONS,
+                                                 BEGINNING, NO_STEP, OUTLINE,
+                                                 SCENARIO_DESCRIPTION,
+                                                 STATUSES, doc_string_status,
+                                                 position_error, table_status)
+
+
+@dataclass(slots=True)
 class Scenario:
     """Represent a Gherkin scenario.
 
@@ -20,7 +33,7 @@ class Scenario:
         name (str): The name of the scenario.
         description (str | None): The description of the scenario.
         steps (List[Step]): The steps in the scenario.
-        outline (Dict[str, List[str]] | None): The outline table for scenario outlines.
+        outline (Table | None): The outline table for scenario outlines.
 
     Methods:
         __init__() -> None:
@@ -29,9 +42,17 @@ class Scenario:
             Return the string representation of the Scenario object.
         to_string() -> str:
             Convert the Scenario object to a string representation.
+        iter_chunks() -> Iterator[str]:
+            Yield the string representation of the Scenario object in chunks.
+        write_to(file: TextIO) -> None:
+            Write the string representation of the Scenario object to a file.
         to_dictionary() -> Dict[str, Any]:
             Convert the Scenario object to a dictionary representation.
-        process(text: str, validate: bool) -> bool:
+        copy() -> Scenario:
+            Return a deep copy of the Scenario object, which keeps the tables as Table objects.
+        from_dictionary(scenario: Mapping[str, Any]) -> Scenario:
+            Create a Scenario object from the dictionary representation.
+        process(text: str, validate: bool, offset: int, kinds: Sequence[int] | None) -> bool:
             Process the scenario text and validate its syntax.
     """
 
@@ -39,7 +60,7 @@ class Scenario:
     name: str
     description: str | None
     steps: List[Step]
-    outline: Dict[str, List[str]] | None
+    outline: Table | None
 
     def __init__(self) -> None:
         """Initialize the Scenario object with default values."""
@@ -59,17 +80,36 @@ class Scenario:
         Returns:
             str: The string representation of the Scenario object.
         """
+        return "".join(self.iter_chunks())
+
+    def iter_chunks(self) -> Iterator[str]:
+        """Yield the string representation of the Scenario object in chunks, without building the whole string.
+
+        Yields:
+            str: The next chunk of the string representation.
+        """
         lines: List[str] = []
         if self.tags is not None:
             lines.extend(f"@{tag}" for tag in self.tags)
         lines.append(f"Scenario: {self.name}" if self.outline is None else f"Scenario Outline: {self.name}")
         if self.description is not None:
             lines.append(self.description)
-        lines.extend(str(step) for step in self.steps)
+        yield "\n".join(lines)
+        for step in self.steps:
+            yield "\n"
+            yield from step.iter_chunks()
         if self.outline is not None:
-            lines.append(format_table(self.outline))
-        lines.append("")
-        return "\n".join(lines)
+            yield "\n"
+            yield from iter_table_chunks(self.outline)
+        yield "\n"
+
+    def write_to(self, file: TextIO) -> None:
+        """Write the string representation of the Scenario object to a file chunk by chunk.
+
+        Args:
+            file (TextIO): The text file or stream to write to.
+        """
+        file.writelines(self.iter_chunks())
 
     def to_dictionary(self) -> Dict[str, Any]:
         """Convert the Scenario object to a dictionary representation.
@@ -82,15 +122,48 @@ class Scenario:
             "name": self.name,
             "description": self.description,
             "steps": self.steps,
-            "outline": self.outline
+            "outline": None if self.outline is None else self.outline.to_dictionary()
         }
 
-    def process(self, text: str, validate: bool) -> bool:
+    def copy(self) -> "Scenario":
+        """Return a deep copy of the Scenario object, which keeps the outline and the step tables as Table objects.
+
+        Returns:
+            Scenario: The copy, which shares no mutable value with this scenario.
+        """
+        return deepcopy(self, table_memo([self.outline, *(step.table for step in self.steps)]))
+
+    @classmethod
+    def from_dictionary(cls, scenario: Mapping[str, Any]) -> "Scenario":
+        """Create a Scenario object from the dictionary representation.
+
+        The dictionary representation is the one of the JSON output, of 'dataclasses.asdict', or of 'to_dictionary'.
+
+        Args:
+            scenario (Mapping[str, Any]): The dictionary representation of the scenario.
+
+        Returns:
+            Scenario: The Scenario object with the same values.
+
+        Raises:
+            KeyError: If a value is missing from the dictionary representation.
+        """
+        result = cls()
+        result.tags = None if scenario["tags"] is None else list(scenario["tags"])
+        result.name = scenario["name"]
+        result.description = scenario["description"]
+        result.steps = [Step.from_dictionary(as_mapping(step)) for step in scenario["steps"]]
+        result.outline = None if scenario["outline"] is None else Table.from_dictionary(scenario["outline"])
+        return result
+
+    def process(self, text: str, validate: bool, offset: int = 0, kinds: Sequence[int] | None = None) -> bool:
         """Process the scenario text and validate its syntax.
 
         Args:
             text (str): The scenario text to be processed.
             validate (bool): Whether to validate the syntax during processing.
+            offset (int): The number of source lines before the text, used for the line numbers of the errors.
+            kinds (Sequence[int] | None): The kind codes of the text lines, classified from the text if not given.
 
         Returns:
             bool: True if the syntax is valid, False otherwise.
@@ -103,201 +176,163 @@ class Scenario:
             raise TypeError("Variable 'text' is not string type")
 
         valid_syntax: bool = True
-        lines: List[str] = text.splitlines()
-        previous: str = "<BEGINNING>"
-        status: str = "<BEGINNING>"
-        step: str = ""
+        is_valid: bool = True
+        lines, kinds = split_lines(text, kinds)
+        previous: int = BEGINNING
+        status: int = BEGINNING
+        step: int = NO_STEP
         doc_string: str = ""
         start: int = 0
-        num: int = 0
+        description: List[str] = [] if self.description is None else [self.description]
 
-        for num, line in enumerate(lines, 1):
-            status, doc_string, is_valid = self._handle_docstring(status, doc_string, (num, line), validate)
+        for source_line in zip(count(offset + 1), lines, kinds):
+            status, doc_string, is_valid = self._handle_docstring(status, doc_string, source_line, validate)
             valid_syntax &= is_valid
 
-            if doc_string != "" or line.strip().startswith(("```", '"""')):
+            if doc_string != "" or source_line[2] in (BACKQUOTE_FENCE, QUOTE_FENCE):
                 continue
 
-            status, is_valid = self._handle_tag(status, (num, line), validate)
+            status, is_valid = self._handle_tag(status, source_line, validate)
             valid_syntax &= is_valid
 
-            status, is_valid = self._handle_name(status, (num, line), validate)
+            status, is_valid = self._handle_name(status, source_line, validate)
             valid_syntax &= is_valid
 
-            status, is_valid = self._handle_description(status, (num, line), validate)
+            status, is_valid = self._handle_description(status, description, source_line, validate)
             valid_syntax &= is_valid
 
-            status, step, is_valid = self._handle_step(status, step, (num, line), validate)
+            status, step, is_valid = self._handle_step(status, step, source_line, validate)
             valid_syntax &= is_valid
 
-            status, is_valid = self._handle_table(status, (num, line), validate)
+            status, is_valid = self._handle_table(status, source_line, validate)
             valid_syntax &= is_valid
 
-            status, is_valid = self._handle_outline(status, (num, line), validate)
+            status, is_valid = self._handle_outline(status, source_line, validate)
             valid_syntax &= is_valid
 
-            previous, start, is_valid = self._process_component((status, previous), (start, num-1), lines, validate)
+            previous, start, is_valid = self._process_component((status, previous), (start, source_line[0] - offset - 1), (lines, kinds, offset), validate)
             valid_syntax &= is_valid
 
-        if start < num:
-            valid_syntax &= self._process_last_component((previous, step), start, lines, validate)
+        if start < len(lines):
+            valid_syntax &= self._process_last_component((previous, step), start, (lines, kinds, offset), validate)
+        self.description = "\n".join(description) if description else None
         return valid_syntax and is_valid
 
-    def _handle_docstring(self, status: str, doc_string: str, line: Tuple[int, str], validate: bool) -> Tuple[str, str, bool]:
-        _, text = line
-        stripped_line = text.strip()
-        if stripped_line.startswith("```") and doc_string == "backquote":
+    def _handle_docstring(self, status: int, doc_string: str, line: Tuple[int, str, int], validate: bool) -> Tuple[int, str, bool]:
+        kind = line[2]
+        if kind == BACKQUOTE_FENCE and doc_string == "backquote":
             return status, "", True
-        if stripped_line.startswith("```") and doc_string == "":
-            return f"{status} DOC-STRING", "backquote", self._validate_position(f"{status} DOC-STRING", status, line, validate)
-        if stripped_line.startswith('"""') and doc_string == "quote":
+        if kind == BACKQUOTE_FENCE and doc_string == "":
+            return doc_string_status(status), "backquote", self._validate_position(doc_string_status(status), status, line, validate)
+        if kind == QUOTE_FENCE and doc_string == "quote":
             return status, "", True
-        if stripped_line.startswith('"""') and doc_string == "":
-            return f"{status} DOC-STRING", "quote", self._validate_position(f"{status} DOC-STRING", status, line, validate)
+        if kind == QUOTE_FENCE and doc_string == "":
+            return doc_string_status(status), "quote", self._validate_position(doc_string_status(status), status, line, validate)
         return status, doc_string, True
 
-    def _handle_tag(self, status: str, line: Tuple[int, str], validate: bool) -> Tuple[str, bool]:
-        num, text = line
-        stripped_line = text.strip()
-        if stripped_line.startswith("@"):
-            is_valid = self._validate_position("TAG", status, line, validate)
+    def _handle_tag(self, status: int, line: Tuple[int, str, int], validate: bool) -> Tuple[int, bool]:
+        num, text, kind = line
+        if kind == TAG:
+            stripped_line = text.strip()
+            is_valid = self._validate_position(TAG, status, line, validate)
             if validate and not all(word.startswith("@") for word in stripped_line.split(" ")):
                 raise ValueError(f"Not all text is a 'TAG' at line [{num}]: {text}")
             if self.tags is None:
                 self.tags = []
             self.tags.extend([tag.removeprefix("@") for tag in filter(lambda word: word.startswith("@"), stripped_line.split(" "))])
             self.tags = sorted(list(set(self.tags)))
-            return "TAG", is_valid and all(word.startswith("@") for word in text.split(" "))
+            return TAG, is_valid and all(word.startswith("@") for word in text.split(" "))
         return status, True
 
-    def _handle_name(self, status: str, line: Tuple[int, str], validate: bool) -> Tuple[str, bool]:
-        num, text = line
-        stripped_line = text.strip()
-        if stripped_line.startswith(("Scenario:", "Example:", "Scenario Outline:", "Scenario Template:", "Example Outline:", "Example Template:")):
-            is_valid = self._validate_position("SCENARIO", status, line, validate)
-            if stripped_line.startswith("Scenario:"):
-                self.name = stripped_line.removeprefix("Scenario:").strip()
-            if stripped_line.startswith("Example:"):
-                self.name = stripped_line.removeprefix("Example:").strip()
-            if stripped_line.startswith(("Scenario Outline:", "Example Outline:")):
-                name = stripped_line.removeprefix("Scenario ").removeprefix("Example ").removeprefix("Outline:")
-                self.name = name.strip()
-                self.outline = {}
-            if stripped_line.startswith(("Scenario Template:", "Example Template:")):
-                name = stripped_line.removeprefix("Scenario ").removeprefix("Example ").removeprefix("Template:")
-                self.name = name.strip()
-                self.outline = {}
+    def _handle_name(self, status: int, line: Tuple[int, str, int], validate: bool) -> Tuple[int, bool]:
+        num, text, kind = line
+        if kind == SCENARIO:
+            is_valid = self._validate_position(SCENARIO, status, line, validate)
+            keyword, _, name = text.strip().partition(":")
+            self.name = name.strip()
+            if keyword.endswith(("Outline", "Template")):
+                self.outline = Table()
             if validate and not self.name:
-                raise ValueError(f"Scenario keyword must contain text after keyword at line [{num}]: {line}")
-            return "SCENARIO", is_valid and bool(self.name)
+                raise ValueError(f"Scenario keyword must contain text after keyword at line [{num}]: {(num, text)}")
+            return SCENARIO, is_valid and bool(self.name)
         return status, True
 
-    def _handle_description(self, status: str, line: Tuple[int, str], validate: bool) -> Tuple[str, bool]:
-        _, text = line
-        stripped_line = text.strip()
-        if stripped_line and not stripped_line.startswith(("@",
-                                                           "Scenario:",
-                                                           "Example:",
-                                                           "Scenario Outline:",
-                                                           "Scenario Template:",
-                                                           "Example Outline:",
-                                                           "Example Template:",
-                                                           "Given ",
-                                                           "When",
-                                                           "Then",
-                                                           "But",
-                                                           "And ",
-                                                           "* ",
-                                                           "|",
-                                                           "Scenarios:",
-                                                           "Examples:")):
-            is_valid = self._validate_position("SCENARIO DESCRIPTION", status, line, validate)
-            self.description = text if self.description is None else self.description + "\n" + text
-            return "SCENARIO DESCRIPTION", is_valid
+    def _handle_description(self, status: int, description: List[str], line: Tuple[int, str, int], validate: bool) -> Tuple[int, bool]:
+        _, text, kind = line
+        if kind in (DESCRIPTION, FEATURE, RULE, BACKGROUND):
+            is_valid = self._validate_position(SCENARIO_DESCRIPTION, status, line, validate)
+            description.append(text)
+            return SCENARIO_DESCRIPTION, is_valid
         return status, True
 
-    def _handle_step(self, status: str, step: str, line: Tuple[int, str], validate: bool) -> Tuple[str, str, bool]:
-        _, text = line
-        stripped_line = text.strip()
-        if stripped_line.startswith(("Given ", "When ", "Then ", "But ")):
-            keyword = stripped_line.split(" ", maxsplit=1)[0].upper()
-            return keyword, keyword, self._validate_position(keyword, status, line, validate)
-        if stripped_line.startswith(("And ", "* ")):
+    def _handle_step(self, status: int, step: int, line: Tuple[int, str, int], validate: bool) -> Tuple[int, int, bool]:
+        kind = line[2]
+        if GIVEN <= kind <= BUT:
+            return kind, kind, self._validate_position(kind, status, line, validate)
+        if kind == AND:
             return step, step, self._validate_position(step, status, line, validate)
         return status, step, True
 
-    def _handle_table(self, status: str, line: Tuple[int, str], validate: bool) -> Tuple[str, bool]:
-        _, text = line
-        stripped_line = text.strip()
-        if stripped_line.startswith("|"):
-            status = f"{status} TABLE" if not status.endswith("TABLE") else status
+    def _handle_table(self, status: int, line: Tuple[int, str, int], validate: bool) -> Tuple[int, bool]:
+        kind = line[2]
+        if kind == TABLE:
+            status = table_status(status)
             return status, self._validate_position(status, status, line, validate)
         return status, True
 
-    def _handle_outline(self, status: str, line: Tuple[int, str], validate: bool) -> Tuple[str, bool]:
-        num, text = line
-        stripped_line = text.strip()
-        if stripped_line.startswith(("Scenarios:", "Examples:")):
-            is_valid = self._validate_position("OUTLINE", status, line, validate)
+    def _handle_outline(self, status: int, line: Tuple[int, str, int], validate: bool) -> Tuple[int, bool]:
+        num, text, kind = line
+        if kind == EXAMPLES:
+            is_valid = self._validate_position(OUTLINE, status, line, validate)
             if validate and self.outline is None:
                 raise ValueError(f"Scenario outline must be marked in the scenario name keyword at line [{num}]: {text}")
-            return "OUTLINE", is_valid
+            return OUTLINE, is_valid
         return status, True
 
-    def _validate_position(self, keyword: str, status: str, line: Tuple[int, str], validate: bool) -> bool:
-        num, text = line
-        allowed_positions = ALLOWED_SCENARIO_POSITIONS.get(keyword)
-        if validate and allowed_positions is None:
-            if keyword.endswith("TABLE"):
-                raise ValueError(f"Table component cannot be after '{keyword.removesuffix(' TABLE')}' at line [{num}]: {text}")
-            if keyword.endswith("DOC-STRING"):
-                raise ValueError(f"Doc-string component cannot be after '{keyword.removesuffix(' DOC-STRING')}' at line [{num}]: {text}")
-            raise ValueError(f"Could not resolve current status '{keyword}' as a valid possibility at line [{num}]: {text}")
-        if validate and allowed_positions is not None and status not in allowed_positions:
-            raise ValueError(f"Keyword '{keyword}' cannot be after '{status}' at line [{num}]: {text}")
-        return allowed_positions is not None and status in allowed_positions
-
-    def _process_component(self, status: Tuple[str, str], position: Tuple[int, int], lines: List[str], validate: bool) -> Tuple[str, int, bool]:
+    def _validate_position(self, keyword: int, status: int, line: Tuple[int, str, int], validate: bool) -> bool:
+        error = position_error(ALLOWED_SCENARIO_TRANSITIONS, keyword, status)
+        if validate and error is not None:
+            num, text, _ = line
+            raise ValueError(f"{error} at line [{num}]: {text}")
+        return error is None
+
+    def _process_component(self, status: Tuple[int, int], position: Tuple[int, int], source: Source, validate: bool) -> Tuple[int, int, bool]:
+        lines, kinds, offset = source
         current, previous = status
         start, end = position
         is_valid: bool = True
-        if current in ["GIVEN", "WHEN", "THEN", "BUT", "OUTLINE"]:
-            match previous:
+        if current in (GIVEN, WHEN, THEN, BUT, OUTLINE):
+            match STATUSES[previous]:
                 case "GIVEN" | "WHEN" | "THEN" | "BUT":
                     if any(lines[start:end]):
                         self.steps.append(Step())
-                        if lines[start].strip().startswith("And "):
-                            fixed_step = lines[start].replace("And", previous.capitalize(), 1)
-                            is_valid = self.steps[-1].process(("\n" * start) + fixed_step + "\n" + "\n".join(lines[start+1:end]), validate)
-                        elif lines[start].strip().startswith("* "):
-                            fixed_step = lines[start].replace("*", previous.capitalize(), 1)
-                            is_valid = self.steps[-1].process(("\n" * start) + fixed_step + "\n" + "\n".join(lines[start+1:end]), validate)
+                        if kinds[start] == AND:
+                            fixed_step = lines[start].replace(lines[start].split(maxsplit=1)[0], STATUSES[previous].capitalize(), 1)
+                            is_valid = self.steps[-1].process(fixed_step + "\n" + "\n".join(lines[start+1:end]), validate, offset + start, kinds[start:end])
                         else:
-                            is_valid = self.steps[-1].process(("\n" * start) + "\n".join(lines[start:end]), validate)
+                            is_valid = self.steps[-1].process("\n".join(lines[start:end]), validate, offset + start, kinds[start:end])
                 case "OUTLINE":
                     table = Step()
-                    table.process(("\n" * start) + "\n".join(lines[start:end]), False)
+                    table.process("\n".join(lines[start:end]), False, offset + start, kinds[start:end])
                     self.outline = table.table
             return current, end, is_valid
         return previous, start, is_valid
 
-    def _process_last_component(self, status: Tuple[str, str], start: int, lines: List[str], validate: bool) -> bool:
+    def _process_last_component(self, status: Tuple[int, int], start: int, source: Source, validate: bool) -> bool:
+        lines, kinds, offset = source
         previous, step = status
         is_valid: bool = True
-        match previous:
+        match STATUSES[previous]:
             case "GIVEN" | "WHEN" | "THEN" | "BUT":
                 if any(lines[start:]):
                     self.steps.append(Step())
-                    if lines[start].strip().startswith("And "):
-                        fixed_step = lines[start].replace("And", step.capitalize(), 1)
-                        is_valid = self.steps[-1].process(("\n" * start) + fixed_step + "\n" + "\n".join(lines[start+1:]), validate)
-                    elif lines[start].strip().startswith("* "):
-                        fixed_step = lines[start].replace("*", step.capitalize(), 1)
-                        is_valid = self.steps[-1].process(("\n" * start) + fixed_step + "\n" + "\n".join(lines[start+1:]), validate)
+                    if kinds[start] == AND:
+                        fixed_step = lines[start].replace(lines[start].split(maxsplit=1)[0], STATUSES[step].capitalize(), 1)
+                        is_valid = self.steps[-1].process(fixed_step + "\n" + "\n".join(lines[start+1:]), validate, offset + start, kinds[start:])
                     else:
-                        is_valid = self.steps[-1].process(("\n" * start) + "\n".join(lines[start:]), validate)
+                        is_valid = self.steps[-1].process("\n".join(lines[start:]), validate, offset + start, kinds[start:])
             case "OUTLINE":
                 table = Step()
-                table.process(("\n" * start) + "\n".join(lines[start:]), False)
+                table.process("\n".join(lines[start:]), False, offset + start, kinds[start:])
                 self.outline = table.table
         return is_valid
@@ -0,0 +1,564 @@
+"""Define the SourceBuffer and Span classes, and the components which keep their text as spans of the source.
+
+The source components are built by the "span" parser engine. They keep one shared source buffer, which may be an
+encoded or memory-mapped file, store the start and end offsets of their texts in it, and build the strings only when
+the attributes are read, so their string and dictionary representations are the same as the ones of the regular
+components.
+"""
+
+from array import array
+from bisect import bisect_right
+from codecs import (BOM_UTF8, BOM_UTF16_BE, BOM_UTF16_LE, BOM_UTF32_BE,
+                    BOM_UTF32_LE, getincrementalencoder, lookup)
+from io import TextIOWrapper
+from itertools import accumulate
+from mmap import ACCESS_READ, mmap
+from operator import add
+from os import fstat
+from re import Pattern
+from re import compile as compile_pattern
+from re import escape
+from typing import (Any, BinaryIO, Callable, Dict, Iterator, List, Optional,
+                    Tuple, Type, TypeVar, Union, cast)
+
+from gherkin_processor.components.background import Background
+from gherkin_processor.components.feature import Feature
+from gherkin_processor.components.rule import Rule
+from gherkin_processor.components.scenario import Scenario
+from gherkin_processor.components.step import Step
+
+WINDOW_SIZE = 1 << 16
+BYTE_ORDER_MARKS: List[Tuple[bytes, str]] = [
+    (BOM_UTF32_LE, "utf-32-le"),
+    (BOM_UTF32_BE, "utf-32-be"),
+    (BOM_UTF8, "utf-8"),
+    (BOM_UTF16_LE, "utf-16-le"),
+    (BOM_UTF16_BE, "utf-16-be")
+]
+LINE_BREAKS: List[str] = ["\r\n", "\n", "\r", "\v", "\f", "\x1c", "\x1d", "\x1e", "\x85", "\u2028", "\u2029"]
+BUFFER_TYPES = (bytes, bytearray, memoryview, mmap)
+
+SourceData = Union[str, bytes, bytearray, memoryview, mmap]
+Component = TypeVar("Component")
+
+_LINE_BREAK_PATTERNS: Dict[str, Tuple["Pattern[bytes]", int]] = {}
+
+
+def detect_encoding(data: Union[bytes, memoryview]) -> Tuple[str, int]:
+    """Detect the encoding of a Gherkin source from its byte order mark.
+
+    Args:
+        data (bytes | memoryview): The encoded source, or at least its first four bytes.
+
+    Returns:
+        Tuple[str, int]: The encoding, which is UTF-8 without a byte order mark, and the length of the byte order mark.
+    """
+    for mark, encoding in BYTE_ORDER_MARKS:
+        if data[:len(mark)] == mark:
+            return encoding, len(mark)
+    return "utf-8", 0
+
+
+def decode_source(data: Union[bytes, bytearray, memoryview, mmap]) -> str:
+    """Decode a whole encoded Gherkin source, with the encoding of its byte order mark, or UTF-8 without it.
+
+    Args:
+        data (bytes | bytearray | memoryview | mmap): The encoded source.
+
+    Returns:
+        str: The decoded source, without the byte order mark.
+
+    Raises:
+        UnicodeDecodeError: If the source cannot be decoded.
+    """
+    with memoryview(data) as view, view.cast("B") as source:
+        encoding, skip = detect_encoding(source)
+        return str(source[skip:], encoding)
+
+
+def line_break_pattern(encoding: str) -> Tuple["Pattern[bytes]", int]:
+    """Return the pattern which finds the encoded line breaks of 'str.splitlines' in an encoded source.
+
+    Args:
+        encoding (str): The encoding of the source.
+
+    Returns:
+        Tuple[Pattern[bytes], int]: The pattern, which captures the line breaks, and the size of the code units of the
+            encoding, at which the line breaks start.
+    """
+    if encoding not in _LINE_BREAK_PATTERNS:
+        encoder = getincrementalencoder(encoding)()
+        encoder.encode("")
+        breaks = []
+        for line_break in LINE_BREAKS:
+            try:
+                breaks.append(escape(encoder.encode(line_break)))
+            except UnicodeEncodeError:
+                continue
+        _LINE_BREAK_PATTERNS[encoding] = compile_pattern(b"(" + b"|".join(breaks) + b")"), len(encoder.encode("\n"))
+    return _LINE_BREAK_PATTERNS[encoding]
+
+
+def map_file(file: BinaryIO) -> Union[bytes, mmap]:
+    """Map an open binary file into memory for reading.
+
+    Args:
+        file (BinaryIO): The open binary file.
+
+    Returns:
+        bytes | mmap: The read-only memory map of the file, or empty bytes if the file is empty, which cannot be mapped.
+    """
+    if fstat(file.fileno()).st_size == 0:
+        return b""
+    return mmap(file.fileno(), 0, access=ACCESS_READ)
+
+
+def read_lines(file: BinaryIO) -> Iterator[str]:
+    """Decode an open binary file incrementally, and yield its lines like the lines of a SourceBuffer of the file.
+
+    The encoding is detected from the byte order mark, UTF-8 is used without it, and the file is decoded strictly, so
+    only the current line is kept in memory.
+
+    Args:
+        file (BinaryIO): The open binary file, at its beginning.
+
+    Yields:
+        str: The next line of the file, without its line break.
+
+    Raises:
+        UnicodeDecodeError: If the file cannot be decoded.
+    """
+    encoding, skip = detect_encoding(file.read(4))
+    file.seek(skip)
+    for chunk in TextIOWrapper(file, encoding, newline=""):
+        yield from chunk.splitlines()
+
+
+class SourceBuffer:
+    """Represent an immutable Gherkin source with the offsets of its lines.
+
+    The source is a string, or an encoded bytes-like object, like bytes, a memoryview, or a memory-mapped file. The
+    encoding of bytes is detected from the byte order mark, and UTF-8 is used without it. The offsets of a string source
+    count characters, while the offsets of an encoded source count bytes.
+
+    The offsets of the lines of an encoded source are found by splitting its bytes at the encoded line breaks of
+    'str.splitlines'. The source is split into windows of whole lines, and only one window is decoded and split with
+    'str.splitlines' at a time, so the lines and their numbers match the ones of the regular engines without decoding
+    the whole source, or building a list of all lines.
+
+    Attributes:
+        data (str | memoryview): The source string, or the bytes of the encoded source.
+        encoding (str | None): The encoding of the source, or None for a string source.
+        line_count (int): The number of lines in the source.
+
+    Methods:
+        __init__(data: SourceData, encoding: Optional[str] = None) -> None:
+            Initialize the SourceBuffer object and find the offsets of its lines.
+        lines() -> Iterator[str]:
+            Yield the lines one by one, without their line breaks.
+        line_start(num: int) -> int:
+            Return the offset of the first character of a line.
+        position(offset: int) -> Tuple[int, int]:
+            Return the line and column number of an offset.
+        slice(start: int, end: int) -> str:
+            Return the text between two offsets.
+        measure(text: str) -> int:
+            Return the length of a text in the offsets of the source.
+        adjoins(left: int, right: int) -> bool:
+            Return whether two offsets are separated by a single newline character.
+        span(start: int, end: int) -> Span:
+            Return the span between two offsets.
+        __getstate__() -> Tuple[Any, ...]:
+            Return the state of the SourceBuffer object, with a copy of the encoded source, for pickling.
+        __setstate__(state: Tuple[Any, ...]) -> None:
+            Restore the SourceBuffer object from its pickled state, without finding the offsets of its lines again.
+    """
+
+    __slots__ = ("data", "encoding", "_starts", "_windows", "_newline")
+
+    def __init__(self, data: SourceData, encoding: Optional[str] = None) -> None:
+        """Initialize the SourceBuffer object and find the offsets of its lines.
+
+        Args:
+            data (SourceData): The source string, or the encoded source as bytes, bytearray, memoryview, or mmap.
+            encoding (Optional[str]): The encoding of an encoded source without a byte order mark, UTF-8 if not given.
+
+        Raises:
+            TypeError: If the 'data' argument is neither a string nor a bytes-like object.
+        """
+        self.data: Union[str, memoryview]
+        self.encoding: Optional[str] = None
+        skip = 0
+        if isinstance(data, str):
+            self.data = data
+        elif isinstance(data, BUFFER_TYPES):
+            self.data = memoryview(data).cast("B")
+            self.encoding, skip = detect_encoding(self.data)
+            if encoding is not None and skip == 0:
+                self.encoding = lookup(encoding).name
+        else:
+            raise TypeError("Variable 'text' is not string type")
+        self._newline = self.measure("\n")
+        self._starts = array("Q")
+        self._windows = [skip]
+        size = WINDOW_SIZE
+        while self._windows[-1] < len(self.data):
+            start = self._windows[-1]
+            end = min(start + size, len(self.data))
+            lengths = self._line_lengths(start, end)
+            if end < len(self.data):
+                if len(lengths) < 2:
+                    size *= 2
+                    continue
+                # The last line of the window may continue after it, so it is split again in the next window.
+                lengths.pop()
+            self._starts.extend(accumulate(lengths[:-1], initial=start))
+            self._windows.append(start + sum(lengths))
+
+    @property
+    def line_count(self) -> int:
+        """Return the number of lines in the source."""
+        return len(self._starts)
+
+    def lines(self) -> Iterator[str]:
+        """Yield the lines one by one, without their line breaks.
+
+        Yields:
+            str: The next line of the source.
+
+        Raises:
+            UnicodeDecodeError: If the encoded source cannot be decoded.
+        """
+        for start, end in zip(self._windows, self._windows[1:]):
+            yield from self.slice(start, end).splitlines()
+
+    def line_start(self, num: int) -> int:
+        """Return the offset of the first character of a line.
+
+        Args:
+            num (int): The number of the line, starting from one.
+
+        Returns:
+            int: The offset of the line in the source.
+        """
+        return self._starts[num - 1]
+
+    def position(self, offset: int) -> Tuple[int, int]:
+        """Return the line and column number of an offset.
+
+        Args:
+            offset (int): The offset in the source.
+
+        Returns:
+            Tuple[int, int]: The line and column number of the offset, both starting from one and counting characters.
+        """
+        num = max(bisect_right(self._starts, offset), 1)
+        return num, len(self.slice(self._starts[num - 1], offset)) + 1
+
+    def slice(self, start: int, end: int) -> str:
+        """Return the text between two offsets.
+
+        Args:
+            start (int): The offset of the first character.
+            end (int): The offset after the last character.
+
+        Returns:
+            str: The text between the offsets, decoded if the source is encoded.
+        """
+        if isinstance(self.data, str):
+            return self.data[start:end]
+        return str(self.data[start:end], self.encoding or "utf-8")
+
+    def measure(self, text: str) -> int:
+        """Return the length of a text in the offsets of the source.
+
+        Args:
+            text (str): The text, which is a part of the source.
+
+        Returns:
+            int: The number of characters for a string source, or the number of bytes for an encoded source.
+        """
+        return len(text) if self.encoding is None else len(text.encode(self.encoding))
+
+    def adjoins(self, left: int, right: int) -> bool:
+        """Return whether two offsets are separated by a single newline character.
+
+        Args:
+            left (int): The offset after the last character of the first text.
+            right (int): The offset of the first character of the second text.
+
+        Returns:
+            bool: True if there is only a newline character between the offsets, False otherwise.
+        """
+        return right - left == self._newline and self.slice(left, right) == "\n"
+
+    def span(self, start: int, end: int) -> "Span":
+        """Return the span between two offsets.
+
+        Args:
+            start (int): The offset of the first character.
+            end (int): The offset after the last character.
+
+        Returns:
+            Span: The span of the source between the offsets.
+        """
+        return Span(self, (start, end))
+
+    def __getstate__(self) -> Tuple[Any, ...]:
+        """Return the state of the SourceBuffer object, with a copy of the encoded source, for pickling."""
+        data = self.data if isinstance(self.data, str) else self.data.tobytes()
+        return data, self.encoding, self._starts, self._windows, self._newline
+
+    def __setstate__(self, state: Tuple[Any, ...]) -> None:
+        """Restore the SourceBuffer object from its pickled state, without finding the offsets of its lines again."""
+        data, self.encoding, self._starts, self._windows, self._newline = state
+        self.data = data if isinstance(data, str) else memoryview(data)
+
+    def _line_lengths(self, start: int, end: int) -> List[int]:
+        if isinstance(self.data, str):
+            return list(map(len, self.data[start:end].splitlines(True)))
+        pattern, unit = line_break_pattern(self.encoding or "utf-8")
+        if unit == 1:
+            pieces = pattern.split(self.data[start:end])
+            lengths = list(map(add, map(len, pieces[0::2]), map(len, pieces[1::2])))
+            return lengths + [len(pieces[-1])] if pieces[-1] else lengths
+        ends = [start]
+        match = pattern.search(self.data, start, end)
+        while match is not None:
+            # A line break between the code units of the encoding is a part of other characters, so the search goes on
+            # from its next byte.
+            if (match.start() - start) % unit:
+                match = pattern.search(self.data, match.start() + 1, end)
+                continue
+            ends.append(match.end())
+            match = pattern.search(self.data, match.end(), end)
+        if ends[-1] < end:
+            ends.append(end)
+        return [line_end - line_start for line_start, line_end in zip(ends, ends[1:])]
+
+
+class Span:
+    """Represent a text which is built from the pieces of a source text.
+
+    The pieces are joined with line breaks, so a multi-line value, like a description without its blank lines, is one
+    span. Consecutive lines separated by a single newline character are stored as one piece.
+
+    Attributes:
+        source (SourceBuffer): The source text of the span.
+        offsets (Tuple[int, ...]): The start and end offsets of the pieces, in pairs.
+        start (int): The offset of the first character.
+        end (int): The offset after the last character.
+        line (int): The line number of the first character, starting from one.
+        column (int): The column number of the first character, starting from one.
+
+    Methods:
+        __init__(source: SourceBuffer, offsets: Tuple[int, ...]) -> None:
+            Initialize the Span object.
+        __str__() -> str:
+            Return the text of the span.
+        text() -> str:
+            Build the text of the span from the source text.
+    """
+
+    __slots__ = ("source", "offsets")
+
+    def __init__(self, source: SourceBuffer, offsets: Tuple[int, ...]) -> None:
+        """Initialize the Span object.
+
+        Args:
+            source (SourceBuffer): The source text of the span.
+            offsets (Tuple[int, ...]): The start and end offsets of the pieces, in pairs.
+        """
+        self.source = source
+        self.offsets = offsets
+
+    @property
+    def start(self) -> int:
+        """Return the offset of the first character."""
+        return self.offsets[0]
+
+    @property
+    def end(self) -> int:
+        """Return the offset after the last character."""
+        return self.offsets[-1]
+
+    @property
+    def line(self) -> int:
+        """Return the line number of the first character, starting from one."""
+        return self.source.position(self.start)[0]
+
+    @property
+    def column(self) -> int:
+        """Return the column number of the first character, starting from one."""
+        return self.source.position(self.start)[1]
+
+    def text(self) -> str:
+        """Build the text of the span from the source text.
+
+        Returns:
+            str: The pieces of the span joined with line breaks.
+        """
+        source, offsets = self.source, self.offsets
+        if len(offsets) == 2:
+            return source.slice(offsets[0], offsets[1])
+        return "\n".join([source.slice(offsets[i], offsets[i + 1]) for i in range(0, len(offsets), 2)])
+
+    def __str__(self) -> str:
+        """Return the text of the span."""
+        return self.text()
+
+    def __repr__(self) -> str:
+        """Return the representation of the Span object with its position and text."""
+        return f"Span(line={self.line}, column={self.column}, text={self.text()!r})"
+
+
+class SourceText:
+    """Build a text attribute of a source component from its span whenever the attribute is read.
+
+    The descriptor wraps the slot of the regular component, which holds either a string or a span.
+    """
+
+    __slots__ = ("component", "name", "slot")
+
+    def __init__(self, component: type, name: str) -> None:
+        """Initialize the SourceText descriptor for an attribute of a source component.
+
+        Args:
+            component (type): The source component class, which is a subclass of the regular component.
+            name (str): The name of the attribute.
+        """
+        self.component = component
+        self.name = name
+        self.slot = getattr(component.__mro__[1], name)
+
+    def __get__(self, instance: Any, owner: Any = None) -> Any:
+        """Return the text of the attribute, built from its span if it is stored as a span."""
+        if instance is None:
+            return self
+        value = self.slot.__get__(instance, owner)
+        return value.text() if isinstance(value, Span) else value
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        """Store the text or the span of the attribute."""
+        self.slot.__set__(instance, value)
+
+    def span(self, instance: Any) -> Optional[Span]:
+        """Return the span of the attribute, or None if it is not stored as a span.
+
+        Args:
+            instance (Any): The source component.
+
+        Returns:
+            Span | None: The span of the attribute.
+        """
+        value = getattr(super(self.component, instance), self.name)
+        return value if isinstance(value, Span) else None
+
+
+def source_state(component: Any) -> Tuple[None, Dict[str, Any]]:
+    """Return the pickled state of a source component, with the spans of its text attributes instead of their strings.
+
+    Args:
+        component (Any): The component built by the "span" parser engine.
+
+    Returns:
+        Tuple[None, Dict[str, Any]]: The state of the component, in the form of the default state of slotted objects.
+    """
+    _, slots = cast(Tuple[None, Dict[str, Any]], object.__getstate__(component))
+    for name, descriptor in vars(type(component)).items():
+        if isinstance(descriptor, SourceText):
+            slots[name] = getattr(super(descriptor.component, component), name)
+    return None, slots
+
+
+def source_texts(*names: str) -> Callable[[Type[Component]], Type[Component]]:
+    """Return a class decorator which makes the given attributes of a component subclass read from their spans.
+
+    Args:
+        *names (str): The names of the text attributes.
+
+    Returns:
+        Callable[[Type[Component]], Type[Component]]: The class decorator.
+    """
+    def decorate(component: Type[Component]) -> Type[Component]:
+        for name in names:
+            setattr(component, name, SourceText(component, name))
+        setattr(component, "__getstate__", source_state)
+        return component
+    return decorate
+
+
+def span_of(component: Any, name: Optional[str] = None) -> Optional[Span]:
+    """Return the source span of a source component, or of one of its text attributes.
+
+    Args:
+        component (Any): The component built by the "span" parser engine.
+        name (Optional[str]): The name of the text attribute, or None for the whole component.
+
+    Returns:
+        Span | None: The span in the source text, or None if the component or the attribute has no span.
+    """
+    if name is None:
+        return getattr(component, "span", None)
+    descriptor = getattr(type(component), name, None)
+    return descriptor.span(component) if isinstance(descriptor, SourceText) else None
+
+
+@source_texts("name", "description")
+class SourceFeature(Feature):
+    """Represent a Gherkin feature with its texts in the source text."""
+
+    __slots__ = ("span",)
+
+    def __init__(self) -> None:
+        """Initialize the SourceFeature object with default values and without a span."""
+        super().__init__()
+        self.span: Optional[Span] = None
+
+
+@source_texts("name", "description")
+class SourceRule(Rule):
+    """Represent a Gherkin rule with its texts in the source text."""
+
+    __slots__ = ("span",)
+
+    def __init__(self) -> None:
+        """Initialize the SourceRule object with default values and without a span."""
+        super().__init__()
+        self.span: Optional[Span] = None
+
+
+@source_texts("description")
+class SourceBackground(Background):
+    """Represent a Gherkin background with its texts in the source text."""
+
+    __slots__ = ("span",)
+
+    def __init__(self) -> None:
+        """Initialize the SourceBackground object with default values and without a span."""
+        super().__init__()
+        self.span: Optional[Span] = None
+
+
+@source_texts("name", "description")
+class SourceScenario(Scenario):
+    """Represent a Gherkin scenario with its texts in the source text."""
+
+    __slots__ = ("span",)
+
+    def __init__(self) -> None:
+        """Initialize the SourceScenario object with default values and without a span."""
+        super().__init__()
+        self.span: Optional[Span] = None
+
+
+@source_texts("text", "doc_string")
+class SourceStep(Step):
+    """Represent a Gherkin step with its texts in the source text."""
+
+    __slots__ = ("span",)
+
+    def __init__(self) -> None:
+        """Initialize the SourceStep object with default values and without a span."""
+        super().__init__()
+        self.span: Optional[Span] = None
@@ -3,21 +3,27 @@
 The Step class provides functionality to process, validate, and convert step components into string or dictionary representations.
 """
 
+from copy import deepcopy
 from dataclasses import dataclass
-from re import findall
-from typing import Any, Dict, List, Tuple
+from sys import intern
+from typing import Any, Dict, Iterator, List, Mapping, Sequence, TextIO, Tuple
 
-from gherkin_processor.private.formatters import format_table
+from gherkin_processor.components.table import Table, table_memo
+from gherkin_processor.private.formatters import iter_table_chunks
+from gherkin_processor.private.lines import (AND, BACKQUOTE_FENCE, BUT, GIVEN,
+                                             QUOTE_FENCE, TABLE, classify_line,
+                                             split_lines)
+from gherkin_processor.private.tables import split_table_row
 
 
-@dataclass
+@dataclass(slots=True)
 class Step:
     """Represent a single step in a Gherkin scenario.
 
     Attributes:
-        type (str): The type of the step (e.g., Given, When, Then, But).
+        type (str): The interned type of the step (e.g., Given, When, Then, But).
         text (str): The text of the step.
-        table (Dict[str, List[str]] | None): The table associated with the step, if any.
+        table (Table | None): The table associated with the step, if any.
         doc_string (str | None): The doc-string associated with the step, if any.
 
     Methods:
@@ -27,15 +33,23 @@ class Step:
             Return the string representation of the Step object.
         to_string() -> str:
             Convert the Step object to a string representation.
+        iter_chunks() -> Iterator[str]:
+            Yield the string representation of the Step object in chunks.
+        write_to(file: TextIO) -> None:
+            Write the string representation of the Step object to a file.
         to_dictionary() -> Dict[str, Any]:
             Convert the Step object to a dictionary representation.
-        process(text: str, validate: bool) -> bool:
+        copy() -> Step:
+            Return a deep copy of the Step object, which keeps the table as a Table object.
+        from_dictionary(step: Mapping[str, Any]) -> Step:
+            Create a Step object from the dictionary representation.
+        process(text: str, validate: bool, offset: int, kinds: Sequence[int] | None) -> bool:
             Process the step text and validate its syntax.
     """
 
     type: str
     text: str
-    table: Dict[str, List[str]] | None
+    table: Table | None
     doc_string: str | None
 
     def __init__(self) -> None:
@@ -59,13 +73,28 @@ class Step:
         Returns:
             str: The string representation of the Step object.
         """
-        lines: List[str] = []
-        lines.append(f"{self.type} {self.text}")
+        return "".join(self.iter_chunks())
+
+    def iter_chunks(self) -> Iterator[str]:
+        """Yield the string representation of the Step object in chunks, without building the whole string.
+
+        Yields:
+            str: The next chunk of the string representation.
+        """
+        yield f"{self.type} {self.text}"
         if self.table is not None:
-            lines.append(format_table(self.table))
+            yield "\n"
+            yield from iter_table_chunks(self.table)
         if self.doc_string is not None:
-            lines.extend(['"""', self.doc_string, '"""'])
-        return "\n".join(lines)
+            yield f'\n"""\n{self.doc_string}\n"""'
+
+    def write_to(self, file: TextIO) -> None:
+        """Write the string representation of the Step object to a file chunk by chunk.
+
+        Args:
+            file (TextIO): The text file or stream to write to.
+        """
+        file.writelines(self.iter_chunks())
 
     def to_dictionary(self) -> Dict[str, Any]:
         """Convert the Step object to a dictionary representation.
@@ -76,16 +105,48 @@ class Step:
         return {
             "type": self.type,
             "text": self.text,
-            "table": self.table,
+            "table": None if self.table is None else self.table.to_dictionary(),
             "doc-string": self.doc_string,
         }
 
-    def process(self, text: str, validate: bool) -> bool:
+    def copy(self) -> "Step":
+        """Return a deep copy of the Step object, which keeps the table as a Table object.
+
+        Returns:
+            Step: The copy, which shares no mutable value with this step.
+        """
+        return deepcopy(self, table_memo([self.table]))
+
+    @classmethod
+    def from_dictionary(cls, step: Mapping[str, Any]) -> "Step":
+        """Create a Step object from the dictionary representation.
+
+        The dictionary representation is the one of the JSON output, of 'dataclasses.asdict', or of 'to_dictionary'.
+
+        Args:
+            step (Mapping[str, Any]): The dictionary representation of the step.
+
+        Returns:
+            Step: The Step object with the same values.
+
+        Raises:
+            KeyError: If a value is missing from the dictionary representation.
+        """
+        result = cls()
+        result.type = intern(step["type"])
+        result.text = step["text"]
+        result.table = None if step["table"] is None else Table.from_dictionary(step["table"])
+        result.doc_string = step["doc_string"] if "doc_string" in step else step["doc-string"]
+        return result
+
+    def process(self, text: str, validate: bool, offset: int = 0, kinds: Sequence[int] | None = None) -> bool:
         """Process the step text and validate its syntax.
 
         Args:
             text (str): The step text to be processed.
             validate (bool): Whether to validate the syntax during processing.
+            offset (int): The number of source lines before the text, used for the line numbers of the errors.
+            kinds (Sequence[int] | None): The kind codes of the text lines, classified from the text if not given.
 
         Returns:
             bool: True if the syntax is valid, False otherwise.
@@ -98,78 +159,77 @@ class Step:
             raise TypeError("Variable 'text' is not string type")
 
         valid_syntax: bool = True
-        lines: List[str] = text.splitlines()
+        lines, kinds = split_lines(text, kinds)
         doc_string: str = ""
         headers: List[str] = []
+        doc_string_lines: List[str] = [] if self.doc_string is None else [self.doc_string]
 
-        for num, line in enumerate(lines, 1):
-            doc_string = self._handle_docstring(doc_string, line)
-            stripped_line = line.strip()
+        for num, (line, kind) in enumerate(zip(lines, kinds), offset + 1):
+            doc_string = self._handle_docstring(doc_string, kind)
 
             if doc_string != "":
-                if not stripped_line.startswith(("```", '"""')):
-                    self.doc_string = line if self.doc_string is None else self.doc_string + "\n" + line
+                if kind not in (BACKQUOTE_FENCE, QUOTE_FENCE):
+                    doc_string_lines.append(line)
                 continue
 
-            valid_syntax &= self._handle_step((num, line), validate)
+            valid_syntax &= self._handle_step((num, line, kind), validate)
 
             if self.table is None:
-                headers, is_valid = self._handle_table_header(headers, (num, line), validate)
+                headers, is_valid = self._handle_table_header(headers, (num, line, kind), validate)
                 valid_syntax &= is_valid
             else:
-                valid_syntax &= self._handle_table(headers, (num, line), validate)
+                valid_syntax &= self._handle_table(headers, (num, line, kind), validate)
 
+        if doc_string_lines:
+            self.doc_string = "\n".join(doc_string_lines)
+        if self.table is not None:
+            self.table.compact()
         return valid_syntax
 
-    def _handle_docstring(self, doc_string: str, text: str) -> str:
-        stripped_line = text.strip()
-        if stripped_line.startswith("```") and doc_string == "backquote":
+    def _handle_docstring(self, doc_string: str, kind: int) -> str:
+        if kind == BACKQUOTE_FENCE and doc_string == "backquote":
             return ""
-        if stripped_line.startswith("```") and doc_string == "":
+        if kind == BACKQUOTE_FENCE and doc_string == "":
             return "backquote"
-        if stripped_line.startswith('"""') and doc_string == "quote":
+        if kind == QUOTE_FENCE and doc_string == "quote":
             return ""
-        if stripped_line.startswith('"""') and doc_string == "":
+        if kind == QUOTE_FENCE and doc_string == "":
             return "quote"
         return doc_string
 
-    def _handle_step(self, line: Tuple[int, str], validate: bool) -> bool:
-        num, text = line
-        stripped_line = text.strip()
-        if stripped_line.startswith(("Given ", "When ", "Then ", "But ")):
-            self.type, self.text = stripped_line.split(" ", maxsplit=1)
+    def _handle_step(self, line: Tuple[int, str, int], validate: bool) -> bool:
+        num, text, kind = line
+        if kind == AND:
+            # Conjunction steps are processed only after the keyword of the previous step replaced the conjunction.
+            kind = classify_line(text.strip())
+        if GIVEN <= kind <= BUT:
+            step_type, self.text = text.strip().split(" ", maxsplit=1)
+            self.type = intern(step_type)
             if validate and not self.text:
-                raise ValueError(f"Step keyword must contain text after keyword at line [{num}]: {line}")
+                raise ValueError(f"Step keyword must contain text after keyword at line [{num}]: {(num, text)}")
             return bool(self.text)
         return True
 
-    def _handle_table_header(self, headers: List[str], line: Tuple[int, str], validate: bool) -> Tuple[List[str], bool]:
-        num, text = line
-        stripped_line = text.strip()
-        if stripped_line.startswith("|"):
-            headers = [header.strip() for header in findall(r"(.+?)[^\\](?:\\\\)*\|", text)]
-            headers = headers[1:]
+    def _handle_table_header(self, headers: List[str], line: Tuple[int, str, int], validate: bool) -> Tuple[List[str], bool]:
+        num, text, kind = line
+        if kind == TABLE:
+            headers = split_table_row(text)
             if validate and len(headers) <= 0:
                 raise ValueError(f"Table header must contain at least one value at line [{num}]: {text}")
-            self.table = {}
-            for header in headers:
-                self.table.update({header: []})
+            self.table = Table(headers)
             return headers, bool(headers)
         return headers, True
 
-    def _handle_table(self, headers: List[str], line: Tuple[int, str], validate: bool) -> bool:
-        num, text = line
-        stripped_line = text.strip()
-        if stripped_line.startswith("|"):
-            values = [value.strip() for value in findall(r"(.+?)[^\\](?:\\\\)*\|", text)]
-            values = values[1:]
+    def _handle_table(self, headers: List[str], line: Tuple[int, str, int], validate: bool) -> bool:
+        num, text, kind = line
+        if kind == TABLE:
+            values = split_table_row(text)
 
             if validate and len(values) < len(headers):
-                raise ValueError(f"Table item line has less values than the table header at line [{num}]: {line}")
+                raise ValueError(f"Table item line has less values than the table header at line [{num}]: {(num, text)}")
             if validate and len(values) > len(headers):
-                raise ValueError(f"Table item line has more values than the table header at line [{num}]: {line}")
-            for i in range(min(len(headers), len(values))):
-                if self.table is not None:
-                    self.table[headers[i]].append(values[i])
+                raise ValueError(f"Table item line has more values than the table header at line [{num}]: {(num, text)}")
+            if self.table is not None:
+                self.table.append_row(values)
             return len(values) == len(headers)
         return True
@@ -0,0 +1,262 @@
+"""Define the Table class, which represents a Gherkin data table or examples table.
+
+The Table class stores every cell of the table in one shared string buffer with offset arrays, and provides column and
+row access, and conversion into the dictionary representation. The 'table_memo' function lets the components copy
+their tables as Table objects.
+"""
+
+from array import array
+from collections.abc import Mapping
+from itertools import accumulate, chain, islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class Table(Mapping[str, List[str]]):
+    """Represent a Gherkin table as a read-only mapping from the headers to the column values.
+
+    The cells are appended to a single string buffer, and every column keeps the start and end offsets of its cells in
+    an unsigned integer array, so a cell costs eight bytes instead of a separate string object. Repeated headers share
+    one column, the same way as in the dictionary representation.
+
+    Attributes:
+        headers (List[str]): The distinct headers of the table, in the order of the header line.
+        header_line (List[str]): The headers of the header line, with the repeated ones.
+        row_count (int): The number of values in the longest column.
+
+    Methods:
+        __init__(headers: Iterable[str] = ()) -> None:
+            Initialize the Table object with the headers and without values.
+        from_dictionary(table: Mapping[str, List[str]]) -> Table:
+            Create a Table object from the dictionary representation.
+        from_offsets(buffer: str, columns: Mapping[str, Iterable[int]], header_line: Optional[Iterable[str]] = None) -> Table:
+            Create a Table object from a shared buffer and the offsets of the cells.
+        to_offsets() -> Tuple[str, Dict[str, array[int]]]:
+            Return the shared buffer and the offsets of the cells.
+        append_row(values: Iterable[str]) -> None:
+            Append the values of a table line to the columns of the headers.
+        compact() -> str:
+            Move the appended values into the shared buffer.
+        column(header: str) -> List[str]:
+            Return the values of a column.
+        row(index: int) -> Dict[str, str]:
+            Return the values of a row by their headers.
+        rows() -> Iterator[Dict[str, str]]:
+            Return an iterator over the rows.
+        to_dictionary() -> Dict[str, List[str]]:
+            Convert the Table object to a dictionary representation.
+        copy() -> Table:
+            Return a copy of the Table object, which shares the buffer but not the offsets.
+        __deepcopy__(memo: Dict[int, Any]) -> Dict[str, List[str]]:
+            Return the dictionary representation, which keeps the output of 'dataclasses.asdict' serializable.
+    """
+
+    __slots__ = ("_columns", "_positions", "_buffer", "_pending", "_length")
+
+    def __init__(self, headers: Iterable[str] = ()) -> None:
+        """Initialize the Table object with the headers and without values.
+
+        Args:
+            headers (Iterable[str]): The headers of the table, in the order of the header line.
+        """
+        self._columns: Dict[str, "array[int]"] = {}
+        self._positions: List["array[int]"] = []
+        self._buffer: str = ""
+        self._pending: List[str] = []
+        self._length: int = 0
+        for header in headers:
+            self._positions.append(self._columns.setdefault(header, array("I")))
+
+    @classmethod
+    def from_dictionary(cls, table: Mapping[str, List[str]]) -> "Table":
+        """Create a Table object from the dictionary representation.
+
+        Args:
+            table (Mapping[str, List[str]]): The column values by their headers.
+
+        Returns:
+            Table: The Table object with the same headers and values.
+        """
+        result = cls(table.keys())
+        for header, values in table.items():
+            bounds = list(accumulate(map(len, values), initial=result._length))
+            result._columns[header].extend(chain.from_iterable(zip(bounds, islice(bounds, 1, None))))
+            result._pending.extend(values)
+            result._length = bounds[-1]
+        return result
+
+    @classmethod
+    def from_offsets(cls, buffer: str, columns: Mapping[str, Iterable[int]], header_line: Optional[Iterable[str]] = None) -> "Table":
+        """Create a Table object from a shared buffer and the offsets of the cells.
+
+        Args:
+            buffer (str): The shared buffer of the cells.
+            columns (Mapping[str, Iterable[int]]): The start and end offsets of the cells in the buffer by the headers
+                of the columns, in the order of the header line.
+            header_line (Optional[Iterable[str]]): The headers of the header line, with the repeated ones, which pair
+                the values of the appended rows with the columns. The headers of the columns if not given.
+
+        Returns:
+            Table: The Table object with the headers and the cells.
+
+        Raises:
+            KeyError: If a column has no header in the header line.
+        """
+        result = cls(columns.keys() if header_line is None else header_line)
+        for header, offsets in columns.items():
+            result._columns[header].extend(offsets)
+        result._buffer = buffer
+        result._length = len(buffer)
+        return result
+
+    def to_offsets(self) -> Tuple[str, Dict[str, "array[int]"]]:
+        """Return the shared buffer and the offsets of the cells.
+
+        Returns:
+            Tuple[str, Dict[str, array[int]]]: The shared buffer, and the start and end offsets of the cells in the
+                buffer by the headers of the columns.
+        """
+        return self.compact(), self._columns
+
+    @property
+    def headers(self) -> List[str]:
+        """Return the distinct headers of the table, in the order of the header line."""
+        return list(self._columns)
+
+    @property
+    def header_line(self) -> List[str]:
+        """Return the headers of the header line, with the repeated ones."""
+        headers = {id(offsets): header for header, offsets in self._columns.items()}
+        return [headers[id(offsets)] for offsets in self._positions]
+
+    @property
+    def row_count(self) -> int:
+        """Return the number of values in the longest column."""
+        return max((len(offsets) // 2 for offsets in self._columns.values()), default=0)
+
+    def append_row(self, values: Iterable[str]) -> None:
+        """Append the values of a table line to the columns of the headers.
+
+        The values are paired with the headers by their position, and the values without a header are dropped.
+
+        Args:
+            values (Iterable[str]): The values of the table line.
+        """
+        for offsets, value in zip(self._positions, values):
+            self._append(offsets, value)
+
+    def compact(self) -> str:
+        """Move the appended values into the shared buffer.
+
+        The values are held as separate strings until the table is compacted, which happens on the first read as well.
+
+        Returns:
+            str: The shared buffer of the table.
+        """
+        if self._pending:
+            self._buffer += "".join(self._pending)
+            self._pending.clear()
+        return self._buffer
+
+    def column(self, header: str) -> List[str]:
+        """Return the values of a column.
+
+        Args:
+            header (str): The header of the column.
+
+        Returns:
+            List[str]: The values of the column, in the order of the table lines.
+
+        Raises:
+            KeyError: If the table has no column with the header.
+        """
+        offsets = self._columns[header]
+        buffer = self._buffer if not self._pending else self.compact()
+        return [buffer[offsets[i]:offsets[i + 1]] for i in range(0, len(offsets), 2)]
+
+    def row(self, index: int) -> Dict[str, str]:
+        """Return the values of a row by their headers.
+
+        Args:
+            index (int): The index of the row, starting from zero after the header line.
+
+        Returns:
+            Dict[str, str]: The values of the row by their headers, without the columns which are shorter than the row.
+        """
+        buffer = self._buffer if not self._pending else self.compact()
+        return {
+            header: buffer[offsets[2 * index]:offsets[2 * index + 1]]
+            for header, offsets in self._columns.items() if 2 * index < len(offsets)
+        }
+
+    def rows(self) -> Iterator[Dict[str, str]]:
+        """Return an iterator over the rows.
+
+        Returns:
+            Iterator[Dict[str, str]]: The rows of the table, in the order of the table lines.
+        """
+        return map(self.row, range(self.row_count))
+
+    def to_dictionary(self) -> Dict[str, List[str]]:
+        """Convert the Table object to a dictionary representation.
+
+        Returns:
+            Dict[str, List[str]]: The column values by their headers.
+        """
+        return {header: self.column(header) for header in self._columns}
+
+    def __getitem__(self, header: str) -> List[str]:
+        """Return the values of a column."""
+        return self.column(header)
+
+    def __iter__(self) -> Iterator[str]:
+        """Return an iterator over the headers."""
+        return iter(self._columns)
+
+    def __len__(self) -> int:
+        """Return the number of distinct headers."""
+        return len(self._columns)
+
+    def __repr__(self) -> str:
+        """Return the representation of the Table object with its dictionary representation."""
+        return f"Table({self.to_dictionary()!r})"
+
+    def copy(self) -> "Table":
+        """Return a copy of the Table object, which shares the buffer but not the offsets.
+
+        Returns:
+            Table: The copy, with the same headers and values, which can be appended to without changing this table.
+        """
+        copies = {id(offsets): array(offsets.typecode, offsets) for offsets in self._columns.values()}
+        columns = {header: copies[id(offsets)] for header, offsets in self._columns.items()}
+        return self._from_columns(self.compact(), columns, [copies[id(offsets)] for offsets in self._positions])
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Dict[str, List[str]]:
+        """Return the dictionary representation, which keeps the output of 'dataclasses.asdict' serializable."""
+        return self.to_dictionary()
+
+    @classmethod
+    def _from_columns(cls, buffer: str, columns: Dict[str, "array[int]"], positions: List["array[int]"]) -> "Table":
+        result = cls()
+        result._columns = columns
+        result._positions = positions
+        result._buffer = buffer
+        result._length = len(buffer)
+        return result
+
+    def _append(self, offsets: "array[int]", value: str) -> None:
+        offsets.append(self._length)
+        self._length += len(value)
+        offsets.append(self._length)
+        self._pending.append(value)
+
+
+def table_memo(tables: Iterable[Optional[Table]]) -> Dict[int, Any]:
+    """Build the memo of 'copy.deepcopy' for a component, so its tables are copied as Table objects.
+
+    Args:
+        tables (Iterable[Optional[Table]]): The tables of the component, where None is skipped.
+
+    Returns:
+        Dict[int, Any]: The copies of the tables by the identities of the tables.
+    """
+    return {id(table): table.copy() for table in tables if table is not None}
@@ -0,0 +1,243 @@
+"""Provide the parse daemon of the command-line interface, and the client which forwards commands to it.
+
+The daemon listens on a Unix domain socket, and runs the commands of the clients in its own process, so the modules are
+imported, and the processed files are cached only once for many commands. A client sends one JSON line with its
+command-line arguments and its working directory, and the daemon streams back one JSON line for the result of every
+input file, as soon as the file is processed. The outputs are saved by the daemon, while the standard output is written,
+and the confirmations are requested by the client.
+"""
+
+import json
+import socket
+from argparse import Namespace
+from contextlib import suppress
+from os import environ, getuid, lstat, mkdir, remove, umask
+from os.path import join
+from socketserver import StreamRequestHandler, ThreadingUnixStreamServer
+from stat import S_IMODE, S_ISDIR
+from tempfile import gettempdir
+from typing import Any, Dict, Iterator, Optional
+
+from gherkin_processor.cache import ParseCache
+from gherkin_processor.private.commands import (FileResult, expand_inputs,
+                                                iter_results)
+
+
+def socket_directory() -> str:
+    """Return the private directory of the daemon sockets of the user, and create it if it does not exist.
+
+    The directory is in the runtime directory of the user, or in the temporary directory, which is shared by all users,
+    so an existing directory is only used if it belongs to the user, and cannot be accessed by the other users.
+
+    Returns:
+        str: The path of the directory.
+
+    Raises:
+        OSError: If the directory cannot be created, or it is not a private directory of the user.
+    """
+    path = join(environ.get("XDG_RUNTIME_DIR") or gettempdir(), f"gherkin-processor-{getuid()}")
+    with suppress(FileExistsError):
+        mkdir(path, 0o700)
+    status = lstat(path)
+    if not S_ISDIR(status.st_mode) or status.st_uid != getuid() or S_IMODE(status.st_mode) & 0o077:
+        raise OSError(f"Socket directory '{path}' is not a private directory of the user")
+    return path
+
+
+def default_socket_path() -> str:
+    """Return the default path of the socket of the daemon.
+
+    Returns:
+        str: The path of the socket in the private socket directory of the user.
+
+    Raises:
+        OSError: If the socket directory cannot be created, or it is not a private directory of the user.
+    """
+    return join(socket_directory(), "daemon.sock")
+
+
+def check_owner(socket_path: str) -> None:
+    """Check that an existing socket belongs to the user, before connecting to it or replacing it.
+
+    Args:
+        socket_path (str): The path of the socket.
+
+    Raises:
+        OSError: If the socket belongs to another user.
+    """
+    with suppress(FileNotFoundError):
+        if lstat(socket_path).st_uid != getuid():
+            raise OSError(f"Socket '{socket_path}' belongs to another user")
+
+
+class CommandHandler(StreamRequestHandler):
+    """Handle the command of one client connection of the daemon.
+
+    Methods:
+        handle() -> None:
+            Run the command of the client, and stream the results of the input files back.
+        send(message: Dict[str, Any]) -> None:
+            Send one message to the client as a JSON line.
+    """
+
+    server: "DaemonServer"
+
+    def handle(self) -> None:
+        """Run the command of the client, and stream the results of the input files back.
+
+        The results are followed by a final message, so the client can tell a completed command from a lost connection.
+        A command which cannot be read is answered with a single error message. The command is dropped if the client
+        disconnects. The files are processed in the thread of the connection, whatever the number of jobs of the client
+        is, so the clients cannot start worker processes in the daemon.
+        """
+        with suppress(OSError):
+            try:
+                args = Namespace(**json.loads(self.rfile.readline())["options"])
+                args.cache_dir = args.cache_dir or self.server.cache_dir
+                args.jobs = 1
+                for result in iter_results(args, expand_inputs(args.input, args.cwd), self.server.cache):
+                    self.send(result.to_dictionary())
+                self.send({"done": True})
+            except (AttributeError, KeyError, TypeError, ValueError) as e:
+                self.send({"error": str(e)})
+
+    def send(self, message: Dict[str, Any]) -> None:
+        """Send one message to the client as a JSON line.
+
+        Args:
+            message (Dict[str, Any]): The message to send.
+        """
+        self.wfile.write(json.dumps(message).encode() + b"\n")
+
+
+class DaemonServer(ThreadingUnixStreamServer):
+    """Represent the server of the daemon, which shares a cache of the processed files among its connections.
+
+    Every connection is handled in its own thread, so a long command does not block the other clients.
+
+    Attributes:
+        cache (ParseCache): The in-process cache of the processed Gherkin objects.
+        cache_dir (str | None): The directory of the persistent cache for the commands without one, or None.
+
+    Methods:
+        __init__(socket_path: str, cache_dir: Optional[str] = None) -> None:
+            Initialize the DaemonServer object, and bind it to the socket.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, cache_dir: Optional[str] = None) -> None:
+        """Initialize the DaemonServer object, and bind it to the socket.
+
+        The socket is only accessible by the user, and a socket of the user which is left behind by a stopped daemon is
+        replaced.
+
+        Args:
+            socket_path (str): The path of the socket.
+            cache_dir (Optional[str]): The directory of the persistent cache for the commands without one, or None.
+
+        Raises:
+            OSError: If the socket belongs to another user, another daemon is listening on it, or it cannot be bound.
+        """
+        self.cache = ParseCache()
+        self.cache_dir = cache_dir
+        check_owner(socket_path)
+        remove_stale_socket(socket_path)
+        mask = umask(0o177)
+        try:
+            super().__init__(socket_path, CommandHandler)
+        finally:
+            umask(mask)
+
+
+def remove_stale_socket(socket_path: str) -> None:
+    """Remove the socket of a stopped daemon.
+
+    Args:
+        socket_path (str): The path of the socket.
+
+    Raises:
+        OSError: If another daemon is listening on the socket.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(socket_path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            with suppress(FileNotFoundError):
+                remove(socket_path)
+            return
+    raise OSError(f"Daemon is already listening on '{socket_path}'")
+
+
+def serve(socket_path: Optional[str] = None, cache_dir: Optional[str] = None) -> None:
+    """Run the daemon until it is interrupted, and remove its socket afterwards.
+
+    Args:
+        socket_path (Optional[str]): The path of the socket, or None for the default path.
+        cache_dir (Optional[str]): The directory of the persistent cache for the commands without one, or None.
+
+    Raises:
+        OSError: If the socket belongs to another user, another daemon is listening on it, or it cannot be bound.
+    """
+    path = socket_path or default_socket_path()
+    with DaemonServer(path, cache_dir) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            with suppress(FileNotFoundError):
+                remove(path)
+
+
+def connect(socket_path: str, args: Namespace) -> Iterator[FileResult]:
+    """Forward a command to the daemon.
+
+    The connection is opened, and the command is sent at once, so an unreachable daemon is reported by this call,
+    while the results are read by the returned iterator.
+
+    Args:
+        socket_path (str): The path of the socket of the daemon.
+        args (Namespace): The command-line arguments, with the working directory of the client in the 'cwd' argument.
+
+    Returns:
+        Iterator[FileResult]: The results of the input files, which are yielded as soon as the daemon sends them.
+
+    Raises:
+        OSError: If the socket belongs to another user, or the daemon cannot be reached.
+    """
+    check_owner(socket_path)
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(socket_path)
+        client.sendall(json.dumps({"options": vars(args)}).encode() + b"\n")
+    except OSError:
+        client.close()
+        raise
+    return read_results(client)
+
+
+def read_results(client: socket.socket) -> Iterator[FileResult]:
+    """Read the results of a command from the connection of the daemon, and close the connection afterwards.
+
+    Args:
+        client (socket.socket): The connection of the daemon.
+
+    Yields:
+        FileResult: The result of the next input file.
+
+    Raises:
+        ValueError: If the daemon rejects the command, or the connection fails before the command is completed.
+    """
+    with client, client.makefile("rb") as stream:
+        try:
+            for line in stream:
+                message = json.loads(line)
+                if "done" in message:
+                    return
+                if "path" not in message:
+                    raise ValueError(f"Daemon rejected the command: {message['error']}")
+                yield FileResult.from_dictionary(message)
+        except OSError as e:
+            raise ValueError(f"Connection to the daemon failed: {e}") from e
+    raise ValueError("Daemon closed the connection before completing the command")
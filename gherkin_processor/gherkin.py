@@ -3,14 +3,37 @@
 It provides functionality to validate, process, and convert Gherkin components into string or dictionary representations.
 """
 
+from copy import deepcopy
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from itertools import chain, count
+from typing import Any, Dict, Iterator, List, Mapping, Optional, TextIO, Tuple
 
 from gherkin_processor.components.background import Background
+from gherkin_processor.components.diagnostic import Diagnostic
 from gherkin_processor.components.feature import Feature
 from gherkin_processor.components.rule import Rule
 from gherkin_processor.components.scenario import Scenario
-from gherkin_processor.private.positions import ALLOWED_POSITIONS
+from gherkin_processor.components.source import (BUFFER_TYPES,
+                                                 SourceBackground,
+                                                 SourceBuffer, SourceData,
+                                                 SourceFeature, SourceRule,
+                                                 decode_source, map_file)
+from gherkin_processor.components.table import table_memo
+from gherkin_processor.private.dictionaries import as_mapping
+from gherkin_processor.private.lines import (AND, BACKGROUND, BACKQUOTE_FENCE,
+                                             BUT, EXAMPLES, FEATURE, GIVEN,
+                                             QUOTE_FENCE, RULE, SCENARIO,
+                                             TABLE, TAG, Source,
+                                             classify_lines)
+from gherkin_processor.private.parser import (Parser, SpanParser,
+                                              ValidationParser)
+from gherkin_processor.private.positions import (ALLOWED_TRANSITIONS,
+                                                 BEGINNING, NO_STEP, OUTLINE,
+                                                 STATUSES, doc_string_status,
+                                                 position_error, step_status,
+                                                 table_status)
+
+ENGINES: List[str] = ["reference", "fast", "span"]
 
 
 @dataclass
@@ -25,15 +48,23 @@ class Gherkin:
         scenarios (List[Scenario]): A list of scenarios defined in the Gherkin file.
 
     Methods:
-        __init__(file_path: Optional[str] = None, validate: bool = True):
+        __init__(file_path: Optional[str] = None, validate: bool = True, engine: str = "reference"):
             Initialize the Gherkin object and optionally process a file.
         __str__() -> str:
             Return the string representation of the Gherkin object.
         to_string() -> str:
             Convert the Gherkin object to a string representation.
+        iter_chunks() -> Iterator[str]:
+            Yield the string representation of the Gherkin object in chunks.
+        write_to(file: TextIO) -> None:
+            Write the string representation of the Gherkin object to a file.
         to_dictionary() -> Dict[str, Any]:
             Convert the Gherkin object to a dictionary representation.
-        process(text: str, validate: bool) -> bool:
+        copy() -> Gherkin:
+            Return a deep copy of the Gherkin object, which keeps the tables as Table objects.
+        from_dictionary(gherkin: Mapping[str, Any]) -> Gherkin:
+            Create a Gherkin object from the dictionary representation, without processing any text.
+        process(text: SourceData, validate: bool, engine: str = "reference", diagnostics: Optional[List[Diagnostic]] = None) -> bool:
             Process the Gherkin text and validate its syntax.
     """
 
@@ -43,12 +74,16 @@ class Gherkin:
     background: Background
     scenarios: List[Scenario]
 
-    def __init__(self, file_path: Optional[str] = None, validate: bool = True) -> None:
+    def __init__(self, file_path: Optional[str] = None, validate: bool = True, engine: str = "reference") -> None:
         """Initialize the Gherkin object.
 
         Args:
             file_path (Optional[str]): The path to the Gherkin file to be processed.
             validate (bool): Whether to validate the syntax during processing.
+            engine (str): The parser engine to process the file with ("reference", "fast", or "span").
+
+        Raises:
+            UnicodeDecodeError: If the file cannot be decoded.
         """
         self.file = None
         self.feature = Feature()
@@ -57,9 +92,11 @@ class Gherkin:
         self.scenarios = []
 
         if file_path is not None:
-            with open(file_path, "r", encoding="utf-8", errors="namereplace") as text:
+            with open(file_path, "rb") as file:
                 self.file = file_path
-                self.process(text.read(), validate)
+                # The span components keep reading their source, so they get a copy instead of the mapped file, which
+                # could change or shrink on disk after loading, and the reference engine decodes the whole file.
+                self.process(map_file(file) if engine == "fast" else file.read(), validate, engine)
 
     def __str__(self) -> str:
         """Return the string representation of the Gherkin object.
@@ -75,15 +112,39 @@ class Gherkin:
         Returns:
             str: The string representation of the Gherkin object.
         """
-        lines: List[str] = []
-        if str(self.feature):
-            lines.append(str(self.feature))
-        if str(self.rule):
-            lines.append(str(self.rule))
-        if str(self.background):
-            lines.append(str(self.background))
-        lines.extend(map(str, self.scenarios))
-        return "\n".join(lines)
+        return "".join(self.iter_chunks())
+
+    def iter_chunks(self) -> Iterator[str]:
+        """Yield the string representation of the Gherkin object in chunks, without building the whole string.
+
+        Every component is rendered only once, and the scenarios and their steps are yielded one by one.
+
+        Yields:
+            str: The next chunk of the string representation.
+        """
+        separator = ""
+        for header in (self.feature.to_string(), self.rule.to_string()):
+            if header:
+                yield separator + header
+                separator = "\n"
+        background = self.background.iter_chunks()
+        first = next(background, None)
+        if first is not None:
+            yield separator + first
+            yield from background
+            separator = "\n"
+        for scenario in self.scenarios:
+            yield separator
+            yield from scenario.iter_chunks()
+            separator = "\n"
+
+    def write_to(self, file: TextIO) -> None:
+        """Write the string representation of the Gherkin object to a file chunk by chunk.
+
+        Args:
+            file (TextIO): The text file or stream to write to.
+        """
+        file.writelines(self.iter_chunks())
 
     def to_dictionary(self) -> Dict[str, Any]:
         """Convert the Gherkin object to a dictionary representation.
@@ -98,168 +159,238 @@ class Gherkin:
             "scenarios": self.scenarios,
         }
 
-    def process(self, text: str, validate: bool) -> bool:
+    def copy(self) -> "Gherkin":
+        """Return a deep copy of the Gherkin object, which keeps the tables of the components as Table objects.
+
+        'copy.deepcopy' converts the tables into their dictionary representation, the same way as 'dataclasses.asdict'.
+
+        Returns:
+            Gherkin: The copy, which shares no mutable value with this Gherkin object.
+        """
+        steps = chain(self.background.steps or [], *(scenario.steps for scenario in self.scenarios))
+        return deepcopy(self, table_memo(chain((scenario.outline for scenario in self.scenarios), (step.table for step in steps))))
+
+    @classmethod
+    def from_dictionary(cls, gherkin: Mapping[str, Any]) -> "Gherkin":
+        """Create a Gherkin object from the dictionary representation, without processing any text.
+
+        The dictionary representation is the one of the JSON output, of 'dataclasses.asdict', or of 'to_dictionary',
+        whose nested components are component objects instead of dictionaries, so a saved JSON file can be loaded
+        instead of processing the Gherkin file again.
+
+        Args:
+            gherkin (Mapping[str, Any]): The dictionary representation of the Gherkin file.
+
+        Returns:
+            Gherkin: The Gherkin object with the same components, and with the file path of the representation, if any.
+
+        Raises:
+            KeyError: If a component or a value is missing from the dictionary representation.
+        """
+        result = cls()
+        result.file = gherkin.get("file")
+        result.feature = Feature.from_dictionary(as_mapping(gherkin["feature"]))
+        result.rule = Rule.from_dictionary(as_mapping(gherkin["rule"]))
+        result.background = Background.from_dictionary(as_mapping(gherkin["background"]))
+        result.scenarios = [Scenario.from_dictionary(as_mapping(scenario)) for scenario in gherkin["scenarios"]]
+        return result
+
+    def process(self, text: SourceData, validate: bool, engine: str = "reference", diagnostics: Optional[List[Diagnostic]] = None) -> bool:
         """Process the Gherkin text and validate its syntax.
 
+        The "reference" engine processes every component separately, while the "fast" engine walks the text only once.
+        The "span" engine walks the text like the "fast" engine, but builds source components, which keep the spans of
+        their texts in the shared source text, and build the strings only when they are read. All engines build
+        components with the same values and raise the same validation errors.
+
+        The text can also be encoded as bytes, bytearray, memoryview, or a memory-mapped file. Its encoding is detected
+        from the byte order mark, and UTF-8 is used without it. The "fast" and "span" engines decode the text window by
+        window, and the "span" engine decodes the component strings only when they are read. The components of the "span"
+        engine keep a view of the encoded text, so a memory-mapped file cannot be closed while they are in use.
+
+        If a diagnostics list is given, the syntax errors are not raised, and every issue of the text is appended to the
+        list instead, in the order of the lines. The "fast" and "span" engines collect the issues while processing the
+        text, while the "reference" engine, which stops checking a component at its first issue, collects them with the
+        validation engine.
+
         Args:
-            text (str): The Gherkin text to be processed.
+            text (SourceData): The Gherkin text to be processed, as a string or as encoded bytes.
             validate (bool): Whether to validate the syntax during processing.
+            engine (str): The parser engine to process the text with ("reference", "fast", or "span").
+            diagnostics (Optional[List[Diagnostic]]): The list to collect the issues of the text in, without raising them.
 
         Returns:
             bool: True if the syntax is valid, False otherwise.
 
         Raises:
-            TypeError: If the 'text' argument is not a string.
-            ValueError: If validation fails for the step syntax.
+            TypeError: If the 'text' argument is neither a string nor a bytes-like object.
+            ValueError: If the engine is unknown, or validation fails for the step syntax, unless diagnostics are collected.
+            UnicodeDecodeError: If the encoded text cannot be decoded.
         """
-        if validate and not isinstance(text, str):
+        if validate and not isinstance(text, (str, *BUFFER_TYPES)):
             raise TypeError("Variable 'text' is not string type")
+        if engine != "reference" or isinstance(text, BUFFER_TYPES) or diagnostics is not None:
+            return self._process_source(text, validate, engine, diagnostics)
+        return self._process_text(text, validate)
 
+    def _process_text(self, text: str, validate: bool) -> bool:
         valid_syntax: bool = isinstance(text, str)
+        is_valid: bool = True
         lines: List[str] = text.splitlines()
-        previous: str = "<BEGINNING>"
-        status: str = "<BEGINNING>"
+        kinds = classify_lines(lines)
+        previous: int = BEGINNING
+        status: int = BEGINNING
         doc_string: str = ""
-        step: str = ""
+        step: int = NO_STEP
         start: int = 0
-        num: int = 0
+        scenario_line: int = -1
+
+        for source_line in zip(count(1), lines, kinds):
+            # The last scenario line before the previous line, which ends the pending scenario when it is after its start.
+            if source_line[0] > 2 and kinds[source_line[0] - 3] == SCENARIO:
+                scenario_line = source_line[0] - 3
 
-        for num, line in enumerate(lines, 1):
-            status, doc_string, is_valid = self._handle_docstring(status, doc_string, (num, line), validate)
+            status, doc_string, is_valid = self._handle_docstring(status, doc_string, source_line, validate)
             valid_syntax &= is_valid
 
             if doc_string != "":
                 continue
 
-            status, is_valid = self._handle_metadata(status, (num, line), validate)
+            status, is_valid = self._handle_metadata(status, source_line, validate)
             valid_syntax &= is_valid
 
-            status, is_valid = self._handle_background(status, (num, line), validate)
+            status, is_valid = self._handle_background(status, source_line, validate)
             valid_syntax &= is_valid
 
-            status, step, is_valid = self._handle_scenario(status, step, (num, line), validate)
+            status, step, is_valid = self._handle_scenario(status, step, source_line, validate)
             valid_syntax &= is_valid
 
-            status, is_valid = self._handle_table(status, (num, line), validate)
+            status, is_valid = self._handle_table(status, source_line, validate)
             valid_syntax &= is_valid
 
-            previous, start, is_valid = self._process_component((status, previous), (start, num-1), lines, validate)
+            previous, start, is_valid = self._process_component((status, previous), (start, source_line[0] - 1, scenario_line), (lines, kinds, 0), validate)
             valid_syntax &= is_valid
 
-        if start < num:
-            valid_syntax &= self._process_last_component(previous, start, lines, validate)
+        if start < len(lines):
+            valid_syntax &= self._process_last_component(previous, start, (lines, kinds, 0), validate)
         return valid_syntax and is_valid
 
-    def _handle_docstring(self, status: str, doc_string: str, line: Tuple[int, str], validate: bool) -> Tuple[str, str, bool]:
-        _, text = line
-        stripped_line = text.strip()
-        if stripped_line.startswith("```") and doc_string == "backquote":
+    def _process_source(self, text: SourceData, validate: bool, engine: str, diagnostics: Optional[List[Diagnostic]]) -> bool:
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown parser engine '{engine}', expected one of: {', '.join(ENGINES)}")
+        parser: Parser
+        validate = validate and diagnostics is None
+        if engine == "span":
+            self.feature, self.rule, self.background = SourceFeature(), SourceRule(), SourceBackground()
+            parser = SpanParser(self, validate, SourceBuffer(text))
+            valid = parser.parse_source()
+        elif engine == "fast":
+            parser = Parser(self, validate)
+            valid = parser.parse(text.splitlines() if isinstance(text, str) else SourceBuffer(text).lines())
+        else:
+            if not isinstance(text, str):
+                text = decode_source(text)
+            valid = self._process_text(text, validate)
+            parser = ValidationParser(False)
+            if diagnostics is not None:
+                parser.parse(text.splitlines())
+        if diagnostics is not None:
+            diagnostics.extend(parser.diagnostics)
+        return valid
+
+    def _handle_docstring(self, status: int, doc_string: str, line: Tuple[int, str, int], validate: bool) -> Tuple[int, str, bool]:
+        kind = line[2]
+        if kind == BACKQUOTE_FENCE and doc_string == "backquote":
             return status, "", True
-        if stripped_line.startswith("```") and doc_string == "":
-            return f"{status} DOC-STRING", "backquote", self._validate_position(f"{status} DOC-STRING", status, line, validate)
-        if stripped_line.startswith('"""') and doc_string == "quote":
+        if kind == BACKQUOTE_FENCE and doc_string == "":
+            return doc_string_status(status), "backquote", self._validate_position(doc_string_status(status), status, line, validate)
+        if kind == QUOTE_FENCE and doc_string == "quote":
             return status, "", True
-        if stripped_line.startswith('"""') and doc_string == "":
-            return f"{status} DOC-STRING", "quote", self._validate_position(f"{status} DOC-STRING", status, line, validate)
+        if kind == QUOTE_FENCE and doc_string == "":
+            return doc_string_status(status), "quote", self._validate_position(doc_string_status(status), status, line, validate)
         return status, doc_string, True
 
-    def _handle_metadata(self, status: str, line: Tuple[int, str], validate: bool) -> Tuple[str, bool]:
-        _, text = line
-        stripped_line = text.strip()
-        if stripped_line.startswith("Feature:"):
-            return "FEATURE", self._validate_position("FEATURE", status, line, validate)
-        if stripped_line.startswith("Rule:"):
-            return "RULE", self._validate_position("RULE", status, line, validate)
+    def _handle_metadata(self, status: int, line: Tuple[int, str, int], validate: bool) -> Tuple[int, bool]:
+        kind = line[2]
+        if kind == FEATURE:
+            return FEATURE, self._validate_position(FEATURE, status, line, validate)
+        if kind == RULE:
+            return RULE, self._validate_position(RULE, status, line, validate)
         return status, True
 
-    def _handle_background(self, status: str, line: Tuple[int, str], validate: bool) -> Tuple[str, bool]:
-        _, text = line
-        stripped_line = text.strip()
-        if stripped_line.startswith("Background:"):
-            return "BACKGROUND", self._validate_position("BACKGROUND", status, line, validate)
+    def _handle_background(self, status: int, line: Tuple[int, str, int], validate: bool) -> Tuple[int, bool]:
+        kind = line[2]
+        if kind == BACKGROUND:
+            return BACKGROUND, self._validate_position(BACKGROUND, status, line, validate)
         return status, True
 
-    def _handle_scenario(self, status: str, step: str, line: Tuple[int, str], validate: bool) -> Tuple[str, str, bool]:
-        _, text = line
-        stripped_line = text.strip()
-        if stripped_line.startswith("@"):
-            return "TAG", step, self._validate_position("TAG", status, line, validate)
-        if stripped_line.startswith(("Scenario:", "Example:", "Scenario Outline:", "Scenario Template:", "Example Outline:", "Example Template:")):
-            return "SCENARIO", "GIVEN", self._validate_position("SCENARIO", status, line, validate)
-        if stripped_line.startswith(("Given ", "When ", "Then ", "But ")):
-            step = stripped_line.split(" ", maxsplit=1)[0].upper()
-            return step, step, self._validate_position(stripped_line.split(" ", maxsplit=1)[0].upper(), status, line, validate)
-        if stripped_line.startswith(("And ", "* ")):
-            return status.removesuffix(" TABLE").removesuffix(" DOC-STRING"), step, self._validate_position(step, status, line, validate)
-        if stripped_line.startswith(("Scenarios:", "Examples:")):
-            return "OUTLINE", step, True
+    def _handle_scenario(self, status: int, step: int, line: Tuple[int, str, int], validate: bool) -> Tuple[int, int, bool]:
+        kind = line[2]
+        if kind == TAG:
+            return TAG, step, self._validate_position(TAG, status, line, validate)
+        if kind == SCENARIO:
+            return SCENARIO, GIVEN, self._validate_position(SCENARIO, status, line, validate)
+        if GIVEN <= kind <= BUT:
+            return kind, kind, self._validate_position(kind, status, line, validate)
+        if kind == AND:
+            return step_status(status), step, self._validate_position(step, status, line, validate)
+        if kind == EXAMPLES:
+            return OUTLINE, step, True
         return status, step, True
 
-    def _handle_table(self, status: str, line: Tuple[int, str], validate: bool) -> Tuple[str, bool]:
-        _, text = line
-        stripped_line = text.strip()
-        if stripped_line.startswith("|"):
-            status = f"{status} TABLE" if not status.endswith("TABLE") else status
-            return status, self._validate_position(f"{status} TABLE" if not status.endswith("TABLE") else status, status, line, validate)
+    def _handle_table(self, status: int, line: Tuple[int, str, int], validate: bool) -> Tuple[int, bool]:
+        kind = line[2]
+        if kind == TABLE:
+            status = table_status(status)
+            return status, self._validate_position(table_status(status), status, line, validate)
         return status, True
 
-    def _validate_position(self, keyword: str, status: str, line: Tuple[int, str], validate: bool) -> bool:
-        num, text = line
-        allowed_positions = ALLOWED_POSITIONS.get(keyword)
-        if validate and allowed_positions is None:
-            if keyword.endswith("TABLE"):
-                raise ValueError(f"Table component cannot be after '{keyword.removesuffix(' TABLE')}' at line [{num}]: {text}")
-            if keyword.endswith("DOC-STRING"):
-                raise ValueError(f"Doc-string component cannot be after '{keyword.removesuffix(' DOC-STRING')}' at line [{num}]: {text}")
-            raise ValueError(f"Could not resolve current status '{keyword}' as a valid possibility at line [{num}]: {text}")
-        if validate and allowed_positions is not None and status not in allowed_positions:
-            raise ValueError(f"Keyword '{keyword}' cannot be after '{status}' at line [{num}]: {text}")
-        return allowed_positions is not None and status in allowed_positions
-
-    def _process_component(self, status: Tuple[str, str], position: Tuple[int, int], lines: List[str], validate: bool) -> Tuple[str, int, bool]:
+    def _validate_position(self, keyword: int, status: int, line: Tuple[int, str, int], validate: bool) -> bool:
+        error = position_error(ALLOWED_TRANSITIONS, keyword, status)
+        if validate and error is not None:
+            num, text, _ = line
+            raise ValueError(f"{error} at line [{num}]: {text}")
+        return error is None
+
+    def _process_component(self, status: Tuple[int, int], position: Tuple[int, int, int], source: Source, validate: bool) -> Tuple[int, int, bool]:
         current, previous = status
-        start, end = position
+        start, end, scenario_line = position
+        lines, kinds, _ = source
         is_valid: bool = True
-        if current in ["FEATURE", "RULE", "BACKGROUND", "TAG", "SCENARIO"] and current != previous:
-            match previous:
+        if current in (FEATURE, RULE, BACKGROUND, TAG, SCENARIO) and current != previous:
+            match STATUSES[previous]:
                 case "FEATURE":
-                    is_valid = self.feature.process(("\n" * start) + "\n".join(lines[start:end]), validate)
+                    is_valid = self.feature.process("\n".join(lines[start:end]), validate, start, kinds[start:end])
                 case "RULE":
-                    is_valid = self.rule.process(("\n" * start) + "\n".join(lines[start:end]), validate)
+                    is_valid = self.rule.process("\n".join(lines[start:end]), validate, start, kinds[start:end])
                 case "BACKGROUND":
-                    is_valid = self.background.process(("\n" * start) + "\n".join(lines[start:end]), validate)
+                    is_valid = self.background.process("\n".join(lines[start:end]), validate, start, kinds[start:end])
                 case "SCENARIO":
                     self.scenarios.append(Scenario())
-                    is_valid = self.scenarios[-1].process(("\n" * start) + "\n".join(lines[start:end]), validate)
+                    is_valid = self.scenarios[-1].process("\n".join(lines[start:end]), validate, start, kinds[start:end])
                 case _:
                     return current, start, is_valid
             return current, end, is_valid
-        if (current == "SCENARIO" and any(line.strip().startswith((
-            "Scenario:",
-            "Example:",
-            "Scenario Outline:",
-            "Scenario Template:",
-            "Example Outline:",
-            "Example Template:"
-        )) for line in lines[start:end-1])):
+        if current == SCENARIO and scenario_line >= start:
             self.scenarios.append(Scenario())
-            is_valid = self.scenarios[-1].process(("\n" * start) + "\n".join(lines[start:end]), validate)
+            is_valid = self.scenarios[-1].process("\n".join(lines[start:end]), validate, start, kinds[start:end])
             return current, end, is_valid
         return previous, start, is_valid
 
-    def _process_last_component(self, previous: str, start: int, lines: List[str], validate: bool) -> bool:
+    def _process_last_component(self, previous: int, start: int, source: Source, validate: bool) -> bool:
+        lines, kinds, _ = source
         is_valid: bool = True
-        match previous:
+        match STATUSES[previous]:
             case "FEATURE":
-                is_valid = self.feature.process(("\n" * start) + "\n".join(lines[start:]), validate)
+                is_valid = self.feature.process("\n".join(lines[start:]), validate, start, kinds[start:])
             case "RULE":
-                is_valid = self.rule.process(("\n" * start) + "\n".join(lines[start:]), validate)
+                is_valid = self.rule.process("\n".join(lines[start:]), validate, start, kinds[start:])
             case "BACKGROUND":
-                is_valid = self.background.process(("\n" * start) + "\n".join(lines[start:]), validate)
+                is_valid = self.background.process("\n".join(lines[start:]), validate, start, kinds[start:])
             case "TAG":
                 self.scenarios.append(Scenario())
-                is_valid = self.scenarios[-1].process(("\n" * start) + "\n".join(lines[start:]), validate)
+                is_valid = self.scenarios[-1].process("\n".join(lines[start:]), validate, start, kinds[start:])
             case "SCENARIO":
                 self.scenarios.append(Scenario())
-                is_valid = self.scenarios[-1].process(("\n" * start) + "\n".join(lines[start:]), validate)
+                is_valid = self.scenarios[-1].process("\n".join(lines[start:]), validate, start, kinds[start:])
         return is_valid
@@ -1,16 +1,23 @@
 """Provide the main entry point for the Gherkin processor.
 
 This module defines the command-line interface for processing, validating, and saving Gherkin files
-in various formats.
+in various formats. The commands are imported when they are run, so importing the package, which imports the 'main'
+function, does not load the modules which process the files.
 """
 
 import sys
-from argparse import ArgumentParser, HelpFormatter, Namespace
-from os.path import abspath, basename, dirname, splitext
-from typing import Any
+from argparse import (ArgumentParser, ArgumentTypeError, HelpFormatter,
+                      Namespace)
+from importlib import import_module
+from os import getcwd
+from typing import TYPE_CHECKING, Any, Iterator, List, Optional
 
-from gherkin_processor.gherkin import Gherkin
-from gherkin_processor.utils import load, save
+if TYPE_CHECKING:
+    from gherkin_processor.private.commands import (FileResult, expand_inputs,
+                                                    output_path)
+
+__all__ = ["expand_inputs", "job_count", "main", "output_path", "parse_arguments", "parse_serve_arguments"]
+COMMAND_NAMES = ["expand_inputs", "output_path"]
 
 
 class CustomHelpFormatter(HelpFormatter):
@@ -25,91 +32,147 @@ class CustomHelpFormatter(HelpFormatter):
         super().__init__(prog, max_help_position=36)
 
 
-def parse_arguments() -> Namespace:
+def __getattr__(name: str) -> Any:
+    """Import a public name of the commands on first access.
+
+    Args:
+        name (str): The name of the attribute.
+
+    Returns:
+        Any: The public object of the name, which is stored in the module for the later accesses.
+
+    Raises:
+        AttributeError: If the name is not public.
+    """
+    if name not in COMMAND_NAMES:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    value = getattr(import_module("gherkin_processor.private.commands"), name)
+    globals()[name] = value
+    return value
+
+
+def job_count(value: str) -> int:
+    """Convert the argument of the number of jobs.
+
+    Args:
+        value (str): The argument, a non-negative integer.
+
+    Returns:
+        int: The number of jobs, where zero means one job per CPU.
+
+    Raises:
+        ArgumentTypeError: If the argument is not a non-negative integer.
+    """
+    if not value.isdigit():
+        raise ArgumentTypeError(f"invalid number of jobs: '{value}'")
+    return int(value)
+
+
+def parse_arguments(argv: Optional[List[str]] = None) -> Namespace:
     """Parse command-line arguments.
 
+    Args:
+        argv (Optional[List[str]]): The arguments, or None to parse the arguments of the process.
+
     Returns:
         Namespace: The parsed arguments as a Namespace object.
     """
     parser = ArgumentParser(description="Process and save Ghekin files in different formats.", formatter_class=CustomHelpFormatter)
 
-    parser.add_argument("-i", "--input", type=str, required=True, help="input file path")
+    parser.add_argument("-i", "--input", type=str, nargs="+", action="extend", required=True, help="input file paths, directories, or glob patterns")
     parser.add_argument("-o", "--output", type=str, help="output file of the savings")
     parser.add_argument("-p", "--print", action="store_true", help="write the input file Gherkin syntax to standard output")
     parser.add_argument("-s", "--save", "--save-gherkin", action="store_true", help="save file as Gherkin")
     parser.add_argument("-j", "--json", "--save-json", action="store_true", help="save file as JSON")
     parser.add_argument("-y", "--yes", "--force-yes", action="store_true", help="automatically press 'y' for every user input request")
     parser.add_argument("-v", "--validate", action="store_true", help="validate the input file syntax")
+    parser.add_argument("-c", "--cache-dir", type=str, help="directory to keep the processed files in between runs")
+    parser.add_argument("--jobs", type=job_count, default=1, help="number of worker processes, or 0 for one per CPU")
+    parser.add_argument("--unordered", action="store_true", help="report the files in the order of completion")
+    parser.add_argument("--connect", type=str, nargs="?", const="", metavar="SOCKET",
+                        help="forward the command to the daemon listening on the socket, or on the default socket")
+    parser.set_defaults(cwd=None)
 
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
-def save_gherkin(args: Namespace, gherkin: Gherkin) -> None:
-    """Save the Gherkin object in Gherkin format.
+def parse_serve_arguments(argv: Optional[List[str]] = None) -> Namespace:
+    """Parse the command-line arguments of the 'serve' command.
 
     Args:
-        args (Namespace): The command-line arguments.
-        gherkin (Gherkin): The Gherkin object to save.
+        argv (Optional[List[str]]): The arguments after the command, or None to parse the arguments of the process.
+
+    Returns:
+        Namespace: The parsed arguments as a Namespace object.
     """
-    path = abspath(args.input)
-    directory = dirname(path)
-    filename, extension = splitext(basename(path))
-    extension = extension.removeprefix(".")
-    args.output = args.input if args.output is None else args.output
-    args.output = args.output.replace("<DIR>", directory).replace("<DIRECTORY>", directory)
-    args.output = args.output.replace("<NAME>", filename).replace("<FILENAME>", filename)
+    parser = ArgumentParser(prog="gherkin-processor serve", description="Run the daemon which processes the files of the clients.",
+                            formatter_class=CustomHelpFormatter)
 
-    defined_output = args.output.replace("<EXT>", extension).replace("<EXTENSION>", extension)
-    if not save(gherkin, defined_output, "GHERKIN", False):
-        if args.yes or input(f"File '{defined_output}' already exists. Would you like to replace it? [y/n] ").upper() in ["Y", "YES"]:
-            save(gherkin, defined_output, "GHERKIN", True)
+    parser.add_argument("--socket", type=str, help="path of the socket to listen on, instead of the default socket")
+    parser.add_argument("-c", "--cache-dir", type=str, help="directory to keep the processed files in between runs")
 
+    return parser.parse_args(argv)
 
-def save_json(args: Namespace, gherkin: Gherkin) -> None:
-    """Save the Gherkin object in JSON format.
 
-    Args:
-        args (Namespace): The command-line arguments.
-        gherkin (Gherkin): The Gherkin object to save.
-    """
-    path = abspath(args.input)
-    directory = dirname(path)
-    filename, extension = splitext(basename(path))
-    extension = extension.removeprefix(".")
-    args.output = args.input if args.output is None else args.output
-    args.output = args.output.replace("<DIR>", directory).replace("<DIRECTORY>", directory)
-    args.output = args.output.replace("<NAME>", filename).replace("<FILENAME>", filename)
+def command_results(args: Namespace) -> Iterator["FileResult"]:
+    """Run the command of the arguments, and return the results of the input files.
 
-    defined_output = args.output.replace(extension, "json").replace("<EXT>", "json").replace("<EXTENSION>", "json")
-    if not save(gherkin, defined_output, "JSON", False):
-        if args.yes or input(f"File '{defined_output}' already exists. Would you like to replace it? [y/n] ").upper() in ["Y", "YES"]:
-            save(gherkin, defined_output, "JSON", True)
+    The command is forwarded to the daemon if the 'connect' argument is set, and it is run in the current process if
+    the daemon cannot be reached. The daemon client is only imported when it is used, like the other modules which
+    are not needed for processing the files locally.
 
+    Args:
+        args (Namespace): The command-line arguments.
 
-def main() -> None:
+    Returns:
+        Iterator[FileResult]: The results of the input files.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from gherkin_processor.private.commands import expand_inputs, iter_results
+    if args.connect is not None:
+        # pylint: disable-next=import-outside-toplevel
+        from gherkin_processor.daemon import connect, default_socket_path
+        socket_path = args.connect
+        try:
+            socket_path = socket_path or default_socket_path()
+            return connect(socket_path, Namespace(**{**vars(args), "cwd": getcwd()}))
+        except OSError as e:
+            print(f"Cannot connect to the daemon at '{socket_path or 'the default socket'}', processing the files locally: {e}", file=sys.stderr)
+    return iter_results(args, expand_inputs(args.input))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
     """Run the Gherkin processor command-line interface.
 
-    This function parses the command-line arguments, processes the input file, and performs actions
-    such as saving the file in different formats, validating the syntax, or printing the Gherkin syntax.
-    """
-    args = parse_arguments()
+    This function parses the command-line arguments, processes the input files, and performs actions
+    such as saving the files in different formats, validating the syntax, or printing the Gherkin syntax.
+    Every file is processed even if some of them fail, and the process exits with status 1 if any of them failed.
+    With the 'serve' command, the daemon is run instead, until it is interrupted.
 
+    Args:
+        argv (Optional[List[str]]): The arguments, or None to parse the arguments of the process.
+    """
+    arguments = sys.argv[1:] if argv is None else argv
+    if arguments[:1] == ["serve"]:
+        # pylint: disable-next=import-outside-toplevel
+        from gherkin_processor.daemon import serve
+        serve_args = parse_serve_arguments(arguments[1:])
+        serve(serve_args.socket, serve_args.cache_dir)
+        return
+    args = parse_arguments(arguments)
+    # pylint: disable-next=import-outside-toplevel
+    from gherkin_processor.private.commands import report
+
+    succeeded = True
     try:
-        processed = load(args.input, args.validate)
-    except (IOError, TypeError, ValueError) as e:
+        for result in command_results(args):
+            succeeded = report(args, result) and succeeded
+    except ValueError as e:
         print(e, file=sys.stderr)
-        sys.exit(1)
+        succeeded = False
 
-    gherkin = Gherkin() if processed is None else processed
-
-    if args.save:
-        save_gherkin(args, gherkin)
-
-    if args.json:
-        save_json(args, gherkin)
-
-    if args.print:
-        print(str(gherkin))
+    if not succeeded:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
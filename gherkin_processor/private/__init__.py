@@ -3,5 +3,6 @@
 from .formatters import format_table
 from .positions import (ALLOWED_BACKGROUND_POSITIONS, ALLOWED_POSITIONS,
                         ALLOWED_SCENARIO_POSITIONS)
+from .tables import split_table_row
 
-__all__ = ["ALLOWED_POSITIONS", "ALLOWED_BACKGROUND_POSITIONS", "ALLOWED_SCENARIO_POSITIONS", "format_table"]
+__all__ = ["ALLOWED_POSITIONS", "ALLOWED_BACKGROUND_POSITIONS", "ALLOWED_SCENARIO_POSITIONS", "format_table", "split_table_row"]
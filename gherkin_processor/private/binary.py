@@ -0,0 +1,482 @@
+"""Provide functions for encoding Gherkin objects into a compact binary format, and decoding them from it.
+
+The binary format starts with a header of a magic number, the version of the format, the item sizes of the string
+lengths and of the records, and the lengths of the sections. It is followed by the string table, which stores every distinct string once, as the
+character lengths of the strings and their UTF-8 encoded concatenation, and by the records, which are one array of
+unsigned integers. The records reference the strings by their index plus one, and zero stands for None. The lists are
+prefixed by their lengths, and the lengths of the optional lists are incremented by one, so zero stands for None. The
+tables are stored as their shared buffer and the headers of their header line, each followed by the offsets of the cells
+of its column, which are empty for a repeated header, so a table is restored without splitting it.
+
+The components of the "span" engine can keep their spans in the second version of the format. Its records start with
+the source text and the offsets of its lines, and its text records are doubled string references, or the doubled
+number of the span offsets plus one followed by the offsets, so the restored components share one source text again.
+An encoded source text is stored after the records, and a string source text is stored in the string table.
+"""
+
+from array import array
+from itertools import accumulate, islice, repeat
+from mmap import mmap
+from struct import Struct, error
+from sys import byteorder, intern
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from gherkin_processor.components.background import Background
+from gherkin_processor.components.feature import Feature
+from gherkin_processor.components.rule import Rule
+from gherkin_processor.components.scenario import Scenario
+from gherkin_processor.components.source import (SourceBackground,
+                                                 SourceBuffer, SourceFeature,
+                                                 SourceRule, SourceScenario,
+                                                 SourceStep, Span, span_of)
+from gherkin_processor.components.step import Step
+from gherkin_processor.components.table import Table
+from gherkin_processor.gherkin import Gherkin
+
+BINARY_MAGIC = b"GHKB"
+BINARY_VERSION = 1
+SOURCE_VERSION = 2
+BINARY_HEADER = Struct("<4sHBBIII")
+ITEM_TYPES: Dict[int, str] = {1: "B", 2: "H", 4: "I", 8: "Q"}
+
+BinaryData = Union[bytes, bytearray, memoryview, mmap]
+
+
+def is_binary(data: BinaryData) -> bool:
+    """Check if data starts with the magic number of the binary format.
+
+    Args:
+        data (BinaryData): The data, or its first bytes.
+
+    Returns:
+        bool: True if the data is in the binary format, False otherwise.
+    """
+    return data[:len(BINARY_MAGIC)] == BINARY_MAGIC
+
+
+def encode_gherkin(gherkin: Gherkin, spans: bool = False) -> bytes:
+    """Encode a Gherkin object into the binary format.
+
+    Args:
+        gherkin (Gherkin): The Gherkin object to encode.
+        spans (bool): Whether to keep the spans of the source components in the second version of the format. The
+            format of a Gherkin object without source components is the same either way.
+
+    Returns:
+        bytes: The binary representation of the Gherkin object.
+
+    Raises:
+        ValueError: If the spans are kept and do not share one source text.
+    """
+    encoder = _BinaryEncoder(spans and isinstance(gherkin.feature, SourceFeature))
+    encoder.encode(gherkin)
+    records, source = encoder.source_records()
+    strings = list(encoder.strings)
+    lengths = compact_array(list(map(len, strings)))
+    text = "".join(strings).encode("utf-8", "surrogatepass")
+    packed = compact_array(records)
+    version = SOURCE_VERSION if encoder.spans else BINARY_VERSION
+    header = BINARY_HEADER.pack(BINARY_MAGIC, version, lengths.itemsize, packed.itemsize, len(strings), len(text), len(packed))
+    return b"".join([header, lengths.tobytes(), text, packed.tobytes(), source])
+
+
+def compact_array(values: List[int]) -> "array[int]":
+    """Store unsigned integers in an array of the smallest item size which fits them, in little-endian byte order.
+
+    Args:
+        values (List[int]): The unsigned integers.
+
+    Returns:
+        array[int]: The array of the integers.
+    """
+    item_size = next(size for size in ITEM_TYPES if max(values, default=0) < 1 << (8 * size))
+    result = array(ITEM_TYPES[item_size], values)
+    if byteorder == "big":
+        result.byteswap()
+    return result
+
+
+def read_array(data: memoryview, item_size: int) -> "array[int]":
+    """Read unsigned integers stored by 'compact_array'.
+
+    Args:
+        data (memoryview): The little-endian integers.
+        item_size (int): The item size of the integers.
+
+    Returns:
+        array[int]: The array of the integers.
+    """
+    result = array(ITEM_TYPES[item_size])
+    result.frombytes(data)
+    if byteorder == "big":
+        result.byteswap()
+    return result
+
+
+def decode_gherkin(data: BinaryData) -> Gherkin:
+    """Decode a Gherkin object from the binary format.
+
+    The Gherkin object of the second version of the format is built from source components, which share one source text.
+
+    Args:
+        data (BinaryData): The binary representation of the Gherkin object, as bytes, bytearray, memoryview, or mmap.
+
+    Returns:
+        Gherkin: The decoded Gherkin object.
+
+    Raises:
+        ValueError: If the data is not in the binary format, its version is not supported, it is truncated or corrupt,
+            or it has bytes or records after the Gherkin object.
+    """
+    try:
+        magic, version, length_size, record_size, string_count, text_size, record_count = BINARY_HEADER.unpack_from(data)
+    except error as e:
+        raise ValueError("The data is not in the binary Gherkin format") from e
+    if magic != BINARY_MAGIC or version not in (BINARY_VERSION, SOURCE_VERSION) or not {length_size, record_size} <= ITEM_TYPES.keys():
+        raise ValueError(f"The data is not in the binary Gherkin format of version {BINARY_VERSION} or {SOURCE_VERSION}")
+    sections = list(accumulate([BINARY_HEADER.size, length_size * string_count, text_size, record_size * record_count]))
+    if len(data) < sections[3]:
+        raise ValueError("The binary Gherkin data is truncated")
+    if version == BINARY_VERSION and len(data) > sections[3]:
+        raise ValueError("The binary Gherkin data has bytes after its records")
+    view = memoryview(data)
+    text = str(view[sections[1]:sections[2]], "utf-8", "surrogatepass")
+    bounds = list(accumulate(read_array(view[sections[0]:sections[1]], length_size), initial=0))
+    strings: List[Any] = [None, *map(text.__getitem__, map(slice, bounds, islice(bounds, 1, None)))]
+    decoder = _BinaryDecoder(strings, iter(read_array(view[sections[2]:sections[3]], record_size)))
+    if version == SOURCE_VERSION:
+        decoder.read_source(view[sections[3]:])
+    return decoder.decode()
+
+
+class _BinaryEncoder:
+    """Collect the distinct strings of a Gherkin object, and the records which reference them."""
+
+    __slots__ = ("strings", "records", "spans", "source")
+
+    def __init__(self, spans: bool) -> None:
+        self.strings: Dict[str, int] = {}
+        self.records: List[int] = []
+        self.spans = spans
+        self.source: Optional[SourceBuffer] = None
+
+    def string(self, value: Optional[str]) -> int:
+        """Return the reference of a string, and add the string to the string table if it is new.
+
+        Args:
+            value (Optional[str]): The string, or None.
+
+        Returns:
+            int: The index of the string plus one, or zero for None.
+        """
+        if value is None:
+            return 0
+        index = self.strings.get(value)
+        if index is None:
+            index = self.strings[value] = len(self.strings) + 1
+        return index
+
+    def encode(self, gherkin: Gherkin) -> None:
+        """Append the records of a Gherkin object.
+
+        Args:
+            gherkin (Gherkin): The Gherkin object to encode.
+        """
+        records = self.records
+        records.append(self.string(gherkin.file))
+        self.texts(gherkin.feature, "name", "description")
+        self.texts(gherkin.rule, "name", "description")
+        self.texts(gherkin.background, "description")
+        self.steps(gherkin.background.steps)
+        records.append(len(gherkin.scenarios))
+        for scenario in gherkin.scenarios:
+            records.append(0 if scenario.tags is None else len(scenario.tags) + 1)
+            records.extend(map(self.string, scenario.tags or ()))
+            self.texts(scenario, "name", "description")
+            self.steps(scenario.steps)
+            self.table(scenario.outline)
+
+    def texts(self, component: Any, *names: str) -> None:
+        """Append the records of the text attributes of a component, and of its span if the spans are kept.
+
+        Args:
+            component (Any): The component.
+            *names (str): The names of the text attributes.
+        """
+        if not self.spans:
+            self.records.extend(map(self.string, map(getattr, repeat(component), names)))
+            return
+        for name in names:
+            self.text(span_of(component, name) or getattr(component, name))
+        self.text(span_of(component))
+
+    def text(self, value: Union[str, Span, None]) -> None:
+        """Append the records of a text, or of a span of the source text.
+
+        Args:
+            value (Union[str, Span, None]): The text, its span, or None.
+
+        Raises:
+            ValueError: If the span is not in the source text of the earlier spans.
+        """
+        if not isinstance(value, Span):
+            self.records.append(2 * self.string(value))
+            return
+        if self.source is None:
+            self.source = value.source
+        elif value.source is not self.source:
+            raise ValueError("The spans of the Gherkin object do not share one source text")
+        self.records.append(2 * len(value.offsets) + 1)
+        self.records.extend(value.offsets)
+
+    def steps(self, steps: Optional[List[Step]]) -> None:
+        """Append the records of an optional list of steps.
+
+        Args:
+            steps (Optional[List[Step]]): The steps, or None.
+        """
+        self.records.append(0 if steps is None else len(steps) + 1)
+        for step in steps or ():
+            if self.spans:
+                self.records.append(self.string(step.type))
+                self.texts(step, "text", "doc_string")
+            else:
+                self.records.extend((self.string(step.type), self.string(step.text), self.string(step.doc_string)))
+            self.table(step.table)
+
+    def table(self, table: Optional[Table]) -> None:
+        """Append the records of an optional table.
+
+        Args:
+            table (Optional[Table]): The table, or None.
+        """
+        if table is None:
+            self.records.append(0)
+            return
+        buffer, columns = table.to_offsets()
+        header_line = table.header_line
+        self.records.extend((len(header_line) + 1, self.string(buffer)))
+        for position, header in enumerate(header_line):
+            # A repeated header shares the column of its first position, so its offsets are only stored once.
+            offsets = columns[header] if header_line.index(header) == position else ()
+            self.records.extend((self.string(header), len(offsets)))
+            self.records.extend(offsets)
+
+    def source_records(self) -> Tuple[List[int], bytes]:
+        """Return the records, preceded by the records of the source text if the spans are kept.
+
+        Returns:
+            Tuple[List[int], bytes]: The records, and the encoded source text, which is empty for a string source text.
+        """
+        if not self.spans:
+            return self.records, b""
+        if self.source is None:
+            return [0, 0, 0, 0, 0, 0, *self.records], b""
+        data, encoding, starts, windows, newline = self.source.__getstate__()
+        text, source = (data, b"") if isinstance(data, str) else (None, data)
+        records = [self.string(encoding), self.string(text), len(source), newline, len(windows), *windows, len(starts), *starts]
+        records.extend(self.records)
+        return records, source
+
+
+class _BinaryDecoder:
+    """Build a Gherkin object from the string table and the records of the binary format."""
+
+    __slots__ = ("strings", "records", "next_record", "spans", "source")
+
+    def __init__(self, strings: List[Any], records: Iterator[int]) -> None:
+        self.strings = strings
+        self.records = records
+        self.next_record = records.__next__
+        self.spans = False
+        self.source: Optional[SourceBuffer] = None
+
+    def string(self) -> Any:
+        """Return the string referenced by the next record.
+
+        Returns:
+            Any: The string, or None.
+        """
+        return self.strings[self.next_record()]
+
+    def string_list(self, count: int) -> List[Any]:
+        """Return the strings referenced by the next records.
+
+        Args:
+            count (int): The number of the strings.
+
+        Returns:
+            List[Any]: The strings.
+
+        Raises:
+            IndexError: If the records end before the strings.
+        """
+        values = list(map(self.strings.__getitem__, islice(self.records, count)))
+        if len(values) != count:
+            raise IndexError("The records end before the strings")
+        return values
+
+    def offsets(self, count: int) -> List[int]:
+        """Return the next records, which are offsets.
+
+        Args:
+            count (int): The number of the offsets.
+
+        Returns:
+            List[int]: The offsets.
+
+        Raises:
+            IndexError: If the records end before the offsets.
+        """
+        values = list(islice(self.records, count))
+        if len(values) != count:
+            raise IndexError("The records end before the offsets")
+        return values
+
+    def read_source(self, data: memoryview) -> None:
+        """Restore the source text of the spans from the first records and the encoded source text after the records.
+
+        The source components are built from the later records, even if none of them has a span.
+
+        Args:
+            data (memoryview): The data after the records.
+
+        Raises:
+            ValueError: If the records of the source text are corrupt, or the encoded source text is truncated or
+                followed by other bytes.
+        """
+        try:
+            encoding, text = self.string_list(2)
+            size, newline = self.offsets(2)
+            windows = self.offsets(self.next_record())
+            starts = array("Q", self.offsets(self.next_record()))
+        except (StopIteration, IndexError) as e:
+            raise ValueError("The binary Gherkin data is corrupt") from e
+        if len(data) < size:
+            raise ValueError("The binary Gherkin data is truncated")
+        if len(data) > size:
+            raise ValueError("The binary Gherkin data has bytes after its source text")
+        self.spans = True
+        if text is None and encoding is None:
+            return
+        self.source = SourceBuffer.__new__(SourceBuffer)
+        self.source.__setstate__((data.tobytes() if text is None else text, encoding, starts, windows, newline))
+
+    def text(self) -> Any:
+        """Return the text, or the span of the source text, of the next records.
+
+        Returns:
+            Any: The text, its span, or None.
+
+        Raises:
+            IndexError: If the records have a span without a source text.
+        """
+        record = self.next_record()
+        if record & 1:
+            if self.source is None:
+                raise IndexError("The records have a span without a source text")
+            return Span(self.source, tuple(self.offsets(record >> 1)))
+        return self.strings[record >> 1]
+
+    def texts(self, component: Any, *names: str) -> Any:
+        """Set the text attributes and the span of a source component from the next records.
+
+        Args:
+            component (Any): The source component.
+            *names (str): The names of the text attributes.
+
+        Returns:
+            Any: The source component.
+        """
+        for name in names:
+            setattr(component, name, self.text())
+        component.span = self.text()
+        return component
+
+    def decode(self) -> Gherkin:
+        """Build the Gherkin object from the records.
+
+        Returns:
+            Gherkin: The decoded Gherkin object.
+
+        Raises:
+            ValueError: If the records end before the Gherkin object is complete, or continue after it.
+        """
+        try:
+            gherkin = Gherkin()
+            gherkin.file = self.string()
+            if not self.spans:
+                gherkin.feature = Feature.from_dictionary({"name": self.string(), "description": self.string()})
+                gherkin.rule = Rule.from_dictionary({"name": self.string(), "description": self.string()})
+                gherkin.background = Background()
+                gherkin.background.description = self.string()
+            else:
+                gherkin.feature = self.texts(SourceFeature(), "name", "description")
+                gherkin.rule = self.texts(SourceRule(), "name", "description")
+                gherkin.background = self.texts(SourceBackground(), "description")
+            gherkin.background.steps = self.steps()
+            gherkin.scenarios = [self.scenario() for _ in range(self.next_record())]
+        except (StopIteration, IndexError, TypeError, ValueError) as e:
+            raise ValueError("The binary Gherkin data is corrupt") from e
+        if next(self.records, None) is not None:
+            raise ValueError("The binary Gherkin data has records after the Gherkin object")
+        return gherkin
+
+    def scenario(self) -> Scenario:
+        """Build the next scenario from the records.
+
+        Returns:
+            Scenario: The decoded scenario.
+        """
+        scenario = SourceScenario() if self.spans else Scenario()
+        tag_count = self.next_record()
+        scenario.tags = None if tag_count == 0 else self.string_list(tag_count - 1)
+        if not self.spans:
+            scenario.name, scenario.description = self.string_list(2)
+        else:
+            self.texts(scenario, "name", "description")
+        scenario.steps = self.steps() or []
+        scenario.outline = self.table()
+        return scenario
+
+    def steps(self) -> Optional[List[Step]]:
+        """Build the next optional list of steps from the records.
+
+        Returns:
+            Optional[List[Step]]: The decoded steps, or None.
+        """
+        step_count = self.next_record()
+        if step_count == 0:
+            return None
+        steps: List[Step] = []
+        string_at = self.strings.__getitem__
+        for _ in range(step_count - 1):
+            if not self.spans:
+                step = Step()
+                step_type, step.text, step.doc_string = map(string_at, islice(self.records, 3))
+            else:
+                step = SourceStep()
+                step_type = self.string()
+                self.texts(step, "text", "doc_string")
+            step.type = intern(step_type)
+            step.table = self.table()
+            steps.append(step)
+        return steps
+
+    def table(self) -> Optional[Table]:
+        """Build the next optional table from the records.
+
+        Returns:
+            Optional[Table]: The decoded table, or None.
+        """
+        header_count = self.next_record()
+        if header_count == 0:
+            return None
+        buffer = self.string()
+        columns: Dict[str, List[int]] = {}
+        header_line: List[str] = []
+        for _ in range(header_count - 1):
+            header = self.string()
+            columns.setdefault(header, self.offsets(self.next_record()))
+            header_line.append(header)
+        return Table.from_offsets(buffer, columns, header_line)
@@ -0,0 +1,278 @@
+"""Provide functions for running the commands of the command-line interface on input files.
+
+The input files are processed and saved by 'process_file', either in the command-line process, in its worker processes,
+or in the parse daemon, while the results are reported by the command-line process, which writes the standard output
+and asks for the confirmations. The paths are resolved against the 'cwd' argument if it is set, so the daemon can run
+the commands of clients in other working directories.
+"""
+
+import sys
+from argparse import Namespace
+from base64 import b64decode, b64encode
+from dataclasses import dataclass, field
+from functools import partial
+from glob import escape, glob
+from os import cpu_count
+from os.path import abspath, basename, dirname, isdir, join, splitext
+from typing import (TYPE_CHECKING, Any, Dict, Iterator, List, Mapping,
+                    Optional, Tuple)
+
+from gherkin_processor.gherkin import Gherkin
+from gherkin_processor.private.binary import decode_gherkin, encode_gherkin
+from gherkin_processor.utils import load, save
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+    from gherkin_processor.cache import ParseCache
+
+FEATURE_PATTERN = join("**", "*.feature")
+GLOB_CHARACTERS = "*?["
+CHUNKS_PER_JOB = 4
+
+
+@dataclass(slots=True)
+class FileResult:
+    """Represent the result of processing one input file.
+
+    The file is processed and saved by a worker, while the output is written, and the confirmations are requested by
+    the main process, in the order of the reports.
+
+    Attributes:
+        path (str): The path of the input file.
+        output (str): The Gherkin syntax to write to the standard output, or an empty string.
+        gherkin (Gherkin | None): The Gherkin object to write to the standard output instead of the output string, if
+            the file is reported by the process which processed it, or None.
+        error (str | None): The message of the error, or None if the file was processed.
+        existing (List[Tuple[str, str]]): The paths and formats of the outputs which already exist, and are waiting for
+            confirmation.
+        data (bytes): The binary representation of the Gherkin object if any output is waiting for confirmation, or an
+            empty bytes object.
+
+    Methods:
+        to_dictionary() -> Dict[str, Any]:
+            Convert the FileResult object to a dictionary representation, which can be serialized into JSON.
+        from_dictionary(result: Mapping[str, Any]) -> FileResult:
+            Create a FileResult object from the dictionary representation.
+    """
+
+    path: str
+    output: str = ""
+    error: str | None = None
+    existing: List[Tuple[str, str]] = field(default_factory=list)
+    data: bytes = b""
+    gherkin: Gherkin | None = field(default=None, repr=False, compare=False)
+
+    def to_dictionary(self) -> Dict[str, Any]:
+        """Convert the FileResult object to a dictionary representation, which can be serialized into JSON.
+
+        Returns:
+            Dict[str, Any]: The dictionary representation of the FileResult object, with the data in Base64, and with
+                the output string built from the Gherkin object, if any.
+        """
+        return {
+            "path": self.path,
+            "output": self.output if self.gherkin is None else self.gherkin.to_string(),
+            "error": self.error,
+            "existing": self.existing,
+            "data": b64encode(self.data).decode("ascii")
+        }
+
+    @classmethod
+    def from_dictionary(cls, result: Mapping[str, Any]) -> "FileResult":
+        """Create a FileResult object from the dictionary representation.
+
+        Args:
+            result (Mapping[str, Any]): The dictionary representation of the result.
+
+        Returns:
+            FileResult: The FileResult object with the same values.
+
+        Raises:
+            KeyError: If a value is missing from the dictionary representation.
+        """
+        existing = [(item[0], item[1]) for item in result["existing"]]
+        return cls(result["path"], result["output"], result["error"], existing, b64decode(result["data"]))
+
+
+def resolve_path(args: Namespace, path: str) -> str:
+    """Resolve a path against the working directory of the command.
+
+    Args:
+        args (Namespace): The command-line arguments.
+        path (str): The path, as it was given to the command.
+
+    Returns:
+        str: The path joined to the 'cwd' argument, or the path itself if the argument is not set.
+    """
+    return path if args.cwd is None else join(args.cwd, path)
+
+
+def expand_inputs(patterns: List[str], cwd: Optional[str] = None) -> List[str]:
+    """Expand the input arguments into the paths of the input files.
+
+    The directories are searched recursively for ".feature" files, and the glob patterns are expanded, both in sorted
+    order, while the other arguments are kept as they are. The repeated paths are kept only once.
+
+    Args:
+        patterns (List[str]): The input file paths, directories, or glob patterns.
+        cwd (Optional[str]): The directory to resolve the relative arguments against, or None for the current one.
+
+    Returns:
+        List[str]: The paths of the input files, in the order of the arguments, relative to the same directory as the
+            arguments.
+
+    Raises:
+        ValueError: If a directory or a glob pattern does not match any file.
+    """
+    paths: Dict[str, None] = {}
+    for pattern in patterns:
+        if isdir(join(cwd or "", pattern)):
+            matches = sorted(glob(join(escape(pattern), FEATURE_PATTERN), root_dir=cwd, recursive=True))
+        elif any(character in pattern for character in GLOB_CHARACTERS):
+            matches = sorted(path for path in glob(pattern, root_dir=cwd, recursive=True) if not isdir(join(cwd or "", path)))
+        else:
+            matches = [pattern]
+        if not matches:
+            raise ValueError(f"No input files match '{pattern}'")
+        paths.update(dict.fromkeys(matches))
+    return list(paths)
+
+
+def output_path(args: Namespace, input_path: str, mode: str) -> str:
+    """Return the output path of an input file.
+
+    Args:
+        args (Namespace): The command-line arguments.
+        input_path (str): The path of the input file.
+        mode (str): The format of the output ("GHERKIN" or "JSON").
+
+    Returns:
+        str: The output path, with the variables of the output argument replaced.
+    """
+    path = abspath(resolve_path(args, input_path))
+    directory = dirname(path)
+    filename, extension = splitext(basename(path))
+    extension = extension.removeprefix(".")
+    output = input_path if args.output is None else args.output
+    output = output.replace("<DIR>", directory).replace("<DIRECTORY>", directory)
+    output = output.replace("<NAME>", filename).replace("<FILENAME>", filename)
+
+    if mode == "JSON":
+        return resolve_path(args, output.replace(extension, "json").replace("<EXT>", "json").replace("<EXTENSION>", "json"))
+    return resolve_path(args, output.replace("<EXT>", extension).replace("<EXTENSION>", extension))
+
+
+def process_file(args: Namespace, input_path: str, cache: Optional["ParseCache"] = None) -> FileResult:
+    """Process and save one input file.
+
+    The outputs which already exist are only replaced if every user input request is confirmed automatically,
+    otherwise they are left for the confirmation of the main process. The Gherkin object is kept in the result for the
+    standard output, so it can be written in chunks, without building the whole Gherkin syntax as one string.
+
+    Args:
+        args (Namespace): The command-line arguments.
+        input_path (str): The path of the input file.
+        cache (Optional[ParseCache]): The cache of the processed Gherkin objects, or None to always process the file.
+
+    Returns:
+        FileResult: The result of processing the file.
+    """
+    result = FileResult(input_path)
+    try:
+        processed = load(resolve_path(args, input_path), args.validate, cache=cache, cache_dir=args.cache_dir)
+        gherkin = Gherkin() if processed is None else processed
+        for mode in [mode for mode, enabled in (("GHERKIN", args.save), ("JSON", args.json)) if enabled]:
+            if not save(gherkin, output_path(args, input_path, mode), mode, args.yes):
+                result.existing.append((output_path(args, input_path, mode), mode))
+    except (IOError, TypeError, ValueError) as e:
+        result.error = str(e)
+        return result
+    if result.existing:
+        result.data = encode_gherkin(gherkin)
+    if args.print:
+        result.gherkin = gherkin
+    return result
+
+
+def process_files(args: Namespace, input_paths: List[str]) -> List[FileResult]:
+    """Process and save a chunk of input files.
+
+    The results are sent back from a worker process, so their Gherkin syntax is built as the output string.
+
+    Args:
+        args (Namespace): The command-line arguments.
+        input_paths (List[str]): The paths of the input files.
+
+    Returns:
+        List[FileResult]: The results of processing the files, in the order of the paths.
+    """
+    results = [process_file(args, input_path) for input_path in input_paths]
+    for result in results:
+        if result.gherkin is not None:
+            result.output, result.gherkin = result.gherkin.to_string(), None
+    return results
+
+
+def iter_results(args: Namespace, input_paths: List[str], cache: Optional["ParseCache"] = None) -> Iterator[FileResult]:
+    """Process the input files, and yield their results.
+
+    With more than one job, the files are split into chunks, which are processed in a pool of worker processes, and
+    the results are yielded in the order of the paths, or in the order of completion if the order is not kept.
+
+    Args:
+        args (Namespace): The command-line arguments.
+        input_paths (List[str]): The paths of the input files.
+        cache (Optional[ParseCache]): The cache of the processed Gherkin objects for a single job, or None.
+
+    Yields:
+        FileResult: The result of processing the next file.
+
+    Raises:
+        ValueError: If a worker process is terminated abruptly.
+    """
+    jobs = min(args.jobs or cpu_count() or 1, len(input_paths))
+    if jobs <= 1:
+        yield from map(partial(process_file, args, cache=cache), input_paths)
+        return
+    # pylint: disable-next=import-outside-toplevel
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    # pylint: disable-next=import-outside-toplevel
+    from concurrent.futures.process import BrokenProcessPool
+    size = -(-len(input_paths) // (jobs * CHUNKS_PER_JOB))
+    chunks = [input_paths[start:start + size] for start in range(0, len(input_paths), size)]
+    with ProcessPoolExecutor(jobs) as executor:
+        futures: List["Future[List[FileResult]]"] = [executor.submit(process_files, args, chunk) for chunk in chunks]
+        try:
+            for future in as_completed(futures) if args.unordered else futures:
+                yield from future.result()
+        except BrokenProcessPool as e:
+            raise ValueError(f"Worker process failed: {e}") from e
+
+
+def report(args: Namespace, result: FileResult) -> bool:
+    """Report the result of processing an input file.
+
+    The error of the file is written to the standard error, the outputs which already exist are replaced after
+    confirmation, and the Gherkin syntax is written to the standard output.
+
+    Args:
+        args (Namespace): The command-line arguments.
+        result (FileResult): The result of processing the file.
+
+    Returns:
+        bool: True if the file was processed successfully, False otherwise.
+    """
+    if result.error is not None:
+        print(f"{result.path}: {result.error}", file=sys.stderr)
+        return False
+    for output, mode in result.existing:
+        if input(f"File '{output}' already exists. Would you like to replace it? [y/n] ").upper() in ["Y", "YES"]:
+            save(decode_gherkin(result.data), output, mode, True)
+    if args.print:
+        if result.gherkin is None:
+            sys.stdout.write(result.output)
+        else:
+            result.gherkin.write_to(sys.stdout)
+        print()
+    return True
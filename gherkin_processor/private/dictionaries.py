@@ -0,0 +1,19 @@
+"""Provide utility functions for reading the dictionary representations of the Gherkin components.
+
+The nested components are dictionaries in the JSON output and in 'dataclasses.asdict', but component objects in the
+output of the 'to_dictionary' methods, so both forms are read the same way.
+"""
+
+from typing import Any, Mapping
+
+
+def as_mapping(component: Any) -> Mapping[str, Any]:
+    """Return the dictionary representation of a nested component.
+
+    Args:
+        component (Any): The dictionary representation of the component, or the component object itself.
+
+    Returns:
+        Mapping[str, Any]: The dictionary representation, or the one of the 'to_dictionary' method of the component.
+    """
+    return component if isinstance(component, Mapping) else component.to_dictionary()
@@ -3,37 +3,85 @@
 This module includes functions to format Gherkin components, such as tables, into string representations.
 """
 
-from typing import Dict, List
+from itertools import repeat
+from typing import Iterable, Iterator, List, Mapping, TextIO
 
+TABLE_CELL_ESCAPES = str.maketrans({"\\": "\\\\", "|": "\\|", "\n": "\\n"})
 
-def format_table(table: Dict[str, List[str]]) -> str:
+
+def format_table(table: Mapping[str, List[str]]) -> str:
     """Format a dictionary representing a table into a string.
 
     Args:
-        table (Dict[str, List[str]]): A dictionary where keys are column headers and values are lists of column values.
+        table (Mapping[str, List[str]]): A mapping where keys are column headers and values are lists of column values.
+
+    Returns:
+        str: A formatted string representation of the table, with the pipes, backslashes, and new lines of the cells escaped.
+    """
+    return "\n".join(iter_table_lines(table))
+
+
+def iter_table_lines(table: Mapping[str, List[str]]) -> Iterator[str]:
+    """Format a dictionary representing a table, and yield its lines one by one.
+
+    The widths of the columns are computed once, every column is padded to its width at once, and the lines are joined
+    from the padded cells of the rows, so no line is built by repeated concatenation.
+
+    Args:
+        table (Mapping[str, List[str]]): A mapping where keys are column headers and values are lists of column values.
+
+    Yields:
+        str: The next line of the formatted table, without a line break, starting with the header line.
+    """
+    columns: List[List[str]] = [[header, *column] for header, column in zip(escape_cells(table.keys()), map(escape_cells, table.values()))]
+    if not columns:
+        yield "|"
+        return
+    height = max(map(len, columns))
+    for column in columns:
+        width = max(map(len, column))
+        column[:] = map(str.ljust, column, repeat(width))
+        column.extend(repeat(" " * width, height - len(column)))
+    for cells in zip(*columns):
+        yield f"| {' | '.join(cells)} |"
+
+
+def iter_table_chunks(table: Mapping[str, List[str]]) -> Iterator[str]:
+    """Format a dictionary representing a table, and yield the chunks of the same string as the one of 'format_table'.
+
+    Args:
+        table (Mapping[str, List[str]]): A mapping where keys are column headers and values are lists of column values.
+
+    Yields:
+        str: The next line of the formatted table, with a line break before every line except the first one.
+    """
+    separator = ""
+    for line in iter_table_lines(table):
+        yield separator + line
+        separator = "\n"
+
+
+def write_table(table: Mapping[str, List[str]], file: TextIO) -> None:
+    """Format a dictionary representing a table, and write it to a file line by line.
+
+    Args:
+        table (Mapping[str, List[str]]): A mapping where keys are column headers and values are lists of column values.
+        file (TextIO): The text file or stream to write to, which gets the same string as the one of 'format_table'.
+    """
+    file.writelines(iter_table_chunks(table))
+
+
+def escape_cells(cells: Iterable[str]) -> List[str]:
+    """Escape the pipes, backslashes, and new lines of table cells.
+
+    Args:
+        cells (Iterable[str]): The unescaped cell values.
 
     Returns:
-        str: A formatted string representation of the table.
+        List[str]: The escaped cell values, in the order of the given cells.
     """
-    headers: List[str] = list(table.keys())
-    values: List[List[str]] = list(table.values())
-
-    max_column_width: List[int] = [max(len(headers[i]), *(len(row) for row in values[i])) for i in range(len(headers))]
-    max_row_length: int = max(map(len, values)) if values else 0
-    lines = []
-
-    formatted_line: str = "|"
-    for i, header in enumerate(headers):
-        formatted_line += f" {header}{' ' * (max_column_width[i] - len(header))} |"
-    lines.append(formatted_line)
-
-    for i in range(max_row_length):
-        formatted_line = "|"
-        for j, value in enumerate(values):
-            if len(value) > i:
-                formatted_line += f" {value[i]}{' ' * (max_column_width[j] - len(value[i]))} |"
-            else:
-                formatted_line += f" {' ' * max_column_width[j]} |"
-        lines.append(formatted_line)
-
-    return "\n".join(lines)
+    cells = list(cells)
+    joined = "".join(cells)
+    if "\\" in joined or "|" in joined or "\n" in joined:
+        return [cell.translate(TABLE_CELL_ESCAPES) for cell in cells]
+    return cells
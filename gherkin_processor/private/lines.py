@@ -0,0 +1,101 @@
+"""Provide utility functions for classifying the lines of Gherkin text.
+
+Every line is classified once by the keyword it starts with, and the components read the stored kind codes instead of
+repeating the string tests on the same line.
+"""
+
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+BLANK, DESCRIPTION, FEATURE, RULE, BACKGROUND, TAG, SCENARIO, EXAMPLES = range(8)
+GIVEN, WHEN, THEN, BUT, AND, TABLE, QUOTE_FENCE, BACKQUOTE_FENCE = range(8, 16)
+
+SYMBOL_KEYWORDS: Dict[str, int] = {"|": TABLE, "@": TAG, '"""': QUOTE_FENCE, "```": BACKQUOTE_FENCE}
+STEP_KEYWORDS: Dict[str, int] = {"Given": GIVEN, "When": WHEN, "Then": THEN, "But": BUT, "And": AND, "*": AND}
+COLON_KEYWORDS: Dict[str, int] = {
+    "Feature": FEATURE,
+    "Rule": RULE,
+    "Background": BACKGROUND,
+    "Scenario": SCENARIO,
+    "Example": SCENARIO,
+    "Scenario Outline": SCENARIO,
+    "Scenario Template": SCENARIO,
+    "Example Outline": SCENARIO,
+    "Example Template": SCENARIO,
+    "Scenarios": EXAMPLES,
+    "Examples": EXAMPLES
+}
+KEYWORD_STATUSES: Dict[int, str] = {
+    FEATURE: "FEATURE",
+    RULE: "RULE",
+    BACKGROUND: "BACKGROUND",
+    TAG: "TAG",
+    SCENARIO: "SCENARIO",
+    GIVEN: "GIVEN",
+    WHEN: "WHEN",
+    THEN: "THEN",
+    BUT: "BUT"
+}
+
+Source = Tuple[List[str], Sequence[int], int]
+
+
+def classify_line(stripped_line: str) -> int:
+    """Classify a stripped line by the Gherkin keyword it starts with.
+
+    Args:
+        stripped_line (str): The line without leading and trailing whitespace.
+
+    Returns:
+        int: The kind code of the line.
+    """
+    if not stripped_line:
+        return BLANK
+    symbol = SYMBOL_KEYWORDS.get(stripped_line[:3], SYMBOL_KEYWORDS.get(stripped_line[0]))
+    if symbol is not None:
+        return symbol
+    word, separator, _ = stripped_line.partition(" ")
+    if separator and word in STEP_KEYWORDS:
+        return STEP_KEYWORDS[word]
+    keyword, separator, _ = stripped_line.partition(":")
+    return COLON_KEYWORDS.get(keyword, DESCRIPTION) if separator else DESCRIPTION
+
+
+def classify_lines(lines: Iterable[str]) -> "array[int]":
+    """Classify every line of a text into an array of kind codes.
+
+    Args:
+        lines (Iterable[str]): The lines of the text.
+
+    Returns:
+        array[int]: The kind codes of the lines, in the order of the lines.
+    """
+    return array("B", [classify_line(line.strip()) for line in lines])
+
+
+def split_lines(text: str, kinds: Optional[Sequence[int]]) -> Tuple[List[str], Sequence[int]]:
+    """Split a text into lines, and classify them unless their kind codes are already known.
+
+    Args:
+        text (str): The text to be split.
+        kinds (Sequence[int] | None): The kind codes of the text lines, if they are already known.
+
+    Returns:
+        Tuple[List[str], Sequence[int]]: The lines of the text, and their kind codes.
+    """
+    lines = text.splitlines()
+    return lines, classify_lines(lines) if kinds is None else kinds
+
+
+def iter_lines(chunks: Iterable[str]) -> Iterator[str]:
+    """Split the chunks of a text into lines lazily, the same way as splitting the whole text.
+
+    Args:
+        chunks (Iterable[str]): The chunks of the text, each ending with a line break except the last one, like the
+            lines of an open file.
+
+    Yields:
+        str: The next line of the text, without its line break.
+    """
+    for chunk in chunks:
+        yield from chunk.splitlines()
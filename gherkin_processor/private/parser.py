@@ -0,0 +1,791 @@
+"""Provide the single-pass parser engine for Gherkin text.
+
+The parser walks the source lines exactly once and builds the Gherkin components directly. It runs the same position
+checks as the component-based reference engine, and reports the errors in the same order with the same messages. Without
+a Gherkin object, the parser only runs the checks, and builds no components at all. Every issue is also recorded as a
+diagnostic, so without raising the errors, the parser collects all issues of the text in one pass.
+"""
+
+from operator import attrgetter
+from sys import intern
+from typing import (TYPE_CHECKING, Any, Dict, Iterable, Iterator, List,
+                    Optional, Tuple, Union)
+from weakref import proxy
+
+from gherkin_processor.components.background import Background
+from gherkin_processor.components.diagnostic import Diagnostic
+from gherkin_processor.components.feature import Feature
+from gherkin_processor.components.rule import Rule
+from gherkin_processor.components.scenario import Scenario
+from gherkin_processor.components.source import (SourceBuffer, SourceScenario,
+                                                 SourceStep, Span, span_of)
+from gherkin_processor.components.step import Step
+from gherkin_processor.components.table import Table
+from gherkin_processor.private.lines import (AND, BACKGROUND, BACKQUOTE_FENCE,
+                                             BLANK, BUT, DESCRIPTION, EXAMPLES,
+                                             FEATURE, GIVEN, KEYWORD_STATUSES,
+                                             QUOTE_FENCE, RULE, SCENARIO,
+                                             TABLE, TAG, THEN, WHEN,
+                                             classify_line)
+from gherkin_processor.private.positions import (
+    ALLOWED_BACKGROUND_TRANSITIONS, ALLOWED_SCENARIO_TRANSITIONS,
+    ALLOWED_TRANSITIONS, BACKGROUND_DESCRIPTION, BEGINNING, NO_STEP, OUTLINE,
+    SCENARIO_DESCRIPTION, STATUSES, allowed_statuses, doc_string_status,
+    position_error, step_status, table_status)
+from gherkin_processor.private.tables import split_table_row
+
+if TYPE_CHECKING:
+    from gherkin_processor.gherkin import Gherkin
+
+NO_DOC_STRING, DOC_STRING_OPEN, DOC_STRING_CONTENT, DOC_STRING_CLOSE = range(4)
+GHERKIN_LEVEL, COMPONENT_LEVEL, STEP_LEVEL = range(3)
+
+Line = Tuple[int, str, int, int]
+
+
+def diagnose(line: Line, keyword: str, message: str, expected: Optional[List[str]] = None) -> Diagnostic:
+    """Create the diagnostic of an issue on a line.
+
+    Args:
+        line (Line): The line of the issue.
+        keyword (str): The status of the line, or the keyword the issue is about.
+        message (str): The message of the issue.
+        expected (Optional[List[str]]): The statuses the keyword is allowed after, for the position issues.
+
+    Returns:
+        Diagnostic: The diagnostic of the issue.
+    """
+    text = line[1]
+    return Diagnostic(line[0], len(text) - len(text.lstrip()) + 1, keyword, expected or [], message)
+
+
+class Parser:
+    """Parse Gherkin text in a single pass into an existing Gherkin object.
+
+    Attributes:
+        gherkin (Gherkin | None): The Gherkin object receiving the parsed components, or None to only check the syntax.
+        validate (bool): Whether to raise an error on the first syntax issue.
+        source (SourceBuffer | None): The source text of the lines in the span mode, or None to copy the texts.
+        valid (bool): Whether the text parsed so far has valid syntax.
+        diagnostics (List[Diagnostic]): The issues of the text parsed so far, in the order of the lines once it is parsed.
+
+    Methods:
+        parse(lines: Iterable[str]) -> bool:
+            Parse the lines and return whether their syntax is valid.
+        iter_scenarios(lines: Iterable[str]) -> Iterator[Scenario]:
+            Parse the lines, and yield every scenario once all of its lines are parsed.
+        check(transitions: Dict[int, int], keyword: int, status: int, line: Line) -> bool:
+            Validate the position of a keyword and report the issue if it is not allowed.
+        report(issue: Diagnostic, level: int) -> None:
+            Report a syntax issue on the given level.
+        end_step() -> None:
+            Hand over the held back step issue to the component level.
+        place(component: Any, name: str, line: Line, value: str) -> None:
+            Replace a text of a source component with its span, in the span mode.
+        locate(component: Any, first: Line, last: Line) -> None:
+            Set the span of a source component from its first to its last line, in the span mode.
+    """
+
+    source: Optional[SourceBuffer] = None
+
+    def __init__(self, gherkin: Optional["Gherkin"], validate: bool) -> None:
+        """Initialize the Parser object.
+
+        Args:
+            gherkin (Gherkin | None): The Gherkin object receiving the parsed components, or None to only check the syntax.
+            validate (bool): Whether to raise an error on the first syntax issue.
+        """
+        self.gherkin = gherkin
+        self.validate = validate
+        self.diagnostics: List[Diagnostic] = []
+        self._issues: List[Optional[str]] = [None, None, None]
+        self._status = _GherkinStatus(self)
+        self._component: Optional[_ComponentParser] = None
+        self._pending: List[Line] = []
+
+    @property
+    def valid(self) -> bool:
+        """Return whether the text parsed so far has valid syntax."""
+        return self._status.valid
+
+    def parse(self, lines: Iterable[str]) -> bool:
+        """Parse the lines and return whether their syntax is valid.
+
+        Args:
+            lines (Iterable[str]): The lines of the Gherkin text.
+
+        Returns:
+            bool: True if the syntax is valid, False otherwise.
+
+        Raises:
+            ValueError: If validation fails for the Gherkin syntax.
+        """
+        for _ in self.iter_scenarios(lines):
+            pass
+        # The lines outside of the components are checked when the next component begins, so their issues are found later.
+        self.diagnostics.sort(key=attrgetter("line"))
+        return self.valid
+
+    def iter_scenarios(self, lines: Iterable[str]) -> Iterator[Scenario]:
+        """Parse the lines, and yield every scenario once all of its lines are parsed.
+
+        The lines are consumed one by one, so they can be read lazily from a file. The yielded scenarios are also added
+        to the scenarios of the Gherkin object, and the caller can remove them to keep only the current one in memory.
+
+        Args:
+            lines (Iterable[str]): The lines of the Gherkin text.
+
+        Yields:
+            Scenario: The next completely parsed scenario, unless the parser only checks the syntax.
+
+        Raises:
+            ValueError: If validation fails for the Gherkin syntax.
+        """
+        for num, text in enumerate(lines, 1):
+            kind = classify_line(text.strip())
+            line = (num, text, kind, self._status.handle_docstring(kind))
+            if self._status.feed(line):
+                yield from self._close_component()
+            if self._component is None:
+                self._open_component(self._status.group)
+            if self._component is None:
+                self._pending.append(line)
+            else:
+                self._component.feed(line)
+        # Trailing tags without a scenario keyword still make a scenario, while lines before any component are dropped.
+        if self._component is None and self._status.group == TAG:
+            self._open_component(SCENARIO)
+        yield from self._close_component()
+
+    def check(self, transitions: Dict[int, int], keyword: int, status: int, line: Line) -> bool:
+        """Validate the position of a keyword and report the issue if it is not allowed.
+
+        The issue is reported on the file level for the file transitions, and on the component level otherwise.
+
+        Args:
+            transitions (Dict[int, int]): The transition table of the checked component.
+            keyword (int): The status code of the current line.
+            status (int): The status code before the current line.
+            line (Line): The current line.
+
+        Returns:
+            bool: True if the keyword is allowed after the status, False otherwise.
+        """
+        error = position_error(transitions, keyword, status)
+        if error is None:
+            return True
+        num, text, _, _ = line
+        issue = diagnose(line, STATUSES[keyword], f"{error} at line [{num}]: {text}", allowed_statuses(transitions, keyword))
+        self.report(issue, GHERKIN_LEVEL if transitions is ALLOWED_TRANSITIONS else COMPONENT_LEVEL)
+        return False
+
+    def report(self, issue: Diagnostic, level: int) -> None:
+        """Report a syntax issue on the given level.
+
+        Issues of the file are raised immediately, while the issues of a component or a step are held back until the
+        component or the step ends, the same way the reference engine processes them. Every issue is recorded in the
+        diagnostics as soon as it is found.
+
+        Args:
+            issue (Diagnostic): The diagnostic of the issue.
+            level (int): The level the issue is reported on.
+
+        Raises:
+            ValueError: If validation is enabled and the issue is on the file level.
+        """
+        self.diagnostics.append(issue)
+        if self.validate and level == GHERKIN_LEVEL:
+            raise ValueError(issue.message)
+        if self._issues[level] is None:
+            self._issues[level] = issue.message
+
+    def end_step(self) -> None:
+        """Hand over the held back step issue to the component level."""
+        if self._issues[COMPONENT_LEVEL] is None:
+            self._issues[COMPONENT_LEVEL] = self._issues[STEP_LEVEL]
+        self._issues[STEP_LEVEL] = None
+
+    def place(self, component: Any, name: str, line: Line, value: str) -> None:
+        """Replace a text of a source component with its span, in the span mode.
+
+        Args:
+            component (Any): The source component.
+            name (str): The name of the text attribute.
+            line (Line): The line of the text.
+            value (str): The text, which ends where the stripped line ends.
+        """
+        if self.source is not None:
+            num, text, _, _ = line
+            end = self.source.line_start(num) + self.source.measure(text.rstrip())
+            setattr(component, name, self.source.span(end - self.source.measure(value), end))
+
+    def locate(self, component: Any, first: Line, last: Line) -> None:
+        """Set the span of a source component from its first to its last line, in the span mode.
+
+        Args:
+            component (Any): The source component.
+            first (Line): The first line of the component.
+            last (Line): The last line of the component.
+        """
+        if self.source is not None:
+            component.span = self.source.span(self.source.line_start(first[0]), self.source.line_start(last[0]) + self.source.measure(last[1]))
+
+    def _open_component(self, group: int) -> None:
+        component: _ComponentParser
+        match STATUSES[group]:
+            case "FEATURE" | "RULE":
+                component = _FeatureParser(self, group)
+            case "BACKGROUND":
+                component = _BackgroundParser(self)
+            case "SCENARIO":
+                component = _ScenarioParser(self)
+            case _:
+                return
+        for line in self._pending:
+            component.feed(line)
+        self._pending.clear()
+        self._component = component
+
+    def _close_component(self) -> Iterator[Scenario]:
+        component, self._component = self._component, None
+        if component is None:
+            return
+        self._status.valid &= component.close()
+        issue, self._issues[COMPONENT_LEVEL] = self._issues[COMPONENT_LEVEL], None
+        if self.validate and issue is not None:
+            raise ValueError(issue)
+        if isinstance(component, _ScenarioParser) and component.component is not None:
+            yield component.component
+
+
+class SpanParser(Parser):
+    """Parse the lines of a source text into source components, which keep the spans of their texts in the source.
+
+    The parsed lines must be the lines of the source, and the feature, rule, and background of the Gherkin object must
+    be source components, while the scenarios and the steps are created as source components by the parser.
+
+    Methods:
+        parse_source() -> bool:
+            Parse the lines of the source and return whether their syntax is valid.
+    """
+
+    def __init__(self, gherkin: "Gherkin", validate: bool, source: SourceBuffer) -> None:
+        """Initialize the SpanParser object.
+
+        Args:
+            gherkin (Gherkin): The Gherkin object receiving the parsed components.
+            validate (bool): Whether to raise an error on the first syntax issue.
+            source (SourceBuffer): The source text of the parsed lines.
+        """
+        super().__init__(gherkin, validate)
+        self.source: SourceBuffer = source
+
+    def parse_source(self) -> bool:
+        """Parse the lines of the source and return whether their syntax is valid.
+
+        Returns:
+            bool: True if the syntax is valid, False otherwise.
+
+        Raises:
+            ValueError: If validation fails for the Gherkin syntax.
+        """
+        return self.parse(self.source.lines())
+
+
+class ValidationParser(Parser):
+    """Check the syntax of Gherkin text in a single pass, without building any components.
+
+    The checks, the verdicts, and the messages are the same as the ones of the other engines, but the parser keeps only
+    the statuses, and the headers of the current table, so the memory usage does not grow with the text.
+    """
+
+    def __init__(self, validate: bool) -> None:
+        """Initialize the ValidationParser object.
+
+        Args:
+            validate (bool): Whether to raise an error on the first syntax issue.
+        """
+        super().__init__(None, validate)
+
+
+class _GherkinStatus:
+    """Track the file level status, and find the lines where the current component ends."""
+
+    def __init__(self, parser: Parser) -> None:
+        # The parser owns the status, so a weak reference back keeps them out of a reference cycle, and the parsed
+        # components, with the source of the span mode, are freed together with the parser.
+        self.parser: Parser = proxy(parser)
+        self.status: int = BEGINNING
+        self.step: int = NO_STEP
+        self.group: int = BEGINNING
+        self.fence = BLANK
+        self.valid = True
+        self.scenario_lines = (0, 0)
+
+    def handle_docstring(self, kind: int) -> int:
+        """Return the doc-string role of the line with the given kind."""
+        if self.fence != BLANK:
+            if kind == self.fence:
+                self.fence = BLANK
+                return DOC_STRING_CLOSE
+            return DOC_STRING_CONTENT
+        if kind in (QUOTE_FENCE, BACKQUOTE_FENCE):
+            self.fence = kind
+            return DOC_STRING_OPEN
+        return NO_DOC_STRING
+
+    def feed(self, line: Line) -> bool:
+        """Update the status with the line, and return whether the current component ends before the line."""
+        num, _, kind, doc_string = line
+        ends = False
+        if doc_string == DOC_STRING_OPEN:
+            self.check(doc_string_status(self.status), line)
+        if doc_string == NO_DOC_STRING:
+            self._handle_status(line)
+            ends = self._handle_group(num)
+        # The scenario lines of the current component, also the ones in doc-strings, are kept for the scenario check.
+        if ends:
+            self.scenario_lines = (0, 0)
+        if kind == SCENARIO:
+            self.scenario_lines = (self.scenario_lines[1], num)
+        return ends
+
+    def check(self, keyword: int, line: Line) -> None:
+        """Validate the position of the keyword after the current status."""
+        self.valid &= self.parser.check(ALLOWED_TRANSITIONS, keyword, self.status, line)
+        self.status = keyword
+
+    def _handle_status(self, line: Line) -> None:
+        kind = line[2]
+        if kind == AND:
+            self.valid &= self.parser.check(ALLOWED_TRANSITIONS, self.step, self.status, line)
+            self.status = step_status(self.status)
+        elif kind == TABLE:
+            self.status = table_status(self.status)
+            self.check(self.status, line)
+        elif kind == EXAMPLES:
+            self.status = OUTLINE
+        elif kind in KEYWORD_STATUSES:
+            self.check(kind, line)
+            if kind == SCENARIO:
+                self.step = GIVEN
+            elif GIVEN <= kind <= BUT:
+                self.step = kind
+
+    def _handle_group(self, num: int) -> bool:
+        if self.status in (FEATURE, RULE, BACKGROUND, TAG, SCENARIO) and self.status != self.group:
+            ends = self.group in (FEATURE, RULE, BACKGROUND, SCENARIO)
+            self.group = self.status
+            return ends
+        # A scenario also ends at a scenario line, once one of its scenario keywords is before the previous line.
+        older, latest = self.scenario_lines
+        return self.status == SCENARIO and (latest if latest <= num - 2 else older) > 0
+
+
+class _TextLines:
+    """Collect the lines of a multi-line text, or their offsets in the span mode, and join them once."""
+
+    def __init__(self, source: Optional[SourceBuffer], previous: Any = None) -> None:
+        self.source = source
+        self.texts: List[str] = []
+        self.offsets: List[int] = []
+        if isinstance(previous, Span):
+            self.offsets.extend(previous.offsets)
+        elif previous is not None:
+            self.texts.append(previous)
+
+    def append(self, line: Line) -> None:
+        """Add the next line of the text."""
+        if self.source is None:
+            self.texts.append(line[1])
+            return
+        start = self.source.line_start(line[0])
+        end = start + self.source.measure(line[1])
+        if self.offsets and self.source.adjoins(self.offsets[-1], start):
+            self.offsets[-1] = end
+        else:
+            self.offsets.extend((start, end))
+
+    def build(self) -> Any:
+        """Return the joined text, its span in the span mode, or None if there are no lines."""
+        if self.source is not None:
+            return Span(self.source, tuple(self.offsets)) if self.offsets else None
+        return "\n".join(self.texts) if self.texts else None
+
+
+class _LinesParser:
+    """Process the lines of a component or a step, and track its first and its last non-blank line.
+
+    The reference engine joins the lines of every component and step, and splits them again, which drops the last line
+    when it is empty. An empty line is therefore processed only once the next line of the same component or step comes.
+    """
+
+    def __init__(self) -> None:
+        self.first: Optional[Line] = None
+        self.last: Optional[Line] = None
+        self.empty: Optional[Line] = None
+
+    def feed(self, line: Line) -> None:
+        """Process the next line, or hold it back until the next one if it is empty."""
+        if self.empty is not None:
+            empty, self.empty = self.empty, None
+            self.handle(empty)
+        if not line[1]:
+            self.empty = line
+            return
+        if line[2] != BLANK:
+            self.first, self.last = self.first or line, line
+        self.handle(line)
+
+    def handle(self, line: Line) -> None:
+        """Process the next line."""
+        raise NotImplementedError
+
+
+class _FeatureParser(_LinesParser):
+    """Build a Feature or a Rule component from its lines, or only check them without a component."""
+
+    def __init__(self, parser: Parser, group: int) -> None:
+        super().__init__()
+        self.parser = parser
+        self.component: Optional[Feature | Rule] = None
+        if parser.gherkin is not None:
+            self.component = parser.gherkin.feature if group == FEATURE else parser.gherkin.rule
+        self.group = group
+        self.keyword = "Feature:" if group == FEATURE else "Rule:"
+        self.started = False
+        self.valid = True
+        self.description = _TextLines(parser.source)
+
+    def handle(self, line: Line) -> None:
+        """Process the next line of the component."""
+        num, text, kind, _ = line
+        if kind == self.group:
+            name = text.strip().removeprefix(self.keyword).lstrip()
+            if self.component is not None:
+                self.component.name = name
+                self.parser.place(self.component, "name", line, name)
+            if not name:
+                message = f"Keyword '{self.keyword[:-1].upper()}' must be followed with text at line [{num}]: {text}"
+                self.parser.report(diagnose(line, self.keyword[:-1].upper(), message), COMPONENT_LEVEL)
+            # The keyword line decides the validity of the lines before it, the same way as in the reference engine.
+            self.valid = bool(name)
+            self.started = True
+        elif text:
+            if not self.started:
+                message = f"Description text cannot be before '{self.keyword[:-1].upper()}' keyword at line [{num}]: {text}"
+                self.parser.report(diagnose(line, "DESCRIPTION", message), COMPONENT_LEVEL)
+                self.valid = False
+            if self.component is not None:
+                self.description.append(line)
+
+    def close(self) -> bool:
+        """Write the collected values to the component, and return whether its syntax is valid."""
+        if self.component is not None:
+            self.component.description = self.description.build()
+            if self.first is not None and self.last is not None:
+                self.parser.locate(self.component, self.first, self.last)
+        return self.valid
+
+
+class _TableParser:
+    """Build a table from its lines, or only check them without building it."""
+
+    def __init__(self, parser: Parser, validate: bool, build: bool) -> None:
+        self.parser = parser
+        self.validate = validate
+        self.build = build
+        self.valid = True
+        self.headers: Optional[List[str]] = None
+        self.table: Optional[Table] = None
+
+    def feed(self, line: Line) -> None:
+        """Process the next line of the table."""
+        num, text, _, _ = line
+        if self.headers is None:
+            self.headers = split_table_row(text)
+            if self.validate and not self.headers:
+                self.parser.report(diagnose(line, "TABLE", f"Table header must contain at least one value at line [{num}]: {text}"), STEP_LEVEL)
+            self.valid &= bool(self.headers)
+            if self.build:
+                self.table = Table(self.headers)
+        elif self.validate or self.build:
+            self._handle_values(self.headers, line)
+
+    def close(self) -> Optional[Table]:
+        """Return the collected table, or None if the table has no lines or it is not built."""
+        if self.table is not None:
+            self.table.compact()
+        return self.table
+
+    def _handle_values(self, headers: List[str], line: Line) -> None:
+        num, text, _, _ = line
+        values = split_table_row(text)
+        if self.validate and len(values) < len(headers):
+            message = f"Table item line has less values than the table header at line [{num}]: {(num, text)}"
+            self.parser.report(diagnose(line, "TABLE", message), STEP_LEVEL)
+        if self.validate and len(values) > len(headers):
+            message = f"Table item line has more values than the table header at line [{num}]: {(num, text)}"
+            self.parser.report(diagnose(line, "TABLE", message), STEP_LEVEL)
+        self.valid &= len(values) == len(headers)
+        if self.table is not None:
+            self.table.append_row(values)
+
+
+class _StepParser(_LinesParser):
+    """Build a Step component from its lines, or only check them without a component.
+
+    The last step keyword line sets the type and the text of the step. A conjunction on the first line gets the keyword
+    of the previous step, which is known only when the step ends.
+    """
+
+    def __init__(self, parser: Parser, validate: bool) -> None:
+        super().__init__()
+        self.parser = parser
+        self.build = parser.gherkin is not None
+        self.table = _TableParser(parser, validate, self.build)
+        self.doc_string = _TextLines(parser.source)
+        self.head: Optional[Line] = None
+        self.keyword: Optional[Line] = None
+        self.has_text = False
+
+    @property
+    def valid(self) -> bool:
+        """Return whether the syntax of the step is valid."""
+        return self.table.valid
+
+    def handle(self, line: Line) -> None:
+        """Process the next line of the step."""
+        _, _, kind, doc_string = line
+        self.head = self.head or line
+        self.has_text |= bool(line[1])
+        if doc_string == DOC_STRING_CONTENT and kind not in (QUOTE_FENCE, BACKQUOTE_FENCE):
+            if self.build:
+                self.doc_string.append(line)
+        elif doc_string == NO_DOC_STRING and GIVEN <= kind <= BUT:
+            self.keyword = line
+        elif doc_string == NO_DOC_STRING and kind == TABLE:
+            self.table.feed(line)
+
+    def close(self, step: int) -> Optional[Step]:
+        """Return the built step, with the keyword of the given step status replacing a conjunction on its first line."""
+        table = self.table.close()
+        if not self.build:
+            return None
+        component = Step() if self.parser.source is None else SourceStep()
+        component.table = table
+        component.doc_string = self.doc_string.build()
+        line, text = self.keyword, ""
+        if line is not None:
+            text = line[1]
+        elif self.head is not None and self.head[2] == AND:
+            line, text = self.head, self.head[1].replace(self.head[1].split(maxsplit=1)[0], STATUSES[step].capitalize(), 1)
+        if line is not None and GIVEN <= classify_line(text.strip()) <= BUT:
+            step_type, component.text = text.strip().split(" ", maxsplit=1)
+            component.type = intern(step_type)
+            self.parser.place(component, "text", line, component.text)
+        if self.first is not None and self.last is not None:
+            self.parser.locate(component, self.first, self.last)
+        return component
+
+
+class _StepsParser(_LinesParser):
+    """Track the status and the steps of a component with steps."""
+
+    transitions: Dict[int, int]
+
+    def __init__(self, parser: Parser) -> None:
+        super().__init__()
+        self.parser = parser
+        self.valid = True
+        self.status: int = BEGINNING
+        self.previous: int = BEGINNING
+        self.step: int = NO_STEP
+        self.steps: List[Step] = []
+        self.current: Optional[_StepParser] = None
+
+    def check(self, keyword: int, line: Line) -> None:
+        """Validate the position of the keyword and move the status to it."""
+        self.valid &= self.parser.check(self.transitions, keyword, self.status, line)
+        self.status = keyword
+
+    def handle(self, line: Line) -> None:
+        """Process the next line of the component."""
+        doc_string = line[3]
+        if doc_string == DOC_STRING_OPEN:
+            self.check(doc_string_status(self.status), line)
+        if doc_string == NO_DOC_STRING:
+            self.handle_line(line)
+        if self.current is not None:
+            self.current.feed(line)
+
+    def handle_line(self, line: Line) -> None:
+        """Process the next line of the component outside of the doc-strings."""
+        raise NotImplementedError
+
+    def handle_step(self, line: Line) -> None:
+        """Process a step keyword, a conjunction, or a table line."""
+        kind = line[2]
+        if kind == AND:
+            self.check(self.step, line)
+        elif kind == TABLE:
+            self.status = table_status(self.status)
+            self.check(self.status, line)
+        else:
+            self.check(kind, line)
+            self.step = kind
+
+    def end_step(self, step: int) -> None:
+        """Finish the current step with the keyword of the given step status."""
+        if self.current is not None:
+            built = self.current.close(step)
+            self.valid &= self.current.valid
+            if built is not None:
+                self.steps.append(built)
+            self.current = None
+            self.parser.end_step()
+
+
+class _BackgroundParser(_StepsParser):
+    """Build a Background component from its lines."""
+
+    transitions = ALLOWED_BACKGROUND_TRANSITIONS
+
+    def __init__(self, parser: Parser) -> None:
+        super().__init__(parser)
+        self.component: Optional[Background] = None if parser.gherkin is None else parser.gherkin.background
+        previous: Any = None
+        if self.component is not None:
+            previous = self.component.description if parser.source is None else span_of(self.component, "description")
+        self.description = _TextLines(parser.source, previous)
+        self.current = _StepParser(parser, True)
+
+    def handle_line(self, line: Line) -> None:
+        """Process the next line of the component outside of the doc-strings."""
+        num, text, kind, _ = line
+        if kind == BACKGROUND:
+            self.check(BACKGROUND, line)
+        elif kind in (GIVEN, AND, TABLE):
+            self.handle_step(line)
+        elif kind != BLANK:
+            self.check(BACKGROUND_DESCRIPTION, line)
+            if self.component is not None:
+                self.description.append(line)
+            if kind in (WHEN, THEN, BUT):
+                message = f"Keyword '{KEYWORD_STATUSES[kind]}' cannot be in Background component at line [{num}]: {text}"
+                self.parser.report(diagnose(line, KEYWORD_STATUSES[kind], message), COMPONENT_LEVEL)
+        # Every line with the status of a given step after a given step ends a step, even a blank line.
+        if self.status == GIVEN and STATUSES[self.previous].startswith("GIVEN"):
+            self.end_step(self.step)
+            self.current = _StepParser(self.parser, True)
+        self.previous = self.status
+
+    def close(self) -> bool:
+        """Write the collected values to the component, and return whether its syntax is valid."""
+        self.end_step(self.step)
+        if self.component is not None:
+            self.component.description = self.description.build()
+            self.component.steps = (self.component.steps or []) + self.steps
+            if self.first is not None and self.last is not None:
+                self.parser.locate(self.component, self.first, self.last)
+        return self.valid
+
+
+class _ScenarioParser(_StepsParser):
+    """Build a Scenario component from its lines."""
+
+    transitions = ALLOWED_SCENARIO_TRANSITIONS
+
+    def __init__(self, parser: Parser) -> None:
+        super().__init__(parser)
+        self.component: Optional[Scenario] = None
+        if parser.gherkin is not None:
+            parser.gherkin.scenarios.append(Scenario() if parser.source is None else SourceScenario())
+            self.component = parser.gherkin.scenarios[-1]
+        self.tags: Optional[List[str]] = None
+        self.description = _TextLines(parser.source)
+        self.outlined = False
+
+    def handle_line(self, line: Line) -> None:
+        """Process the next line of the component outside of the doc-strings."""
+        kind = line[2]
+        if kind == TAG:
+            self.handle_tag(line)
+        elif kind == SCENARIO:
+            self.handle_name(line)
+        elif kind in (DESCRIPTION, FEATURE, RULE, BACKGROUND):
+            self.check(SCENARIO_DESCRIPTION, line)
+            if self.component is not None:
+                self.description.append(line)
+        elif GIVEN <= kind <= AND or kind == TABLE:
+            self.handle_step(line)
+        elif kind == EXAMPLES:
+            self.handle_outline(line)
+        # The steps and the examples table begin on their keyword lines, and the lines before the first one are in none.
+        if self.status in (GIVEN, WHEN, THEN, BUT, OUTLINE):
+            self.end_part()
+            self.previous = self.status
+            self.current = _StepParser(self.parser, self.status != OUTLINE)
+
+    def handle_tag(self, line: Line) -> None:
+        """Collect the tags of the line."""
+        num, text, _, _ = line
+        self.check(TAG, line)
+        words = text.strip().split(" ")
+        if not all(word.startswith("@") for word in words):
+            self.parser.report(diagnose(line, "TAG", f"Not all text is a 'TAG' at line [{num}]: {text}"), COMPONENT_LEVEL)
+        # The reference engine checks the words of the unstripped line, so an indented tag line is not valid.
+        self.valid &= all(word.startswith("@") for word in text.split(" "))
+        self.tags = self.tags or []
+        if self.component is not None:
+            self.tags.extend(word.removeprefix("@") for word in words if word.startswith("@"))
+
+    def handle_name(self, line: Line) -> None:
+        """Set the name of the scenario."""
+        num, text, _, _ = line
+        self.check(SCENARIO, line)
+        keyword, _, name = text.strip().partition(":")
+        name = name.strip()
+        if keyword.endswith(("Outline", "Template")):
+            self.outlined = True
+            if self.component is not None:
+                self.component.outline = Table()
+        if self.component is not None:
+            self.component.name = name
+            self.parser.place(self.component, "name", line, name)
+        if not name:
+            message = f"Scenario keyword must contain text after keyword at line [{num}]: {(num, text)}"
+            self.parser.report(diagnose(line, "SCENARIO", message), COMPONENT_LEVEL)
+        self.valid &= bool(name)
+
+    def handle_outline(self, line: Line) -> None:
+        """Check the examples keyword of the scenario outline."""
+        num, text, _, _ = line
+        self.check(OUTLINE, line)
+        if not self.outlined:
+            message = f"Scenario outline must be marked in the scenario name keyword at line [{num}]: {text}"
+            self.parser.report(diagnose(line, "OUTLINE", message), COMPONENT_LEVEL)
+
+    def end_part(self) -> None:
+        """Finish the current step, or the examples table of the scenario outline."""
+        if self.current is not None and self.previous == OUTLINE:
+            self.outlined = self.current.table.headers is not None
+            if self.component is not None:
+                self.component.outline = self.current.table.close()
+        elif self.current is not None and self.current.has_text:
+            self.end_step(self.previous)
+        self.current = None
+
+    def close(self) -> bool:
+        """Write the collected values to the component, and return whether its syntax is valid."""
+        self.end_part()
+        if self.component is not None:
+            self.component.tags = None if self.tags is None else sorted(set(self.tags))
+            self.component.description = self.description.build()
+            self.component.steps = self.steps
+            if self.first is not None and self.last is not None:
+                self.parser.locate(self.component, self.first, self.last)
+        return self.valid
+
+
+_ComponentParser = Union[_FeatureParser, _BackgroundParser, _ScenarioParser]
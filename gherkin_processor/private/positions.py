@@ -3,9 +3,18 @@
 This module provides dictionaries that define the valid positions for various Gherkin components
 such as features, rules, backgrounds, scenarios, and steps. These dictionaries are used to validate
 the structure and syntax of Gherkin files during processing.
+
+The dictionaries are compiled at import time into transition tables over integer status codes, so the parsers check a
+transition with a single lookup and never build status strings while processing. The statuses of the keywords have
+the same codes as the kinds of their lines, so the kind of a keyword line is its status. The statuses form a closed
+set, which is built at import time: the keyword statuses, and their table and doc-string statuses up to two levels,
+like "GIVEN DOC-STRING DOC-STRING". Every status deeper than that can only follow an earlier syntax issue, and it is
+mapped to the single "<INVALID>" status, so the statuses never grow while processing.
 """
 
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional
+
+from gherkin_processor.private.lines import BLANK, DESCRIPTION, EXAMPLES
 
 given_step_collection = ["GIVEN", "GIVEN TABLE", "GIVEN DOC-STRING"]
 when_step_collection = ["WHEN", "WHEN TABLE", "WHEN DOC-STRING"]
@@ -77,3 +86,159 @@ ALLOWED_SCENARIO_POSITIONS: Dict[str, List[str]] = {
     "OUTLINE": then_step_collection + but_step_collection,
     "OUTLINE TABLE": ["OUTLINE", "OUTLINE TABLE"]
 }
+
+
+BEGINNING, NO_STEP, SCENARIO_DESCRIPTION, BACKGROUND_DESCRIPTION = BLANK, DESCRIPTION, 12, 13
+OUTLINE = EXAMPLES
+
+BASE_STATUSES: List[str] = [
+    "<BEGINNING>", "", "FEATURE", "RULE", "BACKGROUND", "TAG", "SCENARIO", "OUTLINE",
+    "GIVEN", "WHEN", "THEN", "BUT", "SCENARIO DESCRIPTION", "BACKGROUND DESCRIPTION"
+]
+DERIVED_STATUS_DEPTH = 2
+INVALID_STATUS = "<INVALID>"
+
+
+def _table_name(name: str) -> str:
+    return name if name.endswith("TABLE") else f"{name} TABLE"
+
+
+def _doc_string_name(name: str) -> str:
+    return f"{name} DOC-STRING"
+
+
+def _step_name(name: str) -> str:
+    return name.removesuffix(" TABLE").removesuffix(" DOC-STRING")
+
+
+def _derived_names(names: List[str]) -> List[str]:
+    return [derived for name in names for derived in (_table_name(name), _doc_string_name(name))]
+
+
+def _closed_statuses(base: List[str]) -> List[str]:
+    names = list(base)
+    level = list(base)
+    for _ in range(DERIVED_STATUS_DEPTH):
+        level = [name for name in dict.fromkeys(_derived_names(level)) if name not in names]
+        names.extend(level)
+    return names + [INVALID_STATUS]
+
+
+STATUSES: List[str] = _closed_statuses(BASE_STATUSES)
+STATUS_CODES: Dict[str, int] = {name: code for code, name in enumerate(STATUSES)}
+INVALID = STATUS_CODES[INVALID_STATUS]
+
+
+def _derive_statuses(rename: Callable[[str], str]) -> List[int]:
+    return [STATUS_CODES.get(rename(name), INVALID) if code != INVALID else INVALID for code, name in enumerate(STATUSES)]
+
+
+TABLE_STATUSES: List[int] = _derive_statuses(_table_name)
+DOC_STRING_STATUSES: List[int] = _derive_statuses(_doc_string_name)
+STEP_STATUSES: List[int] = _derive_statuses(_step_name)
+
+
+def status_code(name: str) -> int:
+    """Return the code of a status.
+
+    Args:
+        name (str): The name of the status.
+
+    Returns:
+        int: The code of the status, or the code of the invalid status if the status is not known.
+    """
+    return STATUS_CODES.get(name, INVALID)
+
+
+def table_status(status: int) -> int:
+    """Return the status of a table following the status.
+
+    Args:
+        status (int): The code of the status before the table.
+
+    Returns:
+        int: The code of the table status.
+    """
+    return TABLE_STATUSES[status]
+
+
+def doc_string_status(status: int) -> int:
+    """Return the status of a doc-string following the status.
+
+    Args:
+        status (int): The code of the status before the doc-string.
+
+    Returns:
+        int: The code of the doc-string status.
+    """
+    return DOC_STRING_STATUSES[status]
+
+
+def step_status(status: int) -> int:
+    """Return the status without its table and doc-string suffixes.
+
+    Args:
+        status (int): The code of the status.
+
+    Returns:
+        int: The code of the status of the step the table or the doc-string belongs to.
+    """
+    return STEP_STATUSES[status]
+
+
+def compile_positions(positions: Dict[str, List[str]]) -> Dict[int, int]:
+    """Compile the allowed positions into a transition table.
+
+    Args:
+        positions (Dict[str, List[str]]): The allowed previous statuses of the keywords.
+
+    Returns:
+        Dict[int, int]: The bit mask of the allowed previous status codes, by the code of the keyword.
+    """
+    return {
+        status_code(keyword): sum(1 << code for code in {status_code(status) for status in allowed})
+        for keyword, allowed in positions.items()
+    }
+
+
+def position_error(transitions: Dict[int, int], keyword: int, status: int) -> Optional[str]:
+    """Check whether the keyword is allowed after the status.
+
+    Args:
+        transitions (Dict[int, int]): The transition table of the checked component.
+        keyword (int): The code of the status the keyword leads to.
+        status (int): The code of the status before the keyword.
+
+    Returns:
+        Optional[str]: The error message without the line information if the transition is not allowed, None otherwise.
+    """
+    allowed = transitions.get(keyword)
+    if allowed is not None and allowed >> status & 1:
+        return None
+    name = STATUSES[keyword]
+    if allowed is not None:
+        return f"Keyword '{name}' cannot be after '{STATUSES[status]}'"
+    if name.endswith("TABLE"):
+        return f"Table component cannot be after '{name.removesuffix(' TABLE')}'"
+    if name.endswith("DOC-STRING"):
+        return f"Doc-string component cannot be after '{name.removesuffix(' DOC-STRING')}'"
+    return f"Could not resolve current status '{name}' as a valid possibility"
+
+
+def allowed_statuses(transitions: Dict[int, int], keyword: int) -> List[str]:
+    """Return the statuses the keyword is allowed after.
+
+    Args:
+        transitions (Dict[int, int]): The transition table of the checked component.
+        keyword (int): The code of the status the keyword leads to.
+
+    Returns:
+        List[str]: The names of the allowed previous statuses, in the order of their codes.
+    """
+    allowed = transitions.get(keyword, 0)
+    return [name for code, name in enumerate(STATUSES) if allowed >> code & 1]
+
+
+ALLOWED_TRANSITIONS: Dict[int, int] = compile_positions(ALLOWED_POSITIONS)
+ALLOWED_BACKGROUND_TRANSITIONS: Dict[int, int] = compile_positions(ALLOWED_BACKGROUND_POSITIONS)
+ALLOWED_SCENARIO_TRANSITIONS: Dict[int, int] = compile_positions(ALLOWED_SCENARIO_POSITIONS)
@@ -0,0 +1,154 @@
+"""Provide functions for serializing Gherkin components into JSON.
+
+This module includes a JSON serializer which walks the components directly instead of copying them into dictionaries
+first, and yields the output in chunks, so the whole output is never built as one string.
+"""
+
+from collections.abc import Mapping
+from dataclasses import fields, is_dataclass
+from json import dumps
+from json.encoder import encode_basestring_ascii
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+CHUNK_PIECES = 4096
+
+_FIELD_NAMES: Dict[type, Tuple[str, ...]] = {}
+
+
+def iter_json(value: Any, indent: Optional[int] = 4) -> Iterator[str]:
+    """Serialize a Gherkin object or component into JSON, and yield the output in chunks.
+
+    The output is the same as the one of 'json.dumps(dataclasses.asdict(value), indent=indent)', and the one of
+    'json.dumps(dataclasses.asdict(value), separators=(",", ":"))' in the compact mode.
+
+    Args:
+        value (Any): The Gherkin object, component, or any value of the dictionary representation.
+        indent (Optional[int]): The number of spaces to indent the nested values with, or None for the compact mode.
+
+    Yields:
+        str: The next chunk of the output.
+    """
+    encoder = _JsonEncoder(indent)
+    yield from encoder.iter_value(value, 0)
+    if encoder.pieces:
+        yield "".join(encoder.pieces)
+
+
+def to_json(value: Any, indent: Optional[int] = 4) -> str:
+    """Serialize a Gherkin object or component into a JSON string.
+
+    Args:
+        value (Any): The Gherkin object, component, or any value of the dictionary representation.
+        indent (Optional[int]): The number of spaces to indent the nested values with, or None for the compact mode.
+
+    Returns:
+        str: The JSON representation of the value.
+    """
+    return "".join(iter_json(value, indent))
+
+
+def field_names(value: Any) -> Tuple[str, ...]:
+    """Return the names of the dataclass fields of a component, in the order of their declaration.
+
+    Args:
+        value (Any): The dataclass instance.
+
+    Returns:
+        Tuple[str, ...]: The names of the fields, which are cached by the type of the component.
+    """
+    names = _FIELD_NAMES.get(type(value))
+    if names is None:
+        names = _FIELD_NAMES[type(value)] = tuple(field.name for field in fields(value))
+    return names
+
+
+def encode_scalar(value: Any) -> str:
+    """Serialize a string, number, boolean, or None into JSON.
+
+    Args:
+        value (Any): The scalar value.
+
+    Returns:
+        str: The JSON representation of the value, with the non-ASCII characters of strings escaped.
+    """
+    if isinstance(value, str):
+        return encode_basestring_ascii(value)
+    return dumps(value)
+
+
+class _JsonEncoder:
+    """Append the JSON representation of the values to a list of pieces, and join the pieces into chunks."""
+
+    __slots__ = ("pieces", "indent", "key_separator", "_newlines")
+
+    def __init__(self, indent: Optional[int]) -> None:
+        self.pieces: List[str] = []
+        self.indent = indent
+        self.key_separator = ":" if indent is None else ": "
+        self._newlines: List[str] = []
+
+    def newline(self, level: int) -> str:
+        """Return the line break and the indentation of a nesting level, or an empty string in the compact mode.
+
+        Args:
+            level (int): The nesting level, starting from zero.
+
+        Returns:
+            str: The line break and the indentation.
+        """
+        if self.indent is None:
+            return ""
+        while len(self._newlines) <= level:
+            self._newlines.append("\n" + " " * (self.indent * len(self._newlines)))
+        return self._newlines[level]
+
+    def iter_value(self, value: Any, level: int) -> Iterator[str]:
+        """Append the JSON representation of a value to the pieces, and yield the full chunks.
+
+        Args:
+            value (Any): The value to serialize.
+            level (int): The nesting level of the value, starting from zero.
+
+        Yields:
+            str: The next full chunk of the output.
+        """
+        if isinstance(value, (list, tuple)):
+            yield from self._iter_list(value, level)
+        elif isinstance(value, Mapping):
+            yield from self._iter_items(value.items() if value else (), level)
+        elif is_dataclass(value) and not isinstance(value, type):
+            yield from self._iter_items(((name, getattr(value, name)) for name in field_names(value)), level)
+        else:
+            self.pieces.append(encode_scalar(value))
+
+    def _iter_list(self, values: List[Any] | Tuple[Any, ...], level: int) -> Iterator[str]:
+        if not values:
+            self.pieces.append("[]")
+            return
+        inner = self.newline(level + 1)
+        if all(isinstance(value, str) for value in values):
+            self.pieces.append("[" + inner + ("," + inner).join(map(encode_basestring_ascii, values)) + self.newline(level) + "]")
+            return
+        separator = "["
+        for value in values:
+            self.pieces.append(separator + inner)
+            separator = ","
+            yield from self.iter_value(value, level + 1)
+            if len(self.pieces) >= CHUNK_PIECES:
+                yield "".join(self.pieces)
+                self.pieces.clear()
+        self.pieces.append(self.newline(level) + "]")
+
+    def _iter_items(self, items: Iterable[Tuple[str, Any]], level: int) -> Iterator[str]:
+        inner = self.newline(level + 1)
+        separator = "{"
+        for key, value in items:
+            self.pieces.append(separator + inner + encode_basestring_ascii(key) + self.key_separator)
+            separator = ","
+            if isinstance(value, str):
+                self.pieces.append(encode_basestring_ascii(value))
+            elif value is None:
+                self.pieces.append("null")
+            else:
+                yield from self.iter_value(value, level + 1)
+        self.pieces.append("{}" if separator == "{" else self.newline(level) + "}")
@@ -0,0 +1,48 @@
+"""Provide utility functions for reading Gherkin tables.
+
+This module includes functions to split table lines into their cell values, shared by every parser engine. The lines are
+split with plain string operations in linear time, and the escaped pipes, backslashes, and new lines are unescaped.
+"""
+
+from typing import List
+
+
+def split_table_row(text: str) -> List[str]:
+    """Split a table line into its unescaped and stripped cell values.
+
+    A pipe after an odd number of backslashes is part of the cell, and the text after the last unescaped pipe is not
+    part of any cell.
+
+    Args:
+        text (str): The table line, including its indentation.
+
+    Returns:
+        List[str]: The cell values of the table line.
+    """
+    parts = text.split("|")
+    if "\\" not in text:
+        return [cell.strip() for cell in parts[1:-1]]
+    cells: List[str] = []
+    cell: List[str] = []
+    for part in parts[1:-1]:
+        cell.append(part)
+        if (len(part) - len(part.rstrip("\\"))) % 2:
+            cell.append("|")
+        else:
+            cells.append(unescape_cell("".join(cell)).strip())
+            cell.clear()
+    return cells
+
+
+def unescape_cell(cell: str) -> str:
+    """Unescape the pipes, backslashes, and new lines of a table cell.
+
+    A backslash which does not escape a pipe, a backslash, or a new line is kept as it is.
+
+    Args:
+        cell (str): The escaped text of the cell.
+
+    Returns:
+        str: The unescaped text of the cell.
+    """
+    return "\\".join(piece.replace("\\|", "|").replace("\\n", "\n") for piece in cell.split("\\\\"))
@@ -4,49 +4,248 @@ This module includes helper functions to process Gherkin text, load Gherkin file
 and validate their syntax.
 """
 
-from dataclasses import asdict
-from json import dumps
+from functools import partial
 from os import makedirs
 from os.path import abspath, dirname, exists, isfile
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional
 
-from gherkin_processor.gherkin import Gherkin
+from gherkin_processor.batch import (BatchResult, ExecutorArgument, file_size,
+                                     run_batch, text_length)
+from gherkin_processor.components.diagnostic import Diagnostic
+from gherkin_processor.components.scenario import Scenario
+from gherkin_processor.components.source import (BUFFER_TYPES,
+                                                 SourceBackground,
+                                                 SourceBuffer, SourceData,
+                                                 SourceFeature, SourceRule,
+                                                 map_file, read_lines)
+from gherkin_processor.gherkin import ENGINES, Gherkin
+from gherkin_processor.private.binary import (BINARY_MAGIC, decode_gherkin,
+                                              encode_gherkin, is_binary)
+from gherkin_processor.private.parser import (Parser, SpanParser,
+                                              ValidationParser)
 
+if TYPE_CHECKING:
+    from gherkin_processor.cache import ParseCache
 
-def process(gherkin_text: str, validate_text: bool = False) -> Gherkin:
+
+def process(gherkin_text: SourceData, validate_text: bool = False, engine: str = "reference", cache: Optional["ParseCache"] = None) -> Gherkin:
     """Process Gherkin text and return a Gherkin object.
 
+    If a cache is given, the content hash of the text is looked up first, and a copy of the cached object is returned
+    for a repeated text instead of processing it again.
+
     Args:
-        gherkin_text (str): The Gherkin text to process.
+        gherkin_text (SourceData): The Gherkin text to process, as a string or as encoded bytes, bytearray, memoryview,
+            or mmap.
         validate_text (bool): Whether to validate the syntax during processing.
+        engine (str): The parser engine to process the text with ("reference", "fast", or "span").
+        cache (Optional[ParseCache]): The cache of the processed Gherkin objects, or None to always process the text.
 
     Returns:
         Gherkin: The processed Gherkin object.
 
     Raises:
-        TypeError: If the 'text' argument is not a string.
+        TypeError: If the 'text' argument is neither a string nor a bytes-like object.
         ValueError: If validation fails for the step syntax.
+        UnicodeDecodeError: If the encoded text cannot be decoded.
     """
+    if cache is not None:
+        return cache.process(gherkin_text, validate_text, engine)
     gherkin = Gherkin()
-    gherkin.process(gherkin_text, validate_text)
+    gherkin.process(gherkin_text, validate_text, engine)
     return gherkin
 
 
-def load(file_path: str, validate_text: bool = False) -> Gherkin | None:
+def load(file_path: SourceData, validate_text: bool = False, engine: str = "reference", cache: Optional["ParseCache"] = None,
+         cache_dir: Optional[str] = None) -> Gherkin | None:
     """Load a Gherkin file and return a Gherkin object.
 
+    The file is memory-mapped instead of being decoded into one string, and the "fast" and "span" engines decode it line
+    by line. The content of a file which is already read or mapped can be passed instead of the path. If a cache is
+    given, the file is read and looked up by its content, so a repeated file is not processed again, wherever it is. If
+    a cache directory is given, the processed file is kept in it, and an unchanged file is loaded from it in the later
+    runs without parsing it again. A file or content saved in the binary mode is decoded instead of being processed.
+
     Args:
-        file_path (str): The path to the Gherkin file.
+        file_path (SourceData): The path to the Gherkin file, or the encoded content of the file as bytes, bytearray,
+            memoryview, or mmap.
         validate_text (bool): Whether to validate the syntax during processing.
+        engine (str): The parser engine to process the file with ("reference", "fast", or "span").
+        cache (Optional[ParseCache]): The cache of the processed Gherkin objects, or None to always process the file.
+        cache_dir (Optional[str]): The directory of the persistent cache, or None to not keep the processed file.
 
     Returns:
         Gherkin | None: The loaded Gherkin object, or None if the file does not exist.
 
     Raises:
-        ValueError: If validation fails for the step syntax.
+        ValueError: If validation fails for the step syntax, or the binary content is corrupt.
+        UnicodeDecodeError: If the file cannot be decoded.
+    """
+    if isinstance(file_path, BUFFER_TYPES):
+        return decode_gherkin(file_path) if is_binary(file_path) else process(file_path, validate_text, engine, cache)
+    if file_path is None or not exists(file_path) or not isfile(file_path):
+        return None
+    with open(file_path, "rb") as file:
+        if file.read(len(BINARY_MAGIC)) == BINARY_MAGIC:
+            return decode_gherkin(BINARY_MAGIC + file.read())
+    if cache_dir is not None:
+        # pylint: disable-next=import-outside-toplevel
+        from gherkin_processor.cache import DiskCache
+        return DiskCache(cache_dir).load(file_path, validate_text, engine, cache)
+    if cache is None:
+        return Gherkin(file_path, validate_text, engine)
+    with open(file_path, "rb") as file:
+        gherkin = cache.process(file.read(), validate_text, engine)
+    gherkin.file = file_path
+    return gherkin
+
+
+def load_many(file_paths: Iterable[str], validate_text: bool = False, engine: str = "reference", executor: ExecutorArgument = None,
+              chunksize: Optional[int] = None) -> Iterator[BatchResult]:
+    """Load many Gherkin files, and yield their results as soon as they are available.
+
+    The errors are captured in the results of the files instead of stopping the batch. With an executor, the files are
+    grouped into chunks by their sizes, unless the chunk size is given, and the results are yielded in the order of
+    completion, so the position of a file is given by the index of its result.
+
+    Args:
+        file_paths (Iterable[str]): The paths to the Gherkin files.
+        validate_text (bool): Whether to validate the syntax during processing.
+        engine (str): The parser engine to process the files with ("reference", "fast", or "span").
+        executor (ExecutorArgument): The executor to load the files on, like a ThreadPoolExecutor or a
+            ProcessPoolExecutor, "thread" or "process" for a new pool which is shut down after the batch, or None or
+            "serial" to load the files one by one in the calling thread.
+        chunksize (Optional[int]): The number of files in a chunk, or None to group the files by their sizes.
+
+    Returns:
+        Iterator[BatchResult]: The generator of the results of the files, with the Gherkin objects, or with the errors
+            raised by loading the files. The Gherkin object is None if the file does not exist, the same way as for
+            'load'.
+
+    Raises:
+        ValueError: If the executor or the chunk size is not valid, when the first result is requested.
+    """
+    return run_batch(partial(_load_item, validate_text, engine), file_paths, file_size, executor, chunksize)
+
+
+def process_many(gherkin_texts: Iterable[SourceData], validate_text: bool = False, engine: str = "reference", executor: ExecutorArgument = None,
+                 chunksize: Optional[int] = None) -> Iterator[BatchResult]:
+    """Process many Gherkin texts, and yield their results as soon as they are available.
+
+    The errors are captured in the results of the texts instead of stopping the batch. With an executor, the texts are
+    grouped into chunks by their lengths, unless the chunk size is given, and the results are yielded in the order of
+    completion, so the position of a text is given by the index of its result. The texts have to be picklable, like
+    strings or bytes, for a process pool.
+
+    Args:
+        gherkin_texts (Iterable[SourceData]): The Gherkin texts, as strings or as encoded bytes.
+        validate_text (bool): Whether to validate the syntax during processing.
+        engine (str): The parser engine to process the texts with ("reference", "fast", or "span").
+        executor (ExecutorArgument): The executor to process the texts on, like a ThreadPoolExecutor or a
+            ProcessPoolExecutor, "thread" or "process" for a new pool which is shut down after the batch, or None or
+            "serial" to process the texts one by one in the calling thread.
+        chunksize (Optional[int]): The number of texts in a chunk, or None to group the texts by their lengths.
+
+    Returns:
+        Iterator[BatchResult]: The generator of the results of the texts, with the Gherkin objects, or with the errors
+            raised by processing the texts.
+
+    Raises:
+        ValueError: If the executor or the chunk size is not valid, when the first result is requested.
+    """
+    return run_batch(partial(_process_item, validate_text, engine), gherkin_texts, text_length, executor, chunksize)
+
+
+def _load_item(validate_text: bool, engine: str, index: int, file_path: str) -> BatchResult:
+    try:
+        return BatchResult(index, file_path, load(file_path, validate_text, engine))
+    except (OSError, TypeError, ValueError) as e:
+        return BatchResult(index, file_path, error=e)
+
+
+def _process_item(validate_text: bool, engine: str, index: int, gherkin_text: SourceData) -> BatchResult:
+    try:
+        return BatchResult(index, gherkin=process(gherkin_text, validate_text, engine))
+    except (TypeError, ValueError) as e:
+        return BatchResult(index, error=e)
+
+
+def _iter_parsed(header: Gherkin, parser: Parser, lines: Iterable[str]) -> Iterator[Gherkin | Scenario]:
+    header_yielded = False
+    for scenario in parser.iter_scenarios(lines):
+        header.scenarios.clear()
+        if not header_yielded:
+            header_yielded = True
+            yield header
+        yield scenario
+    if not header_yielded:
+        yield header
+
+
+def load_json(file_path: str) -> Gherkin | None:
+    """Load a JSON file saved by 'save', and return a Gherkin object without processing the Gherkin text again.
+
+    Args:
+        file_path (str): The path to the JSON file.
+
+    Returns:
+        Gherkin | None: The loaded Gherkin object, or None if the file does not exist.
+
+    Raises:
+        ValueError: If the file is not valid JSON.
+        KeyError: If a component or a value is missing from the JSON representation.
     """
-    if file_path is not None and exists(file_path) and isfile(file_path):
-        return Gherkin(file_path, validate_text)
-    return None
+    if file_path is None or not exists(file_path) or not isfile(file_path):
+        return None
+    # pylint: disable-next=import-outside-toplevel
+    from json import loads
+    with open(file_path, "rb") as file:
+        return Gherkin.from_dictionary(loads(file.read()))
+
+
+def iter_scenarios(file_path: str, validate_text: bool = False, engine: str = "reference") -> Iterator[Gherkin | Scenario]:
+    """Read a Gherkin file incrementally, and yield its components one by one.
+
+    The first item is a Gherkin object with the feature, rule, and background of the file and without scenarios, and
+    every following item is a completely processed scenario. The encoding is detected from the byte order mark like in
+    'load', and a file which cannot be decoded is reported. The "reference" engine, which is the default like in the
+    other functions, processes the whole file before yielding its components. The "fast" engine decodes the file line
+    by line, and keeps only the current scenario in memory, so the memory usage is bounded by the largest scenario
+    instead of the file size. The "span" engine maps the file into memory, and keeps the line offsets of the file
+    besides the current scenario.
+
+    Args:
+        file_path (str): The path to the Gherkin file.
+        validate_text (bool): Whether to validate the syntax during processing.
+        engine (str): The parser engine to process the file with ("reference", "fast", or "span").
+
+    Yields:
+        Gherkin | Scenario: The header of the file first, then the scenarios in the order of the file. Nothing is
+            yielded if the file does not exist.
+
+    Raises:
+        ValueError: If the engine is unknown, or validation fails for the step syntax.
+        UnicodeDecodeError: If the file cannot be decoded.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown parser engine '{engine}', expected one of: {', '.join(ENGINES)}")
+    if file_path is None or not exists(file_path) or not isfile(file_path):
+        return
+    if engine == "reference":
+        header = Gherkin(file_path, validate_text, engine)
+        scenarios, header.scenarios = header.scenarios, []
+        yield header
+        yield from scenarios
+        return
+    header = Gherkin()
+    header.file = file_path
+    with open(file_path, "rb") as file:
+        if engine == "span":
+            header.feature, header.rule, header.background = SourceFeature(), SourceRule(), SourceBackground()
+            source = SourceBuffer(map_file(file))
+            yield from _iter_parsed(header, SpanParser(header, validate_text, source), source.lines())
+        else:
+            yield from _iter_parsed(header, Parser(header, validate_text), read_lines(file))
 
 
 def save(gherkin: Gherkin, file_path: str, mode: str = "GHERKIN", override_existing_file: bool = False) -> bool:
@@ -55,7 +254,8 @@ def save(gherkin: Gherkin, file_path: str, mode: str = "GHERKIN", override_exist
     Args:
         gherkin (Gherkin): The Gherkin object to save.
         file_path (str): The path to the output file.
-        mode (str): The format to save the file in ("GHERKIN", or "JSON").
+        mode (str): The format to save the file in ("GHERKIN", "JSON", "COMPACT_JSON", which has no indentation and
+            whitespace, or "BINARY", which can be loaded by 'load' without processing the text again).
         override_existing_file (bool): Whether to override the file if it already exists.
 
     Returns:
@@ -65,55 +265,73 @@ def save(gherkin: Gherkin, file_path: str, mode: str = "GHERKIN", override_exist
         output_dir = dirname(file_path)
         if not exists(output_dir):
             makedirs(output_dir)
+        if mode == "BINARY":
+            with open(file_path, "wb") as binary_file:
+                binary_file.write(encode_gherkin(gherkin))
+            return True
         with open(file_path, "w", encoding="utf-8", errors="namereplace") as file:
-            if mode in ["JSON", "JSON5"]:
-                file.write(dumps(asdict(gherkin), indent=4))
+            if mode in ["JSON", "JSON5", "COMPACT_JSON"]:
+                # pylint: disable-next=import-outside-toplevel
+                from gherkin_processor.private.serializers import iter_json
+                file.writelines(iter_json(gherkin, None if mode == "COMPACT_JSON" else 4))
             else:
-                file.write(str(gherkin))
+                gherkin.write_to(file)
         return True
     return False
 
 
-def validate(gherkin_text: str) -> None:
+def validate(gherkin_text: SourceData, collect: bool = False) -> List[Diagnostic] | None:
     """Validate the syntax of Gherkin text.
 
+    The text is checked by the validation engine, which runs the same checks with the same messages as processing the
+    text, but builds no components. By default, the first issue is raised, while in the collecting mode, the whole text
+    is checked in one pass, and all issues are returned.
+
     Args:
-        gherkin_text (str): The Gherkin text to validate.
+        gherkin_text (SourceData): The Gherkin text to validate, as a string or as encoded bytes.
+        collect (bool): Whether to continue after the issues, and return all of them instead of raising the first one.
+
+    Returns:
+        List[Diagnostic] | None: The issues of the text in the order of the lines in the collecting mode, None otherwise.
 
     Raises:
-        TypeError: If the 'text' argument is not a string.
-        ValueError: If validation fails for the step syntax.
+        TypeError: If the 'text' argument is neither a string nor a bytes-like object.
+        ValueError: If validation fails for the step syntax, unless the issues are collected.
     """
-    Gherkin().process(gherkin_text, True)
+    if not isinstance(gherkin_text, (str, *BUFFER_TYPES)):
+        raise TypeError("Variable 'text' is not string type")
+    parser = ValidationParser(not collect)
+    parser.parse(SourceBuffer(gherkin_text).lines())
+    return parser.diagnostics if collect else None
 
 
-def is_valid(gherkin_text: str) -> bool:
+def is_valid(gherkin_text: SourceData) -> bool:
     """Check if the Gherkin text is valid.
 
     Args:
-        gherkin_text (str): The Gherkin text to validate.
+        gherkin_text (SourceData): The Gherkin text to validate, as a string or as encoded bytes.
 
     Returns:
         bool: True if the syntax is valid, False otherwise.
     """
     try:
-        Gherkin().process(gherkin_text, True)
+        validate(gherkin_text)
         return True
     except (TypeError, ValueError):
         return False
 
 
-def issue(gherkin_text: str) -> str:
+def issue(gherkin_text: SourceData) -> str:
     """Return the validation issue for Gherkin text, if any.
 
     Args:
-        gherkin_text (str): The Gherkin text to validate.
+        gherkin_text (SourceData): The Gherkin text to validate, as a string or as encoded bytes.
 
     Returns:
         str: The validation issue as a string, or an empty string if valid.
     """
     try:
-        Gherkin().process(gherkin_text, True)
+        validate(gherkin_text)
         return str()
     except (TypeError, ValueError) as e:
         return str(e)
@@ -0,0 +1,46 @@
+from asyncio import create_task, gather, run, sleep
+from time import perf_counter
+
+from gherkin_processor.aio import AsyncRunner, aload
+from gherkin_processor.utils import load
+from tests.functions import write_files
+
+FILE_COUNT = 1000
+
+
+async def ticker(lags, stop):
+    while not stop:
+        start = perf_counter()
+        await sleep(0.001)
+        lags.append(perf_counter() - start)
+
+
+async def responsiveness(load_all):
+    lags, stop = [], []
+    task = create_task(ticker(lags, stop))
+    await sleep(0)
+    start = perf_counter()
+    gherkins = await load_all()
+    duration = perf_counter() - start
+    stop.append(True)
+    await task
+    assert len(gherkins) == FILE_COUNT and all(gherkin.scenarios for gherkin in gherkins)
+    return max(lags), duration
+
+
+def test_async_responsiveness(tmp_path):
+    paths = write_files(tmp_path, [20] * FILE_COUNT)
+    runner = AsyncRunner(8)
+
+    async def blocking():
+        return [load(path, True, "fast") for path in paths]
+
+    async def concurrent():
+        return await gather(*(aload(path, True, "fast", runner) for path in paths))
+
+    blocking_lag, blocking_duration = run(responsiveness(blocking))
+    async_lag, async_duration = run(responsiveness(concurrent))
+    runner.close()
+    print(f"blocking: max lag {blocking_lag * 1000:.1f} ms in {blocking_duration * 1000:.1f} ms, "
+          f"aload: max lag {async_lag * 1000:.1f} ms in {async_duration * 1000:.1f} ms")
+    assert async_lag < 0.2 * blocking_lag
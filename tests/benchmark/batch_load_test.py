@@ -0,0 +1,32 @@
+from time import perf_counter
+
+from gherkin_processor.utils import load_many
+from tests.functions import write_files
+
+FILE_COUNT = 40
+
+
+def load_durations(paths, executor, chunksize=None):
+    start = perf_counter()
+    results = load_many(paths, True, "fast", executor, chunksize)
+    next(results)
+    first = perf_counter() - start
+    count = 1 + sum(1 for _ in results)
+    assert count == len(paths)
+    return first, perf_counter() - start
+
+
+def test_batch_first_result(tmp_path):
+    paths = write_files(tmp_path, [100 * (1 + num % 4) for num in range(FILE_COUNT)])
+    first, total = load_durations(paths, None)
+    print(f"serial: first result {first * 1000:.1f} ms, all results {total * 1000:.1f} ms")
+    assert first < 0.2 * total
+
+
+def test_batch_chunking(tmp_path):
+    paths = write_files(tmp_path, [100 * (1 + num % 4) for num in range(FILE_COUNT)])
+    _, serial = load_durations(paths, None)
+    _, adaptive = load_durations(paths, "process")
+    _, single = load_durations(paths, "process", 1)
+    print(f"serial: {serial * 1000:.1f} ms, process adaptive: {adaptive * 1000:.1f} ms, process chunksize 1: {single * 1000:.1f} ms")
+    assert adaptive < 2 * serial
@@ -0,0 +1,28 @@
+from os.path import getsize
+from sys import gettrace
+
+from gherkin_processor.utils import load, load_json, save
+from tests.functions import feature_text, measure
+
+TEXT = feature_text(2000)
+
+
+def test_binary_load(tmp_path):
+    (tmp_path / "breakfast.feature").write_text(TEXT)
+    gherkin = load(str(tmp_path / "breakfast.feature"), True, "fast")
+    save(gherkin, str(tmp_path / "breakfast.json"), "COMPACT_JSON")
+    save(gherkin, str(tmp_path / "breakfast.gherkin"), "BINARY")
+    assert load(str(tmp_path / "breakfast.gherkin")) == gherkin
+
+    binary_size = getsize(tmp_path / "breakfast.gherkin")
+    json_size = getsize(tmp_path / "breakfast.json")
+    parse_duration = measure(lambda: load(str(tmp_path / "breakfast.feature"), True, "fast"), 5, True)
+    json_duration = measure(lambda: load_json(str(tmp_path / "breakfast.json")), 5, True)
+    binary_duration = measure(lambda: load(str(tmp_path / "breakfast.gherkin")), 5, True)
+    print(f"size: {binary_size} / {json_size} bytes, load: {binary_duration * 1000:.1f} ms, "
+          f"load_json: {json_duration * 1000:.1f} ms, parse: {parse_duration * 1000:.1f} ms")
+    assert binary_size < 0.25 * json_size
+    assert binary_size < 0.5 * len(TEXT)
+    if gettrace() is None:
+        assert binary_duration < json_duration
+    assert binary_duration < 0.5 * parse_duration
@@ -0,0 +1,41 @@
+from functools import partial
+from time import perf_counter
+
+from pytest import mark
+
+from gherkin_processor.gherkin import Gherkin
+from gherkin_processor.private.tables import split_table_row
+from tests.functions import measure
+
+ROWS = {
+    "wide": lambda size: "  |" + " value |" * size,
+    "escaped": lambda size: "  |" + " \\\\\\| value \\\\ |" * size,
+    "backslashes": lambda size: "  | " + "\\" * size + " |",
+    "unterminated": lambda size: "  | " + "\\ " * size,
+}
+SIZES = [100, 1000, 10000]
+
+
+def split_rows(row):
+    for _ in range(10):
+        split_table_row(row)
+
+
+@mark.parametrize("row", ROWS.values(), ids=ROWS.keys())
+def test_linear_table_row(row):
+    durations = {size: measure(partial(split_rows, row(size))) for size in SIZES}
+    for size, duration in durations.items():
+        print(f"{size} units: {duration * 1000:.3f} ms")
+    assert durations[10000] < 30 * durations[1000]
+    assert durations[10000] < 300 * durations[100]
+
+
+def test_wide_table():
+    header = "|" + "".join(f" column {num} |" for num in range(200))
+    row = "|" + " \\|value\\\\ |" * 200
+    text = "Feature: Making breakfast\n\nScenario: Making coffee\n  Given I have coffee grounds\n  " + "\n  ".join([header] + [row] * 1000)
+    start = perf_counter()
+    gherkin = Gherkin()
+    gherkin.process(text, True, "fast")
+    print(f"200x1000 table: {(perf_counter() - start) * 1000:.2f} ms")
+    assert gherkin.scenarios[0].steps[0].table["column 0"][-1] == "|value\\"
@@ -0,0 +1,31 @@
+import subprocess
+import sys
+from os import environ, getcwd
+from threading import Thread
+
+from gherkin_processor.daemon import DaemonServer, connect
+from gherkin_processor.main import parse_arguments
+from tests.functions import feature_text, measure
+
+
+def test_daemon_roundtrip(tmp_path):
+    (tmp_path / "breakfast.feature").write_text(feature_text(50))
+    path = str(tmp_path / "daemon.sock")
+    arguments = ["-i", "breakfast.feature", "-v", "-p"]
+    args = parse_arguments([*arguments, "--connect", path])
+    args.cwd = str(tmp_path)
+
+    with DaemonServer(path) as server:
+        thread = Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            roundtrip_duration = measure(lambda: list(connect(path, args)), 20)
+        finally:
+            server.shutdown()
+            thread.join()
+    command = [sys.executable, "-m", "gherkin_processor.main", *arguments]
+    process_duration = measure(lambda: subprocess.run(command, cwd=tmp_path, check=True, capture_output=True,
+                                                      env={**environ, "PYTHONPATH": getcwd()}), 5)
+    print(f"daemon round trip {roundtrip_duration * 1000:.2f} ms, new process {process_duration * 1000:.2f} ms")
+    assert roundtrip_duration < 0.01
+    assert roundtrip_duration < 0.1 * process_duration
@@ -0,0 +1,53 @@
+import subprocess
+import sys
+from os import environ, getcwd
+
+from pytest import mark
+
+IMPORT_BUDGET = 0.06
+DEFERRED_MODULES = [
+    "asyncio",
+    "concurrent.futures",
+    "gherkin_processor.aio",
+    "gherkin_processor.cache",
+    "gherkin_processor.daemon",
+    "gherkin_processor.private.serializers",
+    "json",
+    "multiprocessing",
+    "pickle",
+    "socketserver",
+]
+
+
+def import_times(arguments, tmp_path):
+    environment = {key: value for key, value in environ.items() if key != "PYTHONDONTWRITEBYTECODE"}
+    environment.update(PYTHONPATH=getcwd(), PYTHONPYCACHEPREFIX=str(tmp_path / "pycache"))
+    process = subprocess.run([sys.executable, "-X", "importtime", *arguments], check=True, capture_output=True, text=True,
+                             env=environment)
+    times = {}
+    for line in process.stderr.splitlines():
+        if line.startswith("import time:") and not line.endswith("imported package"):
+            own, _, name = line.removeprefix("import time:").split("|")
+            times[name.strip()] = int(own) / 1e6
+    return times
+
+
+def startup_times(arguments, tmp_path):
+    import_times(arguments, tmp_path)
+    baseline = import_times(["-c", "pass"], tmp_path)
+    runs = [import_times(arguments, tmp_path) for _ in range(3)]
+    modules = {name: time for name, time in runs[0].items() if name not in baseline}
+    return modules, min(sum(time for name, time in run.items() if name not in baseline) for run in runs)
+
+
+@mark.parametrize("arguments, processing", [
+    (["-m", "gherkin_processor.main", "-v", "-i", "tests/data/simple.feature"], True),
+    (["-c", "import gherkin_processor"], False),
+])
+def test_startup_budget(arguments, processing, tmp_path):
+    modules, duration = startup_times(arguments, tmp_path)
+    print(f"{' '.join(arguments)}: imports {duration * 1000:.1f} ms, {len(modules)} modules")
+    assert ("gherkin_processor.gherkin" in modules) is processing
+    assert ("gherkin_processor.private.commands" in modules) is processing
+    assert [module for module in DEFERRED_MODULES if module in modules] == []
+    assert duration < IMPORT_BUDGET
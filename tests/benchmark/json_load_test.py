@@ -0,0 +1,16 @@
+from gherkin_processor.utils import load, load_json, save
+from tests.functions import feature_text, measure
+
+TEXT = feature_text(2000)
+
+
+def test_json_load(tmp_path):
+    (tmp_path / "breakfast.feature").write_text(TEXT)
+    gherkin = load(str(tmp_path / "breakfast.feature"), True, "fast")
+    save(gherkin, str(tmp_path / "breakfast.json"), "JSON")
+    assert load_json(str(tmp_path / "breakfast.json")) == gherkin
+
+    parse_duration = measure(lambda: load(str(tmp_path / "breakfast.feature"), True, "fast"), 5, True)
+    json_duration = measure(lambda: load_json(str(tmp_path / "breakfast.json")), 5, True)
+    print(f"parse: {parse_duration * 1000:.1f} ms, load_json: {json_duration * 1000:.1f} ms")
+    assert json_duration < 0.75 * parse_duration
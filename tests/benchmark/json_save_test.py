@@ -0,0 +1,27 @@
+from dataclasses import asdict
+from json import dumps
+
+from gherkin_processor.utils import process, save
+from tests.functions import feature_text, measure, measure_memory
+
+TEXT = feature_text(2000)
+
+
+def save_with_asdict(gherkin, file_path):
+    with open(file_path, "w", encoding="utf-8", errors="namereplace") as file:
+        file.write(dumps(asdict(gherkin), indent=4))
+
+
+def measure_save(function):
+    return measure(function), measure_memory(function)[2]
+
+
+def test_json_save(tmp_path):
+    gherkin = process(TEXT, True, "fast")
+    asdict_duration, asdict_peak = measure_save(lambda: save_with_asdict(gherkin, tmp_path / "asdict.json"))
+    save_duration, save_peak = measure_save(lambda: save(gherkin, str(tmp_path / "gherkin.json"), "JSON", True))
+    print(f"asdict: {asdict_duration:.2f} s, {asdict_peak / 1024:.0f} KiB peak")
+    print(f"save: {save_duration:.2f} s, {save_peak / 1024:.0f} KiB peak")
+    assert (tmp_path / "gherkin.json").read_bytes() == (tmp_path / "asdict.json").read_bytes()
+    assert save_duration < asdict_duration
+    assert save_peak < 0.2 * asdict_peak
@@ -0,0 +1,34 @@
+from functools import partial
+from os import cpu_count
+
+from pytest import mark
+
+from gherkin_processor.main import main
+from tests.functions import measure, write_files
+
+FILE_COUNT = 48
+JOBS = min(cpu_count() or 1, 4)
+
+
+def run_command(arguments, capsys):
+    duration = measure(partial(main, arguments), 1)
+    return duration, capsys.readouterr().out
+
+
+@mark.skipif(JOBS < 2, reason="parallel speedup needs more than one CPU")
+def test_parallel_speedup(tmp_path, capsys):
+    write_files(tmp_path, [200] * FILE_COUNT)
+    serial_duration, serial_output = run_command(["-i", str(tmp_path), "-v", "-p", "--jobs", "1"], capsys)
+    parallel_duration, parallel_output = run_command(["-i", str(tmp_path), "-v", "-p", "--jobs", str(JOBS)], capsys)
+    print(f"jobs 1: {serial_duration * 1000:.1f} ms, jobs {JOBS}: {parallel_duration * 1000:.1f} ms")
+    assert parallel_output == serial_output
+    assert parallel_duration < serial_duration * (0.4 + 0.6 / JOBS)
+
+
+def test_parallel_overhead(tmp_path, capsys):
+    write_files(tmp_path, [200] * FILE_COUNT)
+    serial_duration, serial_output = run_command(["-i", str(tmp_path / "*.feature"), "-v", "-p"], capsys)
+    parallel_duration, parallel_output = run_command(["-i", str(tmp_path / "*.feature"), "-v", "-p", "--jobs", "2"], capsys)
+    print(f"jobs 1: {serial_duration * 1000:.1f} ms, jobs 2: {parallel_duration * 1000:.1f} ms")
+    assert parallel_output == serial_output
+    assert parallel_duration < 2 * serial_duration
@@ -0,0 +1,29 @@
+from pytest import mark
+
+from gherkin_processor.cache import DiskCache, ParseCache
+from gherkin_processor.utils import load, process
+from tests.functions import feature_text, measure
+
+TEXT = feature_text(500)
+
+
+@mark.parametrize("engine", ["reference", "fast", "span"])
+def test_parse_cache_hit(engine):
+    cache = ParseCache()
+    process(TEXT, True, engine, cache)
+    parse_duration = measure(lambda: process(TEXT, True, engine))
+    hit_duration = measure(lambda: process(TEXT, True, engine, cache))
+    print(f"{engine} engine: parse {parse_duration * 1000:.2f} ms, cache hit {hit_duration * 1000:.2f} ms")
+    assert cache.stats().hits == 3
+    assert hit_duration < parse_duration
+
+
+@mark.parametrize("engine", ["reference", "fast", "span"])
+def test_disk_cache_warm_run(engine, tmp_path):
+    feature = tmp_path / "breakfast.feature"
+    feature.write_text(TEXT)
+    DiskCache(str(tmp_path / "cache")).load(str(feature), True, engine)
+    cold_duration = measure(lambda: load(str(feature), True, engine))
+    warm_duration = measure(lambda: load(str(feature), True, engine, cache_dir=str(tmp_path / "cache")))
+    print(f"{engine} engine: cold run {cold_duration * 1000:.2f} ms, warm run {warm_duration * 1000:.2f} ms")
+    assert warm_duration < cold_duration
@@ -0,0 +1,63 @@
+from functools import partial
+
+from pytest import mark
+
+from gherkin_processor.gherkin import Gherkin
+from tests.functions import measure
+
+HEADER = "Feature: Making breakfast\n\n  Background:\n    Given I have coffee grounds\n"
+SCENARIOS = "\n".join([
+    "  Scenario: Making coffee",
+    "    Given I have coffee grounds",
+    "    When I add hot water",
+    "    | temperature |",
+    "    | 90          |",
+    "    Then I get a cup of coffee",
+    "  Scenario: Making tea",
+    "    Given I have tea leaves",
+    "  Scenario Outline: Making eggs",
+    "    Given I have fresh eggs",
+    "    When I <cook> the eggs",
+    "    Then I get eggs",
+    "  Examples:",
+    "    | cook |",
+    "    | fry  |",
+    "",
+])
+# The second line after a scenario keyword begins a new scenario, so the long descriptions are processed without validation.
+DESCRIPTION = "\n".join(["  Scenario: Making pancake"] + [f"  Pancake description line {num}" for num in range(50)] + ["    Given I have pancake mix", ""])
+SIZES = [1, 10, 100]
+
+
+def process(text, engine, scenario_count):
+    gherkin = Gherkin()
+    gherkin.process(text, False, engine)
+    assert len(gherkin.scenarios) == scenario_count
+
+
+@mark.parametrize("engine", ["reference", "fast"])
+@mark.parametrize("body, scenario_count, extra", [(SCENARIOS, 3, 0), (DESCRIPTION, 1, 1)], ids=["scenarios", "description"])
+def test_linear_scaling(engine, body, scenario_count, extra):
+    durations = {size: measure(partial(process, HEADER + body * size, engine, scenario_count * size + extra)) for size in SIZES}
+    for size, duration in durations.items():
+        print(f"{engine} engine, {size}x file: {duration * 1000:.2f} ms")
+    assert durations[100] < 30 * durations[10]
+    assert durations[100] < 300 * durations[1]
+
+
+def long_description(size):
+    return "  Scenario: Making pancake\n" + "".join(f"  Pancake description line {num}\n" for num in range(size)) + "    Given I have pancake mix\n"
+
+
+def long_doc_string(size):
+    payload = "".join(f'      "ingredient {num}": "flour",\n' for num in range(size))
+    return "  Scenario: Making pancake\n    Given I have the recipe\n    When I follow the recipe\n      \"\"\"\n" + payload + "      \"\"\"\n    Then I get a pancake\n"
+
+
+@mark.parametrize("engine", ["reference", "fast"])
+@mark.parametrize("build, scenario_count", [(long_description, 2), (long_doc_string, 1)], ids=["description", "doc-string"])
+def test_long_block_scaling(engine, build, scenario_count):
+    durations = {size: measure(partial(process, HEADER + build(size), engine, scenario_count)) for size in (50, 500, 5000)}
+    for size, duration in durations.items():
+        print(f"{engine} engine, {size} lines: {duration * 1000:.2f} ms")
+    assert durations[5000] < 30 * durations[500]
@@ -0,0 +1,27 @@
+from dataclasses import asdict
+
+from gherkin_processor.utils import process
+from tests.functions import measure_memory
+
+PAYLOAD = "".join(f"      \"ingredient {num}\": \"flour and sugar\",\n" for num in range(200))
+SCENARIO = "\n".join([
+    "  Scenario: Making pancake",
+    "    Pancake description line",
+    "    Given I have the recipe",
+    "    When I follow the recipe",
+    "      \"\"\"",
+    PAYLOAD + "      \"\"\"",
+    "    Then I get a pancake",
+    "",
+])
+TEXT = "Feature: Making breakfast\n\n" + SCENARIO * 100
+
+
+def test_span_memory():
+    fast, fast_retained, fast_peak = measure_memory(lambda: process(TEXT, True, "fast"))
+    span, span_retained, span_peak = measure_memory(lambda: process(TEXT, True, "span"))
+    print(f"fast engine: {fast_retained / 1024:.0f} KiB retained, {fast_peak / 1024:.0f} KiB peak")
+    print(f"span engine: {span_retained / 1024:.0f} KiB retained, {span_peak / 1024:.0f} KiB peak")
+    assert asdict(span) == asdict(fast)
+    assert span_retained < 0.5 * fast_retained
+    assert span_peak < 0.5 * fast_peak
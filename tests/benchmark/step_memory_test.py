@@ -0,0 +1,47 @@
+from dataclasses import asdict, dataclass
+
+from gherkin_processor.components.step import Step
+from gherkin_processor.gherkin import Gherkin
+from tests.functions import measure_memory
+
+LINES = [f"{keyword} I have {num} coffee grounds" for num in range(10000) for keyword in ("Given", "When", "Then")]
+
+
+@dataclass
+class RegularStep:
+    type: str
+    text: str
+    table: None = None
+    doc_string: None = None
+
+
+def build_steps():
+    steps = []
+    for line in LINES:
+        steps.append(Step())
+        steps[-1].process(line, True)
+    return steps
+
+
+def build_regular_steps():
+    return [RegularStep(*line.split(" ", maxsplit=1)) for line in LINES]
+
+
+def step_size(build):
+    steps, size, _ = measure_memory(build)
+    assert len(steps) == len(LINES)
+    return size / len(steps)
+
+
+def test_step_memory():
+    gherkin = Gherkin()
+    gherkin.process("Feature: Making breakfast\n\nScenario: Making coffee\n  Given I have coffee grounds\n  And I add hot water\n", True, "fast")
+    steps = gherkin.scenarios[0].steps
+    assert not hasattr(steps[0], "__dict__")
+    assert steps[0].type is steps[1].type
+    assert asdict(steps[1]) == {"type": "Given", "text": "I add hot water", "table": None, "doc_string": None}
+
+    slotted = step_size(build_steps)
+    regular = step_size(build_regular_steps)
+    print(f"{slotted:.1f} bytes per slotted step, {regular:.1f} bytes per regular step")
+    assert slotted < 0.7 * regular
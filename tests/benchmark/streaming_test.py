@@ -0,0 +1,36 @@
+from gherkin_processor.utils import iter_scenarios
+from tests.decorators import after, before
+from tests.functions import empty_output_directory, measure_memory
+
+HEADER = "Feature: Making breakfast\n\n  Background:\n    Given I have coffee grounds\n\n"
+SCENARIO = "\n".join([
+    "  Scenario Outline: Making coffee {num}",
+    "    Given I have coffee grounds",
+    "    When I add <water> water",
+    "    Then I get a cup of coffee",
+    "  Examples:",
+    "    | water |",
+    "    | hot   |",
+    "    | cold  |",
+    "",
+])
+SIZES = [100, 5000]
+
+
+def streaming_peak(size):
+    file_path = f"tests/data/output/streaming_{size}.feature"
+    with open(file_path, "w", encoding="utf-8") as file:
+        file.write(HEADER)
+        file.writelines(SCENARIO.format(num=num) for num in range(size))
+    count, _, peak = measure_memory(lambda: sum(1 for _ in iter_scenarios(file_path, True, "fast")))
+    assert count == size + 1
+    return peak
+
+
+@before ( empty_output_directory )
+@after ( empty_output_directory )
+def test_bounded_memory():
+    peaks = {size: streaming_peak(size) for size in SIZES}
+    for size, peak in peaks.items():
+        print(f"{size} scenarios: {peak / 1024:.1f} KiB peak")
+    assert peaks[5000] < 2 * peaks[100]
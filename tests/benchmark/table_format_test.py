@@ -0,0 +1,44 @@
+from functools import partial
+
+from pytest import mark
+
+from gherkin_processor.components.table import Table
+from gherkin_processor.private.formatters import escape_cells, format_table
+from tests.functions import measure
+
+
+def concatenated_format_table(table):
+    headers = escape_cells(table.keys())
+    values = [escape_cells(column) for column in table.values()]
+    widths = [max(len(headers[i]), *(len(row) for row in values[i])) for i in range(len(headers))]
+    lines = []
+    formatted_line = "|"
+    for i, header in enumerate(headers):
+        formatted_line += f" {header}{' ' * (widths[i] - len(header))} |"
+    lines.append(formatted_line)
+    for i in range(max(map(len, values))):
+        formatted_line = "|"
+        for j, value in enumerate(values):
+            if len(value) > i:
+                formatted_line += f" {value[i]}{' ' * (widths[j] - len(value[i]))} |"
+            else:
+                formatted_line += f" {' ' * widths[j]} |"
+        lines.append(formatted_line)
+    return "\n".join(lines)
+
+
+def build_table(column_count, row_count):
+    table = Table([f"column {num}" for num in range(column_count)])
+    for row in range(row_count):
+        table.append_row([f"value {row * column % 997}" for column in range(column_count)])
+    return table
+
+
+@mark.parametrize("column_count, row_count", [(10, 10000), (200, 1000)], ids=["10x10000", "200x1000"])
+def test_table_format(column_count, row_count):
+    table = build_table(column_count, row_count)
+    assert format_table(table) == concatenated_format_table(table)
+    concatenated_duration = measure(partial(concatenated_format_table, table))
+    format_duration = measure(partial(format_table, table))
+    print(f"{column_count}x{row_count} table: concatenated {concatenated_duration * 1000:.1f} ms, format_table {format_duration * 1000:.1f} ms")
+    assert format_duration < 0.75 * concatenated_duration
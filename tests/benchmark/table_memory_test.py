@@ -0,0 +1,30 @@
+from gherkin_processor.components.table import Table
+from gherkin_processor.gherkin import Gherkin
+from tests.functions import measure_memory
+
+HEADER = "Feature: Making breakfast\n\n  Scenario Outline: Making coffee\n    Given I have <beans> beans\n    When I grind the beans\n    Then I get coffee\n  Examples:\n"
+COLUMNS = 10
+ROWS = 10000
+
+
+def table_size(build):
+    table, size, _ = measure_memory(build)
+    assert len(table) == COLUMNS
+    return size
+
+
+def build_table():
+    text = HEADER + "\n".join("    |" + "".join(f" value {row}-{column} |" for column in range(COLUMNS)) for row in range(-1, ROWS))
+    gherkin = Gherkin()
+    gherkin.process(text, True, "fast")
+    del text
+    return gherkin.scenarios[0].outline
+
+
+def test_table_memory():
+    table = build_table()
+    assert isinstance(table, Table)
+    columnar = table_size(build_table)
+    dictionary = table_size(lambda: build_table().to_dictionary())
+    print(f"{COLUMNS}x{ROWS} table: {columnar / 1024:.1f} KiB columnar, {dictionary / 1024:.1f} KiB dictionary")
+    assert columnar < dictionary / 2
@@ -0,0 +1,18 @@
+from gherkin_processor.gherkin import Gherkin
+from gherkin_processor.utils import issue, validate
+from tests.functions import feature_text, measure, measure_memory
+
+TEXT = feature_text(2000)
+
+
+def measure_validation(function):
+    return measure(function, 1), measure_memory(function)[2]
+
+
+def test_validation_memory():
+    process_duration, process_peak = measure_validation(lambda: Gherkin().process(TEXT, True))
+    validate_duration, validate_peak = measure_validation(lambda: validate(TEXT))
+    print(f"process: {process_duration:.2f} s, {process_peak / 1024:.0f} KiB peak")
+    print(f"validate: {validate_duration:.2f} s, {validate_peak / 1024:.0f} KiB peak")
+    assert issue(TEXT) == ""
+    assert validate_peak < 0.2 * process_peak
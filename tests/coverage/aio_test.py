@@ -0,0 +1,122 @@
+from asyncio import CancelledError, create_task, gather, run, sleep
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from threading import Event, Lock
+
+from pytest import raises
+
+from gherkin_processor.aio import AsyncRunner, aload, aprocess, asave, asave_many, avalidate
+from gherkin_processor.utils import load, validate
+
+INVALID = "Scenario: Missing feature\n  Then I fail\n  Given I start\n"
+
+
+class Tracker:
+    def __init__(self):
+        self.lock = Lock()
+        self.running = 0
+        self.peak = 0
+
+    def work(self, value, event=None):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        if event is not None:
+            event.wait(5)
+        with self.lock:
+            self.running -= 1
+        return value
+
+
+def test_async_utilities(tmp_path):
+    async def scenario():
+        gherkin = await aload("tests/data/complex.feature", True, "fast")
+        assert asdict(gherkin) == asdict(load("tests/data/complex.feature", True, "fast"))
+        assert await aload("tests/data/missing.feature") is None
+        text = open("tests/data/complex.feature", encoding="utf-8").read()
+        assert asdict(await aprocess(text, True, "span")) == {**asdict(gherkin), "file": None}
+        assert await avalidate(text) is None
+        assert await avalidate(INVALID, True) == validate(INVALID, True)
+        with raises(ValueError):
+            await avalidate(INVALID)
+        assert await asave(gherkin, str(tmp_path / "complex.feature")) is True
+        assert await asave(gherkin, str(tmp_path / "complex.feature")) is False
+        assert (tmp_path / "complex.feature").read_text(encoding="utf-8") == str(gherkin)
+
+    run(scenario())
+
+
+def test_async_save_many(tmp_path):
+    gherkin = load("tests/data/simple.feature")
+    files = [(gherkin, str(tmp_path / "output" / f"simple_{num}.json")) for num in range(50)]
+
+    async def scenario():
+        assert await asave_many(files, "JSON", runner=AsyncRunner(4)) == [True] * 50
+        assert await asave_many(files[:2], "JSON") == [False, False]
+        (tmp_path / "directory.json").mkdir()
+        with raises(OSError):
+            await asave_many([(gherkin, str(tmp_path / "directory.json"))] + files, "JSON", True)
+
+    run(scenario())
+    assert len(list((tmp_path / "output").iterdir())) == 50
+    assert load(str(tmp_path / "output" / "simple_0.json")) is not None
+
+
+def test_async_concurrency():
+    tracker = Tracker()
+    runner = AsyncRunner(3)
+
+    async def scenario():
+        results = await gather(*(runner.run(tracker.work, num) for num in range(20)))
+        assert results == list(range(20))
+
+    run(scenario())
+    assert tracker.peak <= 3
+    run(scenario())
+    runner.close()
+    runner.close()
+    with raises(ValueError):
+        AsyncRunner(0)
+
+
+def test_async_cancellation():
+    tracker = Tracker()
+    runner = AsyncRunner(1)
+    event = Event()
+
+    async def scenario():
+        blocked = create_task(runner.run(tracker.work, "blocked", event))
+        waiting = create_task(runner.run(tracker.work, "waiting"))
+        await sleep(0.05)
+        blocked.cancel()
+        with raises(CancelledError):
+            await blocked
+        await sleep(0.05)
+        assert not waiting.done()
+        event.set()
+        assert await waiting == "waiting"
+
+        queued = [create_task(runner.run(tracker.work, num, event)) for num in range(5)]
+        await sleep(0)
+        for task in queued[1:]:
+            task.cancel()
+        results = await gather(*queued, return_exceptions=True)
+        assert results[0] == 0
+        assert all(isinstance(result, CancelledError) for result in results[1:])
+
+    run(scenario())
+    assert tracker.peak == 1
+    runner.close()
+
+
+def test_async_process_pool():
+    with ProcessPoolExecutor(2) as executor:
+        runner = AsyncRunner(2, executor)
+
+        async def scenario():
+            return await gather(aload("tests/data/complex.feature", True, "fast", runner), aprocess("Feature: Making breakfast\n", runner=runner))
+
+        gherkin, feature = run(scenario())
+        runner.close()
+    assert asdict(gherkin) == asdict(load("tests/data/complex.feature", True, "fast"))
+    assert feature.feature.name == "Making breakfast"
@@ -0,0 +1,84 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict
+from pickle import dumps, loads
+
+from pytest import mark, raises
+
+from gherkin_processor.batch import MIN_CHUNK_WEIGHT, BatchResult, file_size, make_chunks, text_length
+from gherkin_processor.utils import load, load_many, process, process_many
+
+FILES = ["tests/data/simple.feature", "tests/data/complex.feature", "tests/data/missing.feature", "tests/data/simple.feature"]
+INVALID = "Scenario: Missing feature\n  Then I fail\n  Given I start\n"
+
+
+def by_index(results):
+    results = list(results)
+    assert sorted(result.index for result in results) == list(range(len(results)))
+    return sorted(results, key=lambda result: result.index)
+
+
+@mark.parametrize("executor", [None, "serial", "thread", "process"])
+def test_load_many(executor):
+    results = by_index(load_many(FILES, True, "fast", executor))
+    assert [result.path for result in results] == FILES
+    assert asdict(results[1].gherkin) == asdict(load(FILES[1], True, "fast"))
+    assert results[0].gherkin == results[3].gherkin
+    assert (results[2].gherkin, results[2].error) == (None, None)
+    assert all(result.error is None for result in results)
+
+
+@mark.parametrize("executor", [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_process_many(executor):
+    texts = [open(FILES[1], encoding="utf-8").read(), INVALID, 42, open(FILES[0], "rb").read()]
+    with executor(2) as pool:
+        results = by_index(process_many(texts, True, "span", pool, chunksize=1))
+        assert process_many(texts[:1], executor=pool).__next__().gherkin == process(texts[0])
+    assert asdict(results[0].gherkin) == asdict(process(texts[0], True, "span"))
+    assert isinstance(results[1].error, ValueError) and results[1].gherkin is None
+    assert isinstance(results[2].error, TypeError)
+    assert results[3].gherkin.feature.name == "Making breakfast"
+    assert all(result.path is None for result in results)
+
+
+def test_batch_generator():
+    texts = iter([INVALID, "Feature: Making breakfast\n"])
+    results = process_many(texts, True)
+    assert isinstance(next(results).error, ValueError)
+    assert next(texts) == "Feature: Making breakfast\n"
+    assert list(results) == []
+
+    results = load_many(FILES * 4, executor="thread", chunksize=2)
+    assert isinstance(next(results), BatchResult)
+    results.close()
+
+
+def test_batch_errors():
+    with raises(ValueError):
+        next(load_many(FILES, executor="fiber"))
+    with raises(ValueError):
+        next(load_many(FILES, executor="thread", chunksize=0))
+    assert list(load_many([], executor="process")) == []
+
+
+def test_make_chunks():
+    items = list("abcdefg")
+    assert make_chunks(items, [1] * 7, 3) == [[(0, "a"), (1, "b"), (2, "c")], [(3, "d"), (4, "e"), (5, "f")], [(6, "g")]]
+    assert make_chunks(items, [1] * 7, None) == [list(enumerate(items))]
+    chunks = make_chunks(items, [MIN_CHUNK_WEIGHT * 100, 1, 1, MIN_CHUNK_WEIGHT * 100, 1, 1, 1], None)
+    assert [len(chunk) for chunk in chunks][:2] == [1, 2]
+    assert [index for chunk in chunks for index, _ in chunk] == list(range(7))
+    assert make_chunks([], [], None) == []
+    assert file_size(FILES[0]) > 0
+    assert file_size(FILES[2]) == 0
+    assert text_length(42) == 0
+
+
+@mark.parametrize("engine", ["reference", "fast", "span"])
+def test_batch_result_pickle(engine):
+    result = BatchResult(3, FILES[1], load(FILES[1], True, engine))
+    restored = loads(dumps(result))
+    assert (restored.index, restored.path, restored.error) == (3, FILES[1], None)
+    assert asdict(restored.gherkin) == asdict(result.gherkin)
+    assert type(restored.gherkin.scenarios[0]) is type(result.gherkin.scenarios[0])
+    failed = loads(dumps(BatchResult(1, error=ValueError("Invalid"))))
+    assert (failed.gherkin, str(failed.error)) == (None, "Invalid")
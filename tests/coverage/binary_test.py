@@ -0,0 +1,138 @@
+from dataclasses import asdict
+from random import Random
+from struct import pack
+from sys import intern
+
+from pytest import mark, raises
+
+from gherkin_processor.components.source import SourceStep, span_of
+from gherkin_processor.components.step import Step
+from gherkin_processor.components.table import Table
+from gherkin_processor.gherkin import Gherkin
+from gherkin_processor.private.binary import (BINARY_HEADER, BINARY_MAGIC,
+                                              SOURCE_VERSION, decode_gherkin,
+                                              encode_gherkin, is_binary)
+from gherkin_processor.private.serializers import to_json
+from gherkin_processor.utils import load, process, save
+
+
+@mark.parametrize("engine", ["reference", "fast", "span"])
+@mark.parametrize("file_path", ["tests/data/simple.feature", "tests/data/complex.feature"])
+def test_binary_roundtrip(engine, file_path, tmp_path):
+    gherkin = load(file_path, True, engine)
+    assert save(gherkin, str(tmp_path / "output.gherkin"), "BINARY") is True
+    loaded = load(str(tmp_path / "output.gherkin"), True, engine)
+    assert asdict(loaded) == asdict(gherkin)
+    assert str(loaded) == str(gherkin)
+    assert loaded.file == file_path
+    assert all(step.type is intern(step.type) for scenario in loaded.scenarios for step in scenario.steps)
+
+    with open(tmp_path / "output.gherkin", "rb") as file:
+        data = file.read()
+    assert is_binary(data)
+    assert asdict(load(data)) == asdict(load(memoryview(data))) == asdict(gherkin)
+    assert len(data) < len(to_json(gherkin, None))
+
+
+def test_binary_values():
+    gherkin = Gherkin()
+    gherkin.feature.name = "Making breakfast \udcff ½"
+    gherkin.background.steps = []
+    step = Step()
+    step.type, step.text, step.doc_string = "Given", "", "Line\n\"quoted\""
+    step.table = Table.from_dictionary({"a": ["1", "2"], "b": ["1"], "": []})
+    gherkin.background.steps.append(step)
+    assert asdict(decode_gherkin(encode_gherkin(gherkin))) == asdict(gherkin)
+    assert decode_gherkin(encode_gherkin(Gherkin())) == Gherkin()
+
+    step.table = Table(["cup", "size", "cup"])
+    step.table.append_row(["1", "small", "2"])
+    restored = decode_gherkin(encode_gherkin(gherkin)).background.steps[0].table
+    assert restored.header_line == ["cup", "size", "cup"]
+    restored.append_row(["3", "large", "4"])
+    assert restored == {"cup": ["1", "2", "3", "4"], "size": ["small", "large"]}
+
+    for num in range(300):
+        scenario = load(f"Feature: Breakfast\nScenario: Making coffee {num}\nGiven I have {num} cups\n".encode()).scenarios[0]
+        gherkin.scenarios.append(scenario)
+    data = encode_gherkin(gherkin)
+    assert BINARY_HEADER.unpack_from(data)[2:4] == (1, 2)
+    assert asdict(decode_gherkin(data)) == asdict(gherkin)
+
+
+@mark.parametrize("text", [
+    "Feature: Making breakfast\n  Pancakes\n\n  Scenario: Making ½ pancake\n    Given I have:\n      \"\"\"\n      flour\n      \"\"\"\n",
+    "Feature: Making breakfast\r\n  Scenario: Making ½ pancake\r\n    Given I have eggs\r\n".encode(),
+    "Feature: Making breakfast\n  Scenario: Making ½ pancake\n    Given I have eggs\n".encode("utf-16"),
+    "",
+])
+def test_binary_spans(text):
+    gherkin = process(text, True, "span")
+    data = encode_gherkin(gherkin, spans=True)
+    assert BINARY_HEADER.unpack_from(data)[1] == SOURCE_VERSION
+    decoded = decode_gherkin(data)
+    assert asdict(decoded) == asdict(gherkin)
+    assert type(decoded.feature) is type(gherkin.feature)
+    pairs = [(decoded.feature, gherkin.feature), *zip(decoded.scenarios, gherkin.scenarios)]
+    for restored, original in zip(decoded.scenarios, gherkin.scenarios):
+        pairs.extend(zip(restored.steps, original.steps))
+    for restored, original in pairs:
+        for name in [None, "name", "text", "doc_string"]:
+            span = span_of(original, name)
+            assert (span_of(restored, name) is None) == (span is None)
+            if span is not None:
+                assert (span_of(restored, name).offsets, span_of(restored, name).line) == (span.offsets, span.line)
+    assert encode_gherkin(gherkin) == encode_gherkin(load(data))
+    assert not isinstance(decode_gherkin(encode_gherkin(gherkin)).feature, type(gherkin.feature))
+    assert encode_gherkin(process(text, True, "fast"), spans=True) == encode_gherkin(process(text, True, "fast"))
+
+
+def test_binary_span_errors():
+    gherkin = process(b"Feature: Making breakfast\n  Scenario: Making pancake\n    Given I have eggs\n", True, "span")
+    data = encode_gherkin(gherkin, spans=True)
+    for corrupt in [data[:-1], data + b"\0"]:
+        with raises(ValueError):
+            decode_gherkin(corrupt)
+    step = SourceStep()
+    step.type = "Given"
+    step.text = span_of(process(b"Feature: Making lunch\n", True, "span").feature, "name")
+    gherkin.scenarios[0].steps.append(step)
+    with raises(ValueError):
+        encode_gherkin(gherkin, spans=True)
+
+
+def test_binary_errors(tmp_path):
+    data = encode_gherkin(load("tests/data/complex.feature"))
+    version = pack("<H", 2)
+    for corrupt in [b"", BINARY_MAGIC, b"XXXX" + data[4:], data[:4] + version + data[6:], data[:6] + b"\3" + data[7:], data[:-1], data + b"\0"]:
+        with raises(ValueError):
+            decode_gherkin(corrupt)
+    records = BINARY_HEADER.unpack_from(data)[-1]
+    header = BINARY_HEADER.pack(*BINARY_HEADER.unpack_from(data)[:-1], records - 10)
+    with raises(ValueError):
+        decode_gherkin(header + data[BINARY_HEADER.size:-10])
+    item_size = BINARY_HEADER.unpack_from(data)[3]
+    header = BINARY_HEADER.pack(*BINARY_HEADER.unpack_from(data)[:-1], records + 1)
+    with raises(ValueError, match="records after the Gherkin object"):
+        decode_gherkin(header + data[BINARY_HEADER.size:] + bytes(item_size))
+    with raises(ValueError, match="bytes after its records"):
+        decode_gherkin(data + b"\0")
+
+    (tmp_path / "corrupt.gherkin").write_bytes(data[:-1])
+    with raises(ValueError):
+        load(str(tmp_path / "corrupt.gherkin"))
+    assert not is_binary(b"Feature: Making breakfast")
+
+
+@mark.parametrize("engine", ["fast", "span"])
+def test_binary_corruption(engine):
+    data = encode_gherkin(load("tests/data/complex.feature", True, engine), spans=True)
+    random = Random(engine)
+    for _ in range(2000):
+        corrupt = bytearray(data)
+        for _ in range(random.randint(1, 3)):
+            corrupt[random.randrange(len(corrupt))] = random.randrange(256)
+        try:
+            decode_gherkin(bytes(corrupt))
+        except ValueError:
+            pass
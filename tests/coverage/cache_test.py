@@ -0,0 +1,221 @@
+import sys
+from dataclasses import asdict
+from os import listdir, utime, walk
+from pickle import dumps
+from shutil import copyfile
+from subprocess import run
+from threading import Thread
+
+from pytest import mark, raises
+
+from gherkin_processor.cache import (ENTRY_HEADER, ENTRY_MAGIC, CacheStats,
+                                     DiskCache, ParseCache)
+from gherkin_processor.components.source import span_of
+from gherkin_processor.utils import load, process
+
+TEXT = "Feature: Making breakfast\n\n  Scenario: Making coffee\n    Given I have coffee grounds\n    When I add hot water\n"
+
+
+@mark.parametrize("engine", ["reference", "fast", "span"])
+def test_cache_process(engine):
+    cache = ParseCache()
+    expected = asdict(process(TEXT, True, engine))
+
+    first = process(TEXT, True, engine, cache)
+    second = process(TEXT, True, engine, cache)
+    assert asdict(first) == asdict(second) == expected
+    assert cache.stats() == CacheStats(hits=1, misses=1, evictions=0, entries=1, size=cache.stats().size)
+
+    second.scenarios[0].steps.clear()
+    second.feature.name = "Changed"
+    assert asdict(process(TEXT, True, engine, cache)) == expected
+    assert first.scenarios[0].steps
+
+    process(TEXT, False, engine, cache)
+    process(TEXT.encode(), True, engine, cache)
+    assert len(cache) == 3
+
+
+def test_cache_spans(tmp_path):
+    cache = ParseCache()
+    process(TEXT.encode(), True, "span", cache)
+    gherkin = process(TEXT.encode(), True, "span", cache)
+    assert span_of(gherkin.scenarios[0], "name").column == 13
+    assert span_of(gherkin.scenarios[0].steps[1], "text").line == 5
+
+    feature = tmp_path / "example.feature"
+    feature.write_text(TEXT)
+    age(feature)
+    disk = DiskCache(str(tmp_path / "cache"))
+    disk.load(str(feature), True, "span")
+    gherkin = disk.load(str(feature), True, "span")
+    assert disk.hits == 1
+    assert span_of(gherkin.scenarios[0].steps[1], "text").column == 10
+
+
+def test_cache_eviction():
+    cache = ParseCache(max_entries=2)
+    texts = [TEXT.replace("coffee", f"coffee {num}") for num in range(3)]
+    for text in texts:
+        process(text, False, "fast", cache)
+    process(texts[1], False, "fast", cache)
+    process(texts[2], False, "fast", cache)
+    process(texts[0], False, "fast", cache)
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.entries) == (2, 4, 2, 2)
+
+    small = ParseCache(max_bytes=stats.size // 2 + 1)
+    process(texts[0], False, "fast", small)
+    process(texts[1], False, "fast", small)
+    assert small.stats().entries == 1
+    assert small.stats().evictions == 1
+    assert ParseCache(max_bytes=1).process(TEXT, False) is not None
+
+    cache.clear()
+    assert cache.stats() == CacheStats()
+    with raises(ValueError):
+        ParseCache(max_entries=0)
+
+
+def test_cache_errors():
+    cache = ParseCache()
+    with raises(ValueError):
+        process("Scenario: Missing feature\n  Then I fail\n  Given I start\n", True, "fast", cache)
+    assert len(cache) == 0
+    with raises(TypeError):
+        process(42, True, "fast", cache)
+
+
+def test_cache_load(tmp_path):
+    cache = ParseCache()
+    copyfile("tests/data/complex.feature", tmp_path / "copy.feature")
+    first = load("tests/data/complex.feature", True, "fast", cache)
+    second = load(str(tmp_path / "copy.feature"), True, "fast", cache)
+    assert first.file == "tests/data/complex.feature"
+    assert second.file == str(tmp_path / "copy.feature")
+    assert asdict(first) == {**asdict(second), "file": first.file}
+    assert cache.stats().hits == 1
+    assert load("tests/data/missing.feature", True, "fast", cache) is None
+    with open("tests/data/complex.feature", "rb") as file:
+        assert asdict(load(file.read(), True, "fast", cache)) == {**asdict(first), "file": None}
+    assert cache.stats().hits == 2
+
+
+def test_cache_threads():
+    cache = ParseCache(max_entries=4)
+    texts = [TEXT.replace("coffee", f"coffee {num}") for num in range(8)]
+    results = []
+
+    def worker():
+        for text in texts * 5:
+            results.append(process(text, True, "fast", cache).scenarios[0].name)
+
+    threads = [Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = cache.stats()
+    assert stats.hits + stats.misses == len(results) == 160
+    assert stats.entries <= 4
+    assert sorted(set(results)) == sorted(f"Making coffee {num}" for num in range(8))
+
+
+def age(path, seconds=60):
+    stat = path.stat()
+    utime(path, ns=(stat.st_atime_ns - seconds * 10**9, stat.st_mtime_ns - seconds * 10**9))
+
+
+@mark.parametrize("engine", ["reference", "fast", "span"])
+def test_disk_cache(engine, tmp_path):
+    feature = tmp_path / "example.feature"
+    copyfile("tests/data/complex.feature", feature)
+    age(feature)
+    expected = asdict(load(str(feature), True, engine))
+
+    cold = DiskCache(str(tmp_path / "cache"))
+    assert asdict(cold.load(str(feature), True, engine)) == expected
+    assert (cold.hits, cold.misses) == (0, 1)
+
+    warm = DiskCache(str(tmp_path / "cache"))
+    assert asdict(warm.load(str(feature), True, engine)) == expected
+    assert asdict(load(str(feature), True, engine, cache_dir=str(tmp_path / "cache"))) == expected
+    assert asdict(warm.load(str(feature), True, engine)) == expected
+    assert (warm.hits, warm.misses) == (2, 0)
+
+    age(feature, 30)
+    assert asdict(warm.load(str(feature), True, engine)) == expected
+    assert (warm.hits, warm.misses) == (3, 0)
+
+    feature.write_text(feature.read_text().replace("Making breakfast", "Making dinner"))
+    changed = warm.load(str(feature), True, engine)
+    assert changed.feature.name == "Making dinner"
+    assert (warm.hits, warm.misses) == (3, 1)
+    assert warm.load(str(feature), True, engine).feature.name == "Making dinner"
+    assert (warm.hits, warm.misses) == (4, 1)
+
+
+def test_disk_cache_entries(tmp_path):
+    feature = tmp_path / "example.feature"
+    copyfile("tests/data/complex.feature", feature)
+    cache = DiskCache(str(tmp_path / "cache"))
+    expected = asdict(cache.load(str(feature), False, "fast"))
+    entry = cache.entry_path(str(feature), False, "fast")
+    assert entry != cache.entry_path(str(feature), True, "fast")
+    assert entry != cache.entry_path(str(feature), False, "span")
+
+    with open(entry, "r+b") as file:
+        file.seek(-20, 2)
+        file.truncate()
+    assert asdict(cache.load(str(feature), False, "fast")) == expected
+    with open(entry, "wb") as file:
+        file.write(b"corrupt")
+    assert asdict(cache.load(str(feature), False, "fast")) == expected
+    info = feature.stat()
+    with open(entry, "wb") as file:
+        file.write(ENTRY_HEADER.pack(ENTRY_MAGIC, info.st_size, info.st_mtime_ns, bytes(16)) + dumps(load(str(feature))))
+    assert asdict(cache.load(str(feature), False, "fast")) == expected
+    assert (cache.hits, cache.misses) == (0, 4)
+    assert asdict(cache.load(str(feature), False, "fast")) == expected
+    assert cache.hits == 1
+
+    memory = ParseCache()
+    copyfile(feature, tmp_path / "copy.feature")
+    cache.load(str(tmp_path / "copy.feature"), False, "fast", memory)
+    cache.load(str(tmp_path / "copy.feature"), False, "fast", memory)
+    assert memory.stats().misses == 1
+
+    with raises(ValueError):
+        feature.write_text("Scenario: Missing feature\n  Then I fail\n  Given I start\n")
+        cache.load(str(feature), True, "fast")
+    blocked = DiskCache(str(feature))
+    assert blocked.load(str(tmp_path / "copy.feature"), False, "fast").feature.name == "Making breakfast"
+
+
+def test_disk_cache_threads(tmp_path):
+    feature = tmp_path / "example.feature"
+    copyfile("tests/data/complex.feature", feature)
+    expected = asdict(load(str(feature), True, "fast"))
+    results = []
+
+    def worker():
+        cache = DiskCache(str(tmp_path / "cache"))
+        for _ in range(10):
+            results.append(asdict(cache.load(str(feature), True, "fast")))
+
+    threads = [Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 40
+    assert all(result == expected for result in results)
+    assert [name for _, _, names in walk(tmp_path / "cache") for name in names if not name.endswith(".gpc")] == []
+
+
+def test_disk_cache_command_line(tmp_path):
+    command = [sys.executable, "-m", "gherkin_processor.main", "-i", "tests/data/complex.feature", "-p", "-v", "--cache-dir", str(tmp_path)]
+    cold = run(command, capture_output=True, text=True, check=True)
+    warm = run(command, capture_output=True, text=True, check=True)
+    assert cold.stdout == warm.stdout != ""
+    assert len(listdir(tmp_path)) == 1
@@ -1,5 +1,114 @@
-from os import system
+from os import _exit, system
+from shutil import copyfile
+
+from pytest import mark, raises
+
+from gherkin_processor.main import expand_inputs, main, output_path, parse_arguments
 
 
 def test_command_line():
     system("python gherkin_processor/main.py -h")
+
+
+def make_tree(tmp_path):
+    (tmp_path / "features" / "nested").mkdir(parents=True)
+    copyfile("tests/data/simple.feature", tmp_path / "features" / "simple.feature")
+    copyfile("tests/data/complex.feature", tmp_path / "features" / "nested" / "complex.feature")
+    (tmp_path / "features" / "notes.txt").write_text("Not a feature")
+    return tmp_path / "features"
+
+
+def test_expand_inputs(tmp_path):
+    features = make_tree(tmp_path)
+    simple, complex_ = str(features / "simple.feature"), str(features / "nested" / "complex.feature")
+    assert expand_inputs([str(features)]) == [complex_, simple]
+    assert expand_inputs([str(features / "*")]) == [str(features / "notes.txt"), simple]
+    assert expand_inputs([str(features / "**" / "*.feature"), simple]) == [complex_, simple]
+    assert expand_inputs([simple, str(features / "missing.feature")]) == [simple, str(features / "missing.feature")]
+    with raises(ValueError, match="No input files match"):
+        expand_inputs([simple, str(features / "*.json")])
+    (features / "empty").mkdir()
+    with raises(ValueError, match="No input files match"):
+        expand_inputs([str(features / "empty")])
+
+
+def test_output_path():
+    args = parse_arguments(["-i", "a.feature", "b.feature", "-i", "c.feature", "-o", "out/<NAME>.<EXT>"])
+    assert args.input == ["a.feature", "b.feature", "c.feature"]
+    assert output_path(args, "dir/b.feature", "GHERKIN") == "out/b.feature"
+    assert output_path(args, "dir/b.feature", "JSON") == "out/b.json"
+    assert args.output == "out/<NAME>.<EXT>"
+    with raises(SystemExit):
+        parse_arguments(["-i", "a.feature", "--jobs", "-1"])
+
+
+@mark.parametrize("jobs", ["1", "2", "0"])
+def test_multiple_inputs(jobs, tmp_path, capsys):
+    features = make_tree(tmp_path)
+    main(["-i", str(features), "-p", "-v", "--jobs", jobs])
+    expected = capsys.readouterr().out
+    assert expected.startswith("Feature: Making breakfast\nDescribes a morning routine")
+    assert expected.count("Feature: Making breakfast") == 2
+
+    main(["-i", str(features), "-p", "--jobs", jobs, "--unordered"])
+    assert sorted(capsys.readouterr().out.splitlines()) == sorted(expected.splitlines())
+
+
+def test_multiple_outputs(tmp_path, monkeypatch):
+    features = make_tree(tmp_path)
+    output = str(tmp_path / "output" / "<NAME>.<EXT>")
+    main(["-i", str(features), "-s", "-j", "--jobs", "2", "-o", output])
+    assert sorted(path.name for path in (tmp_path / "output").iterdir()) == ["complex.feature", "complex.json", "simple.feature", "simple.json"]
+
+    (tmp_path / "output" / "simple.json").write_text("{}")
+    (tmp_path / "output" / "complex.json").write_text("{}")
+    answers = iter(["y", "n"])
+    monkeypatch.setattr("builtins.input", lambda prompt: next(answers))
+    main(["-i", str(features), "-j", "--jobs", "2", "-o", output])
+    assert (tmp_path / "output" / "complex.json").read_text().startswith("{\n")
+    assert (tmp_path / "output" / "simple.json").read_text() == "{}"
+
+    main(["-i", str(features), "-j", "-y", "-o", output])
+    assert (tmp_path / "output" / "simple.json").read_text().startswith("{\n")
+
+
+def test_exit_code(tmp_path, capsys):
+    features = make_tree(tmp_path)
+    (features / "invalid.feature").write_text("Scenario: Missing feature\n  Then I fail\n  Given I start\n")
+    with raises(SystemExit) as exit_info:
+        main(["-i", str(features), "-p", "-v", "--jobs", "2"])
+    assert exit_info.value.code == 1
+    captured = capsys.readouterr()
+    assert captured.err.startswith(str(features / "invalid.feature") + ": ")
+    assert captured.out.count("Feature: Making breakfast") == 2
+    main(["-i", str(features / "missing.feature"), "-p"])
+    assert capsys.readouterr().out == "\n"
+
+
+def test_unmatched_inputs(tmp_path, capsys):
+    with raises(SystemExit) as exit_info:
+        main(["-i", str(tmp_path / "*.feature"), "-p"])
+    assert exit_info.value.code == 1
+    assert capsys.readouterr().err == f"No input files match '{tmp_path / '*.feature'}'\n"
+
+
+def test_streamed_output(tmp_path, monkeypatch, capsys):
+    features = make_tree(tmp_path)
+    main(["-i", str(features), "-p"])
+    expected = capsys.readouterr().out
+    monkeypatch.setattr("gherkin_processor.gherkin.Gherkin.to_string", None)
+    main(["-i", str(features), "-p"])
+    assert capsys.readouterr().out == expected
+
+
+def crash(args, input_paths):
+    _exit(1)
+
+
+def test_broken_workers(tmp_path, monkeypatch, capsys):
+    features = make_tree(tmp_path)
+    monkeypatch.setattr("gherkin_processor.private.commands.process_files", crash)
+    with raises(SystemExit) as exit_info:
+        main(["-i", str(features), "-p", "--jobs", "2"])
+    assert exit_info.value.code == 1
+    assert capsys.readouterr().err.startswith("Worker process failed: ")
@@ -0,0 +1,152 @@
+import json
+import socket
+from os import chmod, getuid, stat
+from os.path import dirname
+from shutil import copyfile
+from stat import S_IMODE
+from threading import Thread
+
+from pytest import fixture, raises
+
+from gherkin_processor.daemon import DaemonServer, connect, default_socket_path, remove_stale_socket, serve
+from gherkin_processor.main import main, parse_arguments
+from gherkin_processor.private.commands import FileResult
+from gherkin_processor.utils import load, load_json
+
+INVALID = "Scenario: Missing feature\n  Then I fail\n  Given I start\n"
+
+
+@fixture
+def daemon(tmp_path):
+    path = str(tmp_path / "daemon.sock")
+    server = DaemonServer(path)
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, path
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def run_remote(path, *argv, cwd=None):
+    args = parse_arguments([*argv, "--connect", path])
+    args.cwd = cwd
+    return list(connect(path, args))
+
+
+def test_default_socket_path(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    path = default_socket_path()
+    assert path == str(tmp_path / f"gherkin-processor-{getuid()}" / "daemon.sock")
+    assert S_IMODE(stat(dirname(path)).st_mode) == 0o700
+    assert default_socket_path() == path
+
+    chmod(dirname(path), 0o755)
+    with raises(OSError, match="not a private directory"):
+        default_socket_path()
+    monkeypatch.setattr("gherkin_processor.daemon.getuid", lambda: getuid() + 1)
+    (tmp_path / f"gherkin-processor-{getuid() + 1}").mkdir(mode=0o700)
+    with raises(OSError, match="not a private directory"):
+        default_socket_path()
+
+
+def test_remote_results(daemon, tmp_path):
+    server, path = daemon
+    copyfile("tests/data/simple.feature", tmp_path / "simple.feature")
+    (tmp_path / "invalid.feature").write_text(INVALID)
+    assert S_IMODE(stat(path).st_mode) == 0o600
+
+    results = run_remote(path, "-i", "simple.feature", "invalid.feature", "-v", "-p", cwd=str(tmp_path))
+    assert [result.path for result in results] == ["simple.feature", "invalid.feature"]
+    assert results[0].output == load("tests/data/simple.feature").to_string()
+    assert results[1].error is not None
+    run_remote(path, "-i", "simple.feature", "-v", cwd=str(tmp_path))
+    assert server.cache.stats().hits == 1
+
+    assert run_remote(path, "-i", "simple.feature", "-s", "-o", "copy.feature", cwd=str(tmp_path))[0].existing == []
+    assert load(str(tmp_path / "copy.feature")).to_string() == results[0].output
+    existing = run_remote(path, "-i", "simple.feature", "-s", "-o", "copy.feature", cwd=str(tmp_path))[0]
+    assert existing.existing == [(str(tmp_path / "copy.feature"), "GHERKIN")]
+    assert FileResult.from_dictionary(existing.to_dictionary()) == existing
+
+
+def test_remote_jobs(daemon, tmp_path, monkeypatch):
+    _, path = daemon
+    copyfile("tests/data/simple.feature", tmp_path / "simple.feature")
+    copyfile("tests/data/complex.feature", tmp_path / "complex.feature")
+    monkeypatch.setattr("concurrent.futures.ProcessPoolExecutor", None)
+    results = run_remote(path, "-i", "simple.feature", "complex.feature", "--jobs", "4", "-p", cwd=str(tmp_path))
+    assert [result.error for result in results] == [None, None]
+    assert results[1].output == load("tests/data/complex.feature").to_string()
+
+def test_rejected_command(daemon):
+    _, path = daemon
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(path)
+        client.sendall(b'{"command": []}\n')
+        assert json.loads(client.makefile("rb").readline()) == {"error": "'options'"}
+    args = parse_arguments(["-i", "a.feature"])
+    args.input = 42
+    with raises(ValueError, match="Daemon rejected the command"):
+        list(connect(path, args))
+
+
+def test_connect_main(daemon, tmp_path, monkeypatch, capsys):
+    _, path = daemon
+    copyfile("tests/data/simple.feature", tmp_path / "simple.feature")
+    copyfile("tests/data/simple.feature", tmp_path / "simple.json")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("builtins.input", lambda _: "y")
+    main(["-i", "simple.feature", "-p", "-j", "--connect", path])
+    assert capsys.readouterr().out == load("simple.feature").to_string() + "\n"
+    assert load_json("simple.json").to_string() == load("simple.feature").to_string()
+
+    main(["-i", "simple.feature", "--connect", str(tmp_path / "missing.sock")])
+    assert "processing the files locally" in capsys.readouterr().err
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    (tmp_path / f"gherkin-processor-{getuid()}").mkdir(mode=0o755)
+    main(["-i", "simple.feature", "--connect"])
+    assert "not a private directory" in capsys.readouterr().err
+
+
+def test_lost_connection(tmp_path, capsys):
+    path = str(tmp_path / "daemon.sock")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+        listener.bind(path)
+        listener.listen()
+        thread = Thread(target=lambda: listener.accept()[0].makefile("rb").readline())
+        thread.start()
+        with raises(SystemExit):
+            main(["-i", "simple.feature", "--connect", path])
+        thread.join()
+    assert "before completing the command" in capsys.readouterr().err
+
+
+def test_socket_ownership(daemon, tmp_path, monkeypatch):
+    _, path = daemon
+    with raises(OSError, match="already listening"):
+        remove_stale_socket(path)
+    stale = str(tmp_path / "stale.sock")
+    socket.socket(socket.AF_UNIX, socket.SOCK_STREAM).bind(stale)
+    remove_stale_socket(stale)
+    remove_stale_socket(stale)
+
+    monkeypatch.setattr("gherkin_processor.daemon.getuid", lambda: getuid() + 1)
+    with raises(OSError, match="belongs to another user"):
+        DaemonServer(path)
+    with raises(OSError, match="belongs to another user"):
+        run_remote(path, "-i", "simple.feature")
+
+
+def test_serve(tmp_path, monkeypatch):
+    path = tmp_path / "serve.sock"
+
+    def interrupt(_, __=None):
+        assert path.exists()
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(DaemonServer, "serve_forever", interrupt)
+    main(["serve", "--socket", str(path)])
+    assert not path.exists()
+    serve(str(path), str(tmp_path / "cache"))
+    assert not path.exists()
@@ -0,0 +1,60 @@
+from pytest import mark, raises
+
+from gherkin_processor.components import Diagnostic
+from gherkin_processor.gherkin import Gherkin
+from gherkin_processor.utils import issue, validate
+
+TEXT = "\n".join([
+    "Scenario: Making coffee",
+    "Given I have coffee grounds",
+    "",
+    "Feature: Making breakfast",
+    "",
+    "  @coffee morning",
+    "  Scenario:",
+    "    Given I have coffee grounds",
+    "      | cup | size |",
+    "      | 1 |",
+    "    When I add hot water",
+    "    Then I get a cup of coffee",
+    "",
+    "  Examples:",
+])
+MESSAGES = [
+    "Keyword 'SCENARIO' cannot be after '<BEGINNING>' at line [1]: Scenario: Making coffee",
+    "Keyword 'FEATURE' cannot be after 'GIVEN' at line [4]: Feature: Making breakfast",
+    "Not all text is a 'TAG' at line [6]:   @coffee morning",
+    "Scenario keyword must contain text after keyword at line [7]: (7, '  Scenario:')",
+    "Table item line has less values than the table header at line [10]: (10, '      | 1 |')",
+    "Scenario outline must be marked in the scenario name keyword at line [14]:   Examples:",
+]
+
+
+def test_collect_diagnostics():
+    diagnostics = validate(TEXT, collect=True)
+    assert [str(diagnostic) for diagnostic in diagnostics] == MESSAGES
+    assert issue(TEXT) == MESSAGES[0]
+    assert diagnostics[0] == Diagnostic(1, 1, "SCENARIO", diagnostics[0].expected, MESSAGES[0])
+    assert diagnostics[0].expected[:5] == ["FEATURE", "RULE", "BACKGROUND", "TAG", "SCENARIO"]
+    assert "<BEGINNING>" not in diagnostics[0].expected
+    assert diagnostics[1].to_dictionary() == {"line": 4, "column": 1, "keyword": "FEATURE", "expected": ["<BEGINNING>"], "message": MESSAGES[1]}
+    assert [(diagnostic.line, diagnostic.column, diagnostic.keyword) for diagnostic in diagnostics[2:]] == [
+        (6, 3, "TAG"), (7, 3, "SCENARIO"), (10, 7, "TABLE"), (14, 3, "OUTLINE")
+    ]
+    assert all(diagnostic.expected == [] for diagnostic in diagnostics[2:])
+    assert validate(TEXT.encode(), collect=True) == diagnostics
+    assert validate(open("tests/data/complex.feature").read(), collect=True) == []
+    with raises(ValueError):
+        validate(TEXT)
+
+
+@mark.parametrize("engine", ["reference", "fast", "span"])
+def test_process_diagnostics(engine):
+    diagnostics = []
+    gherkin = Gherkin()
+    assert gherkin.process(TEXT, True, engine, diagnostics) is False
+    assert [str(diagnostic) for diagnostic in diagnostics] == MESSAGES
+    assert gherkin.feature.name == "Making breakfast"
+    diagnostics.clear()
+    Gherkin().process(open("tests/data/complex.feature").read(), True, engine, diagnostics)
+    assert diagnostics == []
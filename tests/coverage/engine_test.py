@@ -0,0 +1,145 @@
+from dataclasses import asdict
+from random import Random
+
+from pytest import mark, raises
+
+from gherkin_processor.gherkin import Gherkin
+from gherkin_processor.private.parser import ValidationParser
+from gherkin_processor.utils import issue, load, process
+
+INVALID_TEXTS = [
+    "Scenario: Making coffee\nGiven I have coffee grounds",
+    "Feature: Making breakfast\nRule:\nScenario: Making coffee\nGiven I have coffee grounds",
+    "Description\nFeature: Making breakfast\n\nScenario: Making coffee\nGiven I have coffee grounds",
+    "Feature: Making breakfast\n\nBackground:\nGiven I have coffee grounds\nWhen I add hot water\n\nScenario: Making coffee\nGiven I have coffee grounds",
+    "Feature: Making breakfast\n\nBackground:\n  Given I have coffee grounds\n  | cup |\n  | 1 | 2 |\n\nScenario: Making coffee\nGiven I have coffee grounds",
+    "Feature: Making breakfast\n\n@coffee morning\nScenario: Making coffee\nGiven I have coffee grounds",
+    "Feature: Making breakfast\n\nScenario:\nGiven I have coffee grounds",
+    "Feature: Making breakfast\n\nScenario: Making coffee\n  Given I have coffee grounds\n  | cup | size |\n  | 1 |\n  When I add hot water",
+    "Feature: Making breakfast\n\nScenario: Making coffee\n  Given I have coffee grounds\n  |\n  When I add hot water",
+    "Feature: Making breakfast\n\nScenario: Making coffee\nGiven I have coffee grounds\nWhen I add hot water\nThen I get a cup of coffee\n\nExamples:\n  | cup |\n  | 1 |",
+    "Feature: Making breakfast\n\nScenario: Making coffee\nGiven I have coffee grounds\n\"\"\"\ncoffee\n\"\"\"\n```\ncoffee\n```",
+    "Feature: Making breakfast\n\nScenario: Making coffee\n  | cup |\nGiven I have coffee grounds",
+    "Feature: Making breakfast\n\nScenario: Making coffee\nGiven I have coffee grounds\nThen I get a cup of coffee",
+    "Feature: Making breakfast\n\nScenario: Making coffee\nAnd I have coffee grounds\nWhen I add hot water",
+    "Feature: Making breakfast\n\nScenario: Making coffee\nGiven I have coffee grounds\nDescription\nWhen I add hot water\n\nScenario: Making tea",
+]
+
+SCENARIO_TEXTS = [
+    "Feature: Making breakfast\n\nScenario: Making coffee\nFirst description line\nSecond description line\nThird description line\nGiven I have coffee grounds",
+    "Feature: Making breakfast\n\nScenario: Making coffee\nScenario: Making tea\nScenario: Making cocoa\nScenario: Making juice\nGiven I have oranges",
+    "Feature: Making breakfast\n\nBackground:\nButter is melted first\nGiven I have butter\n\nScenario: Making toast\nWhenever the bread is fresh\nGiven I have bread",
+]
+
+BLANK_LINE_TEXTS = [
+    ("Feature: F\nScenario: S\nGiven a\n  \nWhen b\n", ["Given a", " ", "When b"]),
+    ("Feature: F\nScenario: S\nGiven a\n\n| x |\n| 1 |", ["Given a", " "]),
+    ("Feature: F\nScenario: S\n  Given a\n  \"\"\"\n  coffee\n\n\n", ["Given a"]),
+    ("Feature: F\nScenario: S\nGiven a\n  @tag\n", ["Given a"]),
+    ("Feature: Breakfast\nBackground:\n", [" "]),
+    ("Feature: F\nBackground:\nGiven a\n\nGiven b\n\n\n", ["Given a", " ", "Given b", " "]),
+]
+
+DIFFERENTIAL_LINES = [
+    "Feature: F", "Rule: R", "Background:", "Scenario: S", "Scenario Outline: O", "Examples:", "Given a", "When b", "Then c",
+    "And d", "But e", "* f", "@t", "@t @u", "| x |", "| 1 |", "| x | y |", '"""', "```", "desc", "", "  ", "# c", "Scenario:",
+    "Rule:", "Feature:",
+]
+
+
+@mark.parametrize("engine", ["fast", "span"])
+@mark.parametrize("file_path", ["tests/data/simple.feature", "tests/data/complex.feature"])
+def test_engine_output(file_path, engine):
+    reference = Gherkin(file_path, True, "reference")
+    fast = Gherkin(file_path, True, engine)
+    assert asdict(fast) == asdict(reference)
+    assert str(fast) == str(reference)
+    assert asdict(load(file_path, True, engine)) == asdict(load(file_path, True, "reference"))
+
+
+@mark.parametrize("engine", ["fast", "span"])
+@mark.parametrize("text, scenario_count", list(zip(SCENARIO_TEXTS, [2, 2, 1])))
+def test_engine_scenarios(text, scenario_count, engine):
+    reference = Gherkin()
+    reference.process(text, False, "reference")
+    assert len(reference.scenarios) == scenario_count
+    for validate in (True, False):
+        assert differential_result(text, validate, engine) == differential_result(text, validate, "reference")
+
+
+@mark.parametrize("engine", ["fast", "span"])
+@mark.parametrize("text, steps", BLANK_LINE_TEXTS)
+def test_engine_blank_lines(text, steps, engine):
+    reference = Gherkin()
+    reference.process(text, False, "reference")
+    components = [reference.background, *reference.scenarios]
+    assert [f"{step.type} {step.text}" for component in components for step in component.steps or []] == steps
+    other = Gherkin()
+    other.process(text, False, engine)
+    assert asdict(other) == asdict(reference)
+
+
+def differential_result(text, validate, engine):
+    gherkin = Gherkin()
+    try:
+        return gherkin.process(text, validate, engine), asdict(gherkin)
+    except ValueError as e:
+        return None, str(e)
+
+
+@mark.parametrize("seed", range(4))
+def test_engine_differential(seed):
+    random = Random(seed)
+    for _ in range(250):
+        lines = ["Feature: F", "Scenario: S"] if random.random() < 0.7 else []
+        lines += [random.choice(DIFFERENTIAL_LINES) for _ in range(random.randint(1, 8))]
+        text = "\n".join("  " * random.randint(1, 2) + line if random.random() < 0.3 else line for line in lines)
+        text += "\n" if random.random() < 0.5 else ""
+        for validate in (True, False):
+            reference = differential_result(text, validate, "reference")
+            assert differential_result(text, validate, "fast") == reference, text
+            assert differential_result(text, validate, "span") == reference, text
+            assert differential_result(text.encode(), validate, "span") == reference, text
+        checked = differential_result(text, True, "reference")
+        assert issue(text) == ("" if checked[0] is not None else checked[1]), text
+
+
+@mark.parametrize("engine", ["fast", "span"])
+@mark.parametrize("text", INVALID_TEXTS)
+def test_engine_validation(text, engine):
+    with raises(ValueError) as reference:
+        process(text, True, "reference")
+    with raises(ValueError) as fast:
+        process(text, True, engine)
+    assert str(fast.value) == str(reference.value)
+    assert Gherkin().process(text, False, engine) is Gherkin().process(text, False, "reference")
+
+
+@mark.parametrize("text", INVALID_TEXTS + SCENARIO_TEXTS)
+def test_validation_engine(text):
+    try:
+        process(text, True, "reference")
+        message = ""
+    except ValueError as e:
+        message = str(e)
+    assert issue(text) == message
+    assert ValidationParser(False).parse(text.splitlines()) is Gherkin().process(text, False, "fast")
+
+
+@mark.parametrize("engine", ["reference", "fast", "span"])
+def test_engine_empty_text(engine):
+    for text in ("", b""):
+        gherkin = Gherkin()
+        assert gherkin.process(text, True, engine) is True
+        assert asdict(gherkin) == asdict(Gherkin())
+    assert issue("") == ""
+
+
+def test_engine_error():
+    with raises(ValueError) as e:
+        process("Feature: Making breakfast", False, "unknown")
+    assert str(e.value) == "Unknown parser engine 'unknown', expected one of: reference, fast, span"
+    for engine in ("fast", "span"):
+        with raises(TypeError) as e:
+            process(None, True, engine)
+        assert str(e.value) == "Variable 'text' is not string type"
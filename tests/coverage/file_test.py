@@ -1,7 +1,13 @@
+from codecs import BOM_UTF8
+from dataclasses import asdict
+from inspect import signature
+from mmap import ACCESS_READ, mmap
 from os.path import exists
 
+from pytest import mark, raises
+
 from gherkin_processor.gherkin import Gherkin
-from gherkin_processor.utils import load, save
+from gherkin_processor.utils import iter_scenarios, load, save
 from tests.decorators import after, before
 from tests.functions import empty_output_directory
 
@@ -27,3 +33,57 @@ def test_save():
 def test_load():
     gherkin = load("tests/data/complex.feature", True)
     assert gherkin is not None
+
+
+@mark.parametrize("engine", ["reference", "fast", "span"])
+def test_load_bytes(engine, tmp_path):
+    expected = asdict(load("tests/data/complex.feature", True, engine))
+    with open("tests/data/complex.feature", "rb") as file:
+        data = file.read()
+        with mmap(file.fileno(), 0, access=ACCESS_READ) as mapped:
+            gherkin = load(mapped, True, engine)
+            assert asdict(gherkin) == {**expected, "file": None}
+            del gherkin
+    assert asdict(load(data, True, engine)) == {**expected, "file": None}
+    assert asdict(load(memoryview(data), True, engine)) == {**expected, "file": None}
+
+    (tmp_path / "bom.feature").write_bytes(BOM_UTF8 + data)
+    assert asdict(load(str(tmp_path / "bom.feature"), True, engine)) == {**expected, "file": str(tmp_path / "bom.feature")}
+    (tmp_path / "invalid.feature").write_bytes(data.replace(b"Feature:", b"Feature: \xff"))
+    with raises(UnicodeDecodeError):
+        load(str(tmp_path / "invalid.feature"), True, engine)
+
+
+@mark.parametrize("engine", ["reference", "fast", "span"])
+def test_iter_scenarios(engine):
+    for file_path in ["tests/data/simple.feature", "tests/data/complex.feature"]:
+        header, *scenarios = iter_scenarios(file_path, True, engine)
+        assert header.scenarios == []
+        header.scenarios = scenarios
+        assert asdict(header) == asdict(load(file_path, True))
+    assert not list(iter_scenarios("tests/data/missing.feature", engine=engine))
+    with raises(ValueError):
+        list(iter_scenarios("tests/data/invalid/missing_feature.feature", True, engine))
+
+
+@mark.parametrize("engine", ["reference", "fast", "span"])
+def test_iter_scenarios_encoding(engine, tmp_path):
+    with open("tests/data/complex.feature", "rb") as file:
+        data = file.read()
+    expected = asdict(load("tests/data/complex.feature", True))
+    for name, content in [("bom.feature", BOM_UTF8 + data), ("utf16.feature", data.decode().encode("utf-16"))]:
+        (tmp_path / name).write_bytes(content)
+        header, *scenarios = iter_scenarios(str(tmp_path / name), True, engine)
+        header.scenarios = scenarios
+        assert asdict(header) == {**expected, "file": str(tmp_path / name)}
+    (tmp_path / "invalid.feature").write_bytes(data.replace(b"Feature:", b"Feature: \xff"))
+    with raises(UnicodeDecodeError):
+        list(iter_scenarios(str(tmp_path / "invalid.feature"), True, engine))
+    (tmp_path / "empty.feature").write_bytes(b"")
+    assert [asdict(item) for item in iter_scenarios(str(tmp_path / "empty.feature"), False, engine)] == [asdict(load(str(tmp_path / "empty.feature")))]
+    with raises(ValueError, match="Unknown parser engine 'unknown'"):
+        list(iter_scenarios("tests/data/simple.feature", engine="unknown"))
+
+
+def test_iter_scenarios_default_engine():
+    assert signature(iter_scenarios).parameters["engine"].default == signature(load).parameters["engine"].default == "reference"
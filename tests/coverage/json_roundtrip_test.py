@@ -0,0 +1,89 @@
+from dataclasses import asdict
+from json import dumps, load as load_file, loads
+from sys import intern
+
+from pytest import mark, raises
+
+from gherkin_processor.components.background import Background
+from gherkin_processor.components.feature import Feature
+from gherkin_processor.components.rule import Rule
+from gherkin_processor.components.scenario import Scenario
+from gherkin_processor.components.step import Step
+from gherkin_processor.components.table import Table
+from gherkin_processor.gherkin import Gherkin
+from gherkin_processor.utils import load, load_json, save
+
+
+@mark.parametrize("engine", ["reference", "fast", "span"])
+@mark.parametrize("file_path", ["tests/data/simple.feature", "tests/data/complex.feature"])
+def test_from_dictionary(engine, file_path):
+    gherkin = load(file_path, True, engine)
+    rebuilt = Gherkin.from_dictionary(asdict(gherkin))
+    assert asdict(rebuilt) == asdict(gherkin)
+    assert str(rebuilt) == str(gherkin)
+    assert type(rebuilt.scenarios[0]) is Scenario
+    assert all(step.type is intern(step.type) for step in rebuilt.scenarios[0].steps)
+
+    rebuilt.scenarios[0].steps.clear()
+    assert gherkin.scenarios[0].steps
+
+
+
+@mark.parametrize("engine", ["reference", "fast", "span"])
+def test_asdict_output(engine):
+    gherkin = load("tests/data/complex.feature", True, engine)
+    with open("tests/data/complex.json", "r", encoding="utf-8") as file:
+        expected = load_file(file)
+    assert loads(dumps(asdict(gherkin))) == expected
+    assert loads(dumps(asdict(gherkin.scenarios[1]))) == expected["scenarios"][1]
+    assert type(asdict(gherkin)["scenarios"][1]["outline"]) is dict
+
+def test_load_json(tmp_path):
+    gherkin = load("tests/data/complex.feature", True, "fast")
+    assert save(gherkin, str(tmp_path / "complex.json"), "JSON") is True
+    assert save(gherkin, str(tmp_path / "compact.json"), "COMPACT_JSON") is True
+    for file_name in ["complex.json", "compact.json"]:
+        loaded = load_json(str(tmp_path / file_name))
+        assert asdict(loaded) == asdict(gherkin)
+        assert loaded.file == "tests/data/complex.feature"
+    assert load_json(str(tmp_path / "missing.json")) is None
+
+    (tmp_path / "invalid.json").write_text("{\"feature\": ")
+    with raises(ValueError):
+        load_json(str(tmp_path / "invalid.json"))
+    (tmp_path / "incomplete.json").write_text(dumps({"feature": {"name": "Making breakfast", "description": None}}))
+    with raises(KeyError):
+        load_json(str(tmp_path / "incomplete.json"))
+
+
+def test_component_from_dictionary():
+    assert Step.from_dictionary({"type": "Given", "text": "I have eggs", "table": {"a": ["1"]}, "doc_string": None}).table.to_dictionary() == {"a": ["1"]}
+    background = Background.from_dictionary({"description": "Breakfast", "steps": None})
+    assert (background.description, background.steps) == ("Breakfast", None)
+    assert Gherkin.from_dictionary(asdict(Gherkin())) == Gherkin()
+
+
+@mark.parametrize("engine", ["reference", "fast", "span"])
+def test_to_dictionary_roundtrip(engine):
+    gherkin = load("tests/data/complex.feature", True, engine)
+    rebuilt = Gherkin.from_dictionary(gherkin.to_dictionary())
+    assert rebuilt.file is None
+    rebuilt.file = gherkin.file
+    assert asdict(rebuilt) == asdict(gherkin)
+    assert str(rebuilt) == str(gherkin)
+    assert rebuilt.scenarios[0] is not gherkin.scenarios[0]
+
+    components = [gherkin.feature, gherkin.rule, gherkin.background, *gherkin.scenarios,
+                  *(step for scenario in gherkin.scenarios for step in scenario.steps)]
+    for component in components:
+        component_type = next(base for base in type(component).__mro__ if base in (Feature, Rule, Background, Scenario, Step))
+        assert component_type.from_dictionary(component.to_dictionary()) == component_type.from_dictionary(asdict(component))
+        assert str(component_type.from_dictionary(component.to_dictionary())) == str(component)
+    table = next(step.table for scenario in gherkin.scenarios for step in scenario.steps if step.table is not None)
+    assert Table.from_dictionary(table.to_dictionary()) == table
+
+
+def test_step_doc_string_keys():
+    step = Step.from_dictionary({"type": "Given", "text": "I have eggs", "table": None, "doc-string": "eggs"})
+    assert step.doc_string == "eggs"
+    assert Step.from_dictionary(step.to_dictionary()) == step
@@ -0,0 +1,25 @@
+from importlib import import_module
+
+from pytest import raises
+
+import gherkin_processor
+from gherkin_processor.private.commands import expand_inputs, output_path
+from gherkin_processor.utils import load
+
+
+def test_lazy_exports():
+    assert gherkin_processor.load is load
+    assert "load" in vars(gherkin_processor)
+    assert set(gherkin_processor.__all__) <= set(dir(gherkin_processor))
+    for name in gherkin_processor.__all__:
+        assert getattr(gherkin_processor, name).__name__ == name
+    with raises(AttributeError, match="no attribute 'missing'"):
+        gherkin_processor.missing
+
+
+def test_lazy_commands():
+    main_module = import_module("gherkin_processor.main")
+    assert main_module.expand_inputs is expand_inputs
+    assert main_module.output_path is output_path
+    with raises(AttributeError, match="no attribute 'missing'"):
+        main_module.missing
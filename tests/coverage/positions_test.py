@@ -0,0 +1,64 @@
+from pytest import mark
+
+from gherkin_processor.private.lines import GIVEN, KEYWORD_STATUSES
+from gherkin_processor.private.positions import (ALLOWED_BACKGROUND_POSITIONS, ALLOWED_BACKGROUND_TRANSITIONS,
+                                                 ALLOWED_POSITIONS, ALLOWED_SCENARIO_POSITIONS,
+                                                 ALLOWED_SCENARIO_TRANSITIONS, ALLOWED_TRANSITIONS, INVALID, STATUSES,
+                                                 doc_string_status, position_error, status_code, step_status,
+                                                 table_status)
+from gherkin_processor.utils import process, validate
+
+POSITIONS = [
+    (ALLOWED_POSITIONS, ALLOWED_TRANSITIONS),
+    (ALLOWED_BACKGROUND_POSITIONS, ALLOWED_BACKGROUND_TRANSITIONS),
+    (ALLOWED_SCENARIO_POSITIONS, ALLOWED_SCENARIO_TRANSITIONS),
+]
+
+
+@mark.parametrize("positions, transitions", POSITIONS)
+def test_compiled_transitions(positions, transitions):
+    for keyword in list(STATUSES):
+        for status in list(STATUSES):
+            allowed = keyword in positions and status in positions[keyword]
+            assert (position_error(transitions, status_code(keyword), status_code(status)) is None) == allowed
+
+
+def test_keyword_statuses():
+    for kind, name in KEYWORD_STATUSES.items():
+        assert STATUSES[kind] == name
+
+
+def test_derived_statuses():
+    given_table = table_status(GIVEN)
+    assert STATUSES[given_table] == "GIVEN TABLE"
+    assert table_status(given_table) == given_table
+    assert STATUSES[doc_string_status(given_table)] == "GIVEN TABLE DOC-STRING"
+    assert step_status(doc_string_status(given_table)) == given_table
+    assert step_status(doc_string_status(GIVEN)) == GIVEN
+
+
+def test_position_errors():
+    assert position_error(ALLOWED_TRANSITIONS, GIVEN, status_code("FEATURE")) == "Keyword 'GIVEN' cannot be after 'FEATURE'"
+    assert position_error(ALLOWED_TRANSITIONS, table_status(status_code("FEATURE")), 0) == "Table component cannot be after 'FEATURE'"
+    assert position_error(ALLOWED_TRANSITIONS, doc_string_status(status_code("TAG")), 0) == "Doc-string component cannot be after 'TAG'"
+    assert position_error(ALLOWED_BACKGROUND_TRANSITIONS, status_code(""), 0) == "Could not resolve current status '' as a valid possibility"
+
+
+def test_closed_statuses():
+    given_doc_strings = doc_string_status(doc_string_status(GIVEN))
+    assert STATUSES[given_doc_strings] == "GIVEN DOC-STRING DOC-STRING"
+    assert doc_string_status(given_doc_strings) == INVALID
+    assert table_status(INVALID) == doc_string_status(INVALID) == step_status(INVALID) == INVALID
+    assert status_code("GIVEN DOC-STRING DOC-STRING DOC-STRING") == INVALID
+    assert position_error(ALLOWED_TRANSITIONS, INVALID, given_doc_strings) == "Could not resolve current status '<INVALID>' as a valid possibility"
+
+
+def test_chained_doc_strings():
+    count = len(STATUSES)
+    text = "Feature: F\nScenario: S\nGiven a\n" + '"""\ndoc\n"""\n' * 500
+    issues = validate(text, True)
+    assert len(issues) == 2 * 499
+    assert issues[0].message.startswith("Doc-string component cannot be after 'GIVEN DOC-STRING'")
+    for engine in ("reference", "fast", "span"):
+        process(text, False, engine)
+    assert len(STATUSES) == count
@@ -0,0 +1,68 @@
+from dataclasses import asdict
+from json import dumps, loads
+
+from pytest import mark
+
+from gherkin_processor.components.table import Table
+from gherkin_processor.private.serializers import CHUNK_PIECES, iter_json, to_json
+from gherkin_processor.utils import load, process, save
+
+TEXT = "\n".join([
+    "Feature: Making breakfast ☕",
+    "  Café \"description\" with \\ and \t",
+    "",
+    "  Scenario Outline: Making eggs",
+    "    Given I have fresh eggs",
+    "      | cook | time |",
+    "      | fry  | 3 \\| 4 |",
+    "      | boil |",
+    "    When I <cook> the eggs",
+    "      \"\"\"",
+    "      {\"eggs\": 2}",
+    "      \"\"\"",
+    "    Then I get eggs",
+    "  Examples:",
+    "    | cook |",
+    "    | fry  |",
+    "",
+])
+
+
+@mark.parametrize("engine", ["reference", "fast", "span"])
+@mark.parametrize("source", ["tests/data/simple.feature", "tests/data/complex.feature", TEXT], ids=["simple", "complex", "text"])
+def test_serializer_output(engine, source):
+    gherkin = load(source, False, engine) if source.endswith(".feature") else process(source, False, engine)
+    assert to_json(gherkin) == dumps(asdict(gherkin), indent=4)
+    assert to_json(gherkin, 2) == dumps(asdict(gherkin), indent=2)
+    assert to_json(gherkin, None) == dumps(asdict(gherkin), separators=(",", ":"))
+    assert to_json(gherkin.scenarios[0]) == dumps(asdict(gherkin.scenarios[0]), indent=4)
+
+
+@mark.parametrize("value", [{}, [], {"a": []}, {"a": {}}, [1, 2.5, True, False, None, "é\n"], {"x": [{"y": ()}]}, "text", None])
+def test_serializer_values(value):
+    assert to_json(value) == dumps(value, indent=4)
+    assert to_json(value, None) == dumps(value, separators=(",", ":"))
+
+
+def test_serializer_tables():
+    table = Table(["a", "b", "a"])
+    table.append_row(["1", "2", "3"])
+    assert to_json(table) == dumps(table.to_dictionary(), indent=4)
+    assert to_json(Table()) == "{}"
+
+
+def test_serializer_chunks():
+    gherkin = process("Feature: Making breakfast\n\n" + "  Scenario: Making coffee\n    Given I have coffee grounds\n" * 2000, False, "fast")
+    chunks = list(iter_json(gherkin))
+    assert len(chunks) > 1
+    assert all(chunk for chunk in chunks)
+    assert max(map(len, chunks)) < CHUNK_PIECES * 100
+    assert loads("".join(chunks)) == loads(dumps(asdict(gherkin)))
+
+
+def test_save_compact_json(tmp_path):
+    gherkin = process(TEXT, False, "fast")
+    assert save(gherkin, str(tmp_path / "pretty.json"), "JSON") is True
+    assert save(gherkin, str(tmp_path / "compact.json"), "COMPACT_JSON") is True
+    assert (tmp_path / "pretty.json").read_text(encoding="utf-8") == dumps(asdict(gherkin), indent=4)
+    assert (tmp_path / "compact.json").read_text(encoding="utf-8") == dumps(asdict(gherkin), separators=(",", ":"))
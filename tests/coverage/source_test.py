@@ -0,0 +1,118 @@
+from codecs import BOM_UTF8, BOM_UTF16_BE, BOM_UTF32_LE
+from dataclasses import asdict
+
+from pytest import mark, raises
+
+from gherkin_processor.components import source as source_module
+from gherkin_processor.components.source import SourceBuffer, SourceStep, span_of
+from gherkin_processor.utils import process
+
+TEXT = "\n".join([
+    "Feature: Making breakfast",
+    "  Describes a morning routine",
+    "  before work",
+    "",
+    "  Background:",
+    "    Given I have coffee grounds",
+    "",
+    "  @coffee",
+    "  Scenario: Making coffee",
+    "    First description line",
+    "    Given I have a  cup",
+    "      \"\"\"",
+    "      {\"size\": \"large\"}",
+    "",
+    "      \"\"\"",
+    "    When I add hot water",
+    "    Then I get a cup of coffee",
+    "",
+])
+
+
+@mark.parametrize("window_size", [1, 4, 1 << 16])
+@mark.parametrize("text", ["", "a", "a\n", "\n", "a\r\nb\rc\x0bd\u2028e\n\n", "a\n\nb", "long line\r\n\r\nx\ry", "ab\r" * 10 + "\n"])
+def test_source_lines(text, window_size, monkeypatch):
+    monkeypatch.setattr(source_module, "WINDOW_SIZE", window_size)
+    source = SourceBuffer(text)
+    assert list(source.lines()) == text.splitlines()
+    assert source.line_count == len(text.splitlines())
+    for num, line in enumerate(text.splitlines(), 1):
+        assert text.startswith(line, source.line_start(num))
+        assert source.position(source.line_start(num)) == (num, 1)
+
+
+@mark.parametrize("window_size", [1, 4, 1 << 16])
+@mark.parametrize("encode", [
+    lambda text: text.encode(),
+    lambda text: BOM_UTF8 + text.encode(),
+    lambda text: BOM_UTF16_BE + text.encode("utf-16-be"),
+    lambda text: BOM_UTF32_LE + text.encode("utf-32-le"),
+    lambda text: memoryview(bytearray(text.encode()))
+])
+def test_source_encodings(encode, window_size, monkeypatch):
+    monkeypatch.setattr(source_module, "WINDOW_SIZE", window_size)
+    text = TEXT.replace("coffee grounds", "caf\u00e9 \u2615 grounds").replace("\n", "\r\n", 3)
+    source = SourceBuffer(encode(text))
+    assert list(source.lines()) == text.splitlines()
+    for engine in ["reference", "fast", "span"]:
+        assert asdict(process(encode(text), True, engine)) == asdict(process(text, True, engine))
+
+    step = process(encode(text), True, "span").background.steps[0]
+    assert str(span_of(step, "text")) == "I have caf\u00e9 \u2615 grounds"
+    assert (span_of(step, "text").line, span_of(step, "text").column) == (6, 11)
+
+
+
+@mark.parametrize("window_size", [1, 4, 1 << 16])
+@mark.parametrize("encoding", ["utf-8", "utf-16-be", "utf-16-le", "utf-32-le", "latin-1"])
+def test_source_line_breaks(encoding, window_size, monkeypatch):
+    monkeypatch.setattr(source_module, "WINDOW_SIZE", window_size)
+    text = "a\r\nb\rc\nd\x0be\x0cf\x1cg\x1dh\x1ei\x85j\u2028k\u2029l\r\n\r\n\u0a00\u0d0a\u2028"
+    text = text.encode(encoding, "ignore").decode(encoding)
+    bom = BOM_UTF8 if encoding == "utf-8" else b""
+    source = SourceBuffer(bom + text.encode(encoding), encoding)
+    assert list(source.lines()) == text.splitlines()
+    for num, line in enumerate(text.splitlines(True), 1):
+        offset = source.line_start(num)
+        assert offset == len(bom) + len("".join(text.splitlines(True)[:num - 1]).encode(encoding))
+        assert source.slice(offset, offset + len(line.encode(encoding))) == line
+
+
+def test_source_encoding_argument():
+    source = SourceBuffer("Feature: Caf\u00e9".encode("latin-1"), "latin-1")
+    assert list(source.lines()) == ["Feature: Caf\u00e9"]
+    assert SourceBuffer(BOM_UTF8 + "Caf\u00e9".encode(), "latin-1").encoding == "utf-8"
+    with raises(TypeError):
+        SourceBuffer(None)
+
+
+def test_source_components():
+    gherkin = process(TEXT, True, "span")
+    scenario = gherkin.scenarios[0]
+    step = scenario.steps[0]
+    assert isinstance(step, SourceStep)
+    assert asdict(gherkin) == asdict(process(TEXT, True, "fast"))
+    assert str(gherkin) == str(process(TEXT, True, "fast"))
+
+    assert (span_of(gherkin.feature, "name").line, span_of(gherkin.feature, "name").column) == (1, 10)
+    assert span_of(gherkin.feature, "description").text() == "  Describes a morning routine\n  before work"
+    assert (span_of(scenario).line, span_of(scenario).column) == (8, 1)
+    assert (span_of(scenario, "name").line, span_of(scenario, "name").column) == (9, 13)
+    assert span_of(scenario, "description").offsets == (TEXT.index("    First"), TEXT.index("\n    Given I have a"))
+    assert (span_of(step).line, span_of(step).column, str(span_of(step, "text"))) == (11, 1, "I have a  cup")
+    assert span_of(step).end == TEXT.index("\n    When")
+    assert span_of(step, "doc_string").text() == step.doc_string == "      {\"size\": \"large\"}\n"
+    assert repr(span_of(scenario.steps[2], "text")) == "Span(line=17, column=10, text='I get a cup of coffee')"
+    assert span_of(scenario, "outline") is None
+    assert span_of(process(TEXT, True, "fast").feature) is None
+
+
+def test_source_separated_lines():
+    gherkin = process(TEXT.replace("\n", "\r\n"), True, "span")
+    description = span_of(gherkin.feature, "description")
+    assert len(description.offsets) == 4
+    assert description.text() == "  Describes a morning routine\n  before work"
+    step = gherkin.scenarios[0].steps[0]
+    step.text = "I have a mug"
+    assert span_of(step, "text") is None
+    assert str(step) == "Given I have a mug\n\"\"\"\n      {\"size\": \"large\"}\n\n\"\"\""
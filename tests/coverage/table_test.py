@@ -0,0 +1,97 @@
+import json
+from copy import deepcopy
+from dataclasses import asdict
+
+from pytest import mark, raises
+
+from gherkin_processor.components.table import Table
+from gherkin_processor.private.formatters import format_table
+from gherkin_processor.private.tables import split_table_row
+from gherkin_processor.utils import load, save
+
+ROWS = [
+    ("  | cup | size |", ["cup", "size"]),
+    ("| cup|size |", ["cup", "size"]),
+    ("| cup |  | size |", ["cup", "", "size"]),
+    ("| a \\| b | c |", ["a | b", "c"]),
+    ("| a \\\\| b |", ["a \\", "b"]),
+    ("| a \\\\\\| b |", ["a \\| b"]),
+    ("| line\\nbreak | C:\\path |", ["line\nbreak", "C:\\path"]),
+    ("| cup | size", ["cup"]),
+    ("| cup \\|", []),
+    ("  |", []),
+]
+
+
+@mark.parametrize("text, cells", ROWS)
+def test_split_table_row(text, cells):
+    assert split_table_row(text) == cells
+
+
+def test_table_round_trip():
+    table = {"a|b": ["c\\d", "e\nf"], "x": ["|", "\\|"]}
+    lines = format_table(table).splitlines()
+    assert lines[0] == "| a\\|b | x    |"
+    assert [split_table_row(line) for line in lines] == [["a|b", "x"], ["c\\d", "|"], ["e\nf", "\\|"]]
+
+
+def test_table_access():
+    table = Table(["cup", "size", "cup"])
+    table.append_row(["1", "small", "2"])
+    table.append_row(["3", "large"])
+    table.append_row(["4"])
+    assert table.headers == ["cup", "size"]
+    assert table.row_count == 4
+    assert table["cup"] == table.column("cup") == ["1", "2", "3", "4"]
+    assert table.row(1) == {"cup": "2", "size": "large"}
+    assert list(table.rows())[3] == {"cup": "4"}
+    assert table == {"cup": ["1", "2", "3", "4"], "size": ["small", "large"]}
+    assert Table.from_dictionary(table) == table
+    assert repr(Table()) == "Table({})"
+    with raises(KeyError):
+        table.column("water")
+
+
+def test_table_offsets():
+    table = Table(["cup", "size"])
+    table.append_row(["1", "small"])
+    table.append_row(["2"])
+    buffer, columns = table.to_offsets()
+    assert buffer == "1small2"
+    assert {header: list(offsets) for header, offsets in columns.items()} == {"cup": [0, 1, 6, 7], "size": [1, 6]}
+    restored = Table.from_offsets(buffer, columns)
+    assert restored == table
+    restored.append_row(["3", "large"])
+    assert restored.to_dictionary() == {"cup": ["1", "2", "3"], "size": ["small", "large"]}
+    assert table.row_count == 2
+
+    table = Table(["cup", "size", "cup"])
+    table.append_row(["1", "small", "2"])
+    buffer, columns = table.to_offsets()
+    restored = Table.from_offsets(buffer, columns, table.header_line)
+    assert restored.header_line == ["cup", "size", "cup"]
+    restored.append_row(["3", "large", "4"])
+    assert restored == {"cup": ["1", "2", "3", "4"], "size": ["small", "large"]}
+    assert Table.from_offsets(buffer, columns).header_line == ["cup", "size"]
+
+
+def test_table_copy(tmp_path):
+    table = Table(["cup", "size", "cup"])
+    table.append_row(["1", "small", "2"])
+    copied = table.copy()
+    copied.append_row(["3", "large", "4"])
+    assert isinstance(copied, Table)
+    assert table == {"cup": ["1", "2"], "size": ["small"]}
+    assert copied == {"cup": ["1", "2", "3", "4"], "size": ["small", "large"]}
+    assert deepcopy(table) == table.to_dictionary()
+
+    gherkin = load("tests/data/complex.feature")
+    copied = gherkin.copy()
+    assert isinstance(copied.scenarios[-1].outline, Table)
+    assert copied.scenarios[-1].outline is not gherkin.scenarios[-1].outline
+    assert copied.to_dictionary() == gherkin.to_dictionary()
+    assert [scenario.copy() for scenario in gherkin.scenarios] == copied.scenarios
+    assert [step.copy() for step in gherkin.background.steps] == gherkin.background.copy().steps
+    assert save(copied, str(tmp_path / "copy.gherkin"), "BINARY") is True
+    assert load(str(tmp_path / "copy.gherkin")).to_dictionary() == gherkin.to_dictionary()
+    assert json.loads(json.dumps(asdict(gherkin))) == asdict(copied)
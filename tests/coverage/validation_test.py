@@ -24,3 +24,14 @@ def test_validate():
     with raises(ValueError) as e:
         validate(text)
     assert str(e.value) == "Keyword 'SCENARIO' cannot be after '<BEGINNING>' at line [1]: Scenario: Making coffee"
+
+
+def test_validate_input():
+    text = open("tests/data/complex.feature").read()
+    assert is_valid(text.encode("utf-16")) is True
+    assert issue(text.replace("Scenarios:", "Scenarios:\nScenarios:").encode()) == "Keyword 'OUTLINE' cannot be after 'OUTLINE' at line [41]: Scenarios:"
+    assert issue(text.replace("Scenario Outline:", "Scenario:")).startswith("Scenario outline must be marked in the scenario name keyword")
+    with raises(TypeError) as e:
+        validate(None)
+    assert str(e.value) == "Variable 'text' is not string type"
+    assert is_valid(None) is False
@@ -0,0 +1,117 @@
+import sys
+from io import StringIO
+from subprocess import run
+
+from pytest import mark
+
+from gherkin_processor.components.feature import Feature
+from gherkin_processor.components.rule import Rule
+from gherkin_processor.components.step import Step
+from gherkin_processor.components.table import Table
+from gherkin_processor.gherkin import Gherkin
+from gherkin_processor.private.formatters import format_table, iter_table_chunks, iter_table_lines, write_table
+from gherkin_processor.utils import load, process, save
+
+TEXT = "\n".join([
+    "Feature: Making breakfast",
+    "  Background:",
+    "    Given I have coffee grounds",
+    "  Scenario: Making coffee",
+    "    Given I add hot water",
+    "      | temperature |",
+    "      | 90 |",
+    "  Scenario Outline: Making eggs",
+    "    Given I have fresh eggs",
+    '      """',
+    "two eggs",
+    '      """',
+    "    When I cook the eggs",
+    "    Then I get eggs",
+    "  Examples:",
+    "    | cook |",
+    "    | fry |",
+])
+EXPECTED = "\n".join([
+    "Feature: Making breakfast",
+    "",
+    "Background:",
+    "Given I have coffee grounds",
+    "",
+    "Scenario: Making coffee",
+    "Given I add hot water",
+    "| temperature |",
+    "| 90          |",
+    "",
+    "Scenario Outline: Making eggs",
+    "Given I have fresh eggs",
+    '"""',
+    "two eggs",
+    '"""',
+    "When I cook the eggs",
+    "Then I get eggs",
+    "| cook |",
+    "| fry  |",
+    "",
+])
+
+
+@mark.parametrize("engine", ["reference", "fast", "span"])
+@mark.parametrize("file_path", ["tests/data/simple.feature", "tests/data/complex.feature"])
+def test_write_to(engine, file_path):
+    gherkin = load(file_path, True, engine)
+    output = StringIO()
+    gherkin.write_to(output)
+    assert output.getvalue() == "".join(gherkin.iter_chunks()) == str(gherkin)
+    for scenario in gherkin.scenarios:
+        output = StringIO()
+        scenario.write_to(output)
+        assert output.getvalue() == str(scenario)
+        for step in scenario.steps:
+            output = StringIO()
+            step.write_to(output)
+            assert output.getvalue() == str(step)
+
+
+def test_iter_chunks():
+    gherkin = process(TEXT, True, "fast")
+    assert "".join(gherkin.iter_chunks()) == str(gherkin) == EXPECTED
+    assert len(list(gherkin.iter_chunks())) > len(gherkin.scenarios)
+    assert str(Gherkin()) == ""
+    assert list(Gherkin().iter_chunks()) == []
+
+
+def test_table_chunks():
+    table = Table(["a", "b|c"])
+    table.append_row(["1", "2\n3"])
+    table.append_row(["4"])
+    assert list(iter_table_lines(table)) == format_table(table).split("\n")
+    assert "".join(iter_table_chunks(table)) == format_table(table)
+    assert "".join(iter_table_chunks(Table())) == format_table(Table()) == "|"
+    output = StringIO()
+    write_table(table, output)
+    assert output.getvalue() == format_table(table) == "| a | b\\|c |\n| 1 | 2\\n3 |\n| 4 |      |"
+    assert format_table(Table(["cook", "time"])) == "| cook | time |"
+
+
+def test_render_once(monkeypatch):
+    calls = []
+    for component in (Feature, Rule, Step):
+        original = component.to_string
+
+        def counting(self, original=original):
+            calls.append(type(self).__name__)
+            return original(self)
+
+        monkeypatch.setattr(component, "to_string", counting)
+    gherkin = load("tests/data/complex.feature", True, "fast")
+    str(gherkin)
+    assert calls == ["Feature", "Rule"]
+
+
+def test_save_streams(tmp_path):
+    gherkin = load("tests/data/complex.feature", True, "fast")
+    assert save(gherkin, str(tmp_path / "complex.feature"), "GHERKIN") is True
+    assert (tmp_path / "complex.feature").read_text(encoding="utf-8") == str(gherkin)
+
+    command = [sys.executable, "-m", "gherkin_processor.main", "-i", "tests/data/complex.feature", "-p"]
+    assert run(command, capture_output=True, text=True, check=True).stdout == str(gherkin) + "\n"
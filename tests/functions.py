@@ -1,5 +1,8 @@
+from gc import collect
 from os import listdir, makedirs, remove
 from os.path import exists, isfile, join
+from time import perf_counter
+from tracemalloc import get_traced_memory, start, stop
 
 
 def empty_output_directory():
@@ -10,3 +13,48 @@ def empty_output_directory():
         item_path = join(output_dir, item)
         if isfile(item_path):
             remove(item_path)
+
+
+def measure(function, repeat=3, collect_garbage=False):
+    durations = []
+    for _ in range(repeat):
+        if collect_garbage:
+            collect()
+        begin = perf_counter()
+        function()
+        durations.append(perf_counter() - begin)
+    return min(durations)
+
+
+def measure_memory(function):
+    start()
+    result = function()
+    retained, peak = get_traced_memory()
+    stop()
+    return result, retained, peak
+
+
+SCENARIO = "\n".join([
+    "  @breakfast @pancake",
+    "  Scenario: Making pancake {num}",
+    "    Pancake description line",
+    "    Given I have the recipe",
+    "      | flour | sugar | milk |",
+    "      | 200 g | 20 g  | 3 dl |",
+    "    When I follow the recipe",
+    "    Then I get a pancake",
+    "",
+])
+
+
+def feature_text(scenario_count, name="Making breakfast"):
+    return f"Feature: {name}\n\n" + "".join(SCENARIO.format(num=num) for num in range(scenario_count))
+
+
+def write_files(directory, scenario_counts):
+    paths = []
+    for num, scenario_count in enumerate(scenario_counts):
+        paths.append(str(directory / f"breakfast_{num}.feature"))
+        with open(paths[-1], "w", encoding="utf-8") as file:
+            file.write(feature_text(scenario_count, f"Making breakfast {num}"))
+    return paths